@@ -1,5 +1,15 @@
-from fastapi import APIRouter, HTTPException, Request
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import List, Optional
+import asyncio
+import base64
+import csv
+import io
+import json
+import os
 import uuid
 
 from app.schemas import (
@@ -8,15 +18,23 @@ from app.schemas import (
     TriageRequest, TriageResponse,
     RAGRequest, RAGResponse,
     GenerateRequest, GenerateResponse,
-    ReviewActionRequest, ReviewActionResponse
+    ReviewActionRequest, ReviewActionResponse,
+    ReviewBulkRequest, ReviewBulkResult, ReviewBulkResponse,
+    ReviewItem, ReviewQueueResponse
 )
+from app.core.constants import REVIEW_CONFIDENCE_THRESHOLD
 from app.core.logging import get_logger
 from app.services.masking_service import masker
 from app.services.triage_service import triage_engine
+from app.services.spike_detector import spike_detector
 from app.services.review_service import review_store
+from app.services.review_events import DeliveryWatermark
+from app.services.review_rescore import review_rescore_job
 from app.services.rag_service import rag_manager
 from app.services.llm_service import llm_client
-from app.services.similarity_service import similarity_service
+from app.services.similarity_service import similarity_service, build_similarity_filter
+from app.services.index_queue import index_queue
+from app.services.vector_store import vector_store
 
 router = APIRouter()
 logger = get_logger("complaintops.api")
@@ -69,9 +87,10 @@ def predict_triage(payload: TriageRequest, request: Request):
         request.state.request_id,
     )
     result = triage_engine.predict(sanitized["masked_text"])
+    spike_detector.record(result["category"], result["urgency"])
     needs_human_review = (
-        result["category_confidence"] < 0.60
-        or result["urgency_confidence"] < 0.60
+        result["category_confidence"] < REVIEW_CONFIDENCE_THRESHOLD
+        or result["urgency_confidence"] < REVIEW_CONFIDENCE_THRESHOLD
     )
     review_id = None
     review_status = "AUTO_APPROVED"
@@ -97,6 +116,25 @@ def predict_triage(payload: TriageRequest, request: Request):
         review_id=review_id,
     )
 
+RESCORE_ON_RELOAD = os.getenv("REVIEW_RESCORE_ON_RELOAD", "true").lower() == "true"
+
+@router.post("/triage/reload")
+def reload_triage_models():
+    """Reload triage models from disk; re-scores pending reviews unless disabled."""
+    if not triage_engine.reload():
+        # Nothing changed, so there is nothing to re-score
+        detail = "Triage models could not be loaded"
+        if triage_engine.model_loaded:
+            detail += "; the previous models are still serving"
+        raise HTTPException(status_code=503, detail=detail)
+    rescore_started = RESCORE_ON_RELOAD and review_rescore_job.start(trigger="model_reload")
+    return {"model_loaded": True, "rescore_started": rescore_started}
+
+@router.get("/triage/spikes")
+def triage_spikes():
+    """Sliding-window (1m/15m/1h) triage counts vs baseline, with spiking keys."""
+    return spike_detector.snapshot()
+
 @router.post("/retrieve", response_model=RAGResponse)
 def retrieve_docs(payload: RAGRequest, request: Request):
     sanitized = sanitize_input(payload.text)
@@ -109,11 +147,13 @@ def retrieve_docs(payload: RAGRequest, request: Request):
     sources = rag_manager.retrieve(sanitized["masked_text"], category=payload.category)
     return RAGResponse(relevant_sources=sources)
 
-@router.post("/generate", response_model=GenerateResponse)
-def generate_response(payload: GenerateRequest, request: Request):
-    sanitized = sanitize_input(payload.text)
+async def _prepare_generation(payload: GenerateRequest, request: Request, endpoint: str) -> tuple:
+    """Masked text, RAG snippets and RAG risk flags for a generation request."""
+    # Masking and retrieval are CPU/blocking work and run in the threadpool;
+    # the LLM call itself is awaited, so in-flight generations hold no thread
+    sanitized = await run_in_threadpool(sanitize_input, payload.text)
     log_sanitized_request(
-        "/generate",
+        endpoint,
         sanitized["masked_text"],
         sanitized["masked_entities"],
         request.state.request_id,
@@ -122,7 +162,8 @@ def generate_response(payload: GenerateRequest, request: Request):
     sources = payload.relevant_sources
     if not sources:
         try:
-            sources = rag_manager.retrieve(
+            sources = await run_in_threadpool(
+                rag_manager.retrieve,
                 sanitized["masked_text"],
                 category=payload.category,
             )
@@ -144,13 +185,9 @@ def generate_response(payload: GenerateRequest, request: Request):
         else:
             # Fallback for unknown type
             snippets.append(source)
+    return sanitized["masked_text"], snippets, risk_flags
 
-    result = llm_client.generate_response(
-        text=sanitized["masked_text"],
-        category=payload.category,
-        urgency=payload.urgency,
-        snippets=snippets
-    )
+def _generate_response_model(result: dict, risk_flags: List[str]) -> GenerateResponse:
     return GenerateResponse(
         action_plan=result["action_plan"],
         customer_reply_draft=result["customer_reply_draft"],
@@ -159,6 +196,55 @@ def generate_response(payload: GenerateRequest, request: Request):
         error_code=result.get("error_code"),
     )
 
+@router.post("/generate", response_model=GenerateResponse)
+async def generate_response(payload: GenerateRequest, request: Request):
+    masked_text, snippets, risk_flags = await _prepare_generation(payload, request, "/generate")
+    result = await llm_client.agenerate_response(
+        text=masked_text,
+        category=payload.category,
+        urgency=payload.urgency,
+        snippets=snippets
+    )
+    return _generate_response_model(result, risk_flags)
+
+@router.post("/generate/stream")
+async def generate_response_stream(payload: GenerateRequest, request: Request):
+    """
+    /generate as server-sent events: "delta" events carry customer_reply_draft
+    and action_plan text (field, index, text) as the model produces it,
+    "reset" means a retry started and earlier deltas are void, and the
+    terminal "final" event carries the validated GenerateResponse (risk and
+    PII flags, sources).
+    """
+    masked_text, snippets, risk_flags = await _prepare_generation(payload, request, "/generate/stream")
+
+    def sse(event: str, data) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    async def stream():
+        async for event, data in llm_client.astream_response(
+            text=masked_text,
+            category=payload.category,
+            urgency=payload.urgency,
+            snippets=snippets,
+        ):
+            if event != "final":
+                yield sse(event, data)
+                continue
+            try:
+                response = _generate_response_model(data, risk_flags)
+            except ValueError as e:
+                logger.error("generate_stream_invalid_result request_id=%s error=%s", request.state.request_id, e)
+                yield sse("error", {"error_code": "LLM_VALIDATION_ERROR"})
+                return
+            yield sse("final", response.model_dump())
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.post("/review/approve", response_model=ReviewActionResponse)
 def approve_review(payload: ReviewActionRequest):
     record = review_store.update_review(payload.review_id, "APPROVED", payload.notes)
@@ -173,9 +259,237 @@ def reject_review(payload: ReviewActionRequest):
         raise HTTPException(status_code=404, detail="Review not found")
     return ReviewActionResponse(review_id=record.review_id, status=record.status, notes=record.notes)
 
+@router.post("/review/bulk", response_model=ReviewBulkResponse)
+def bulk_review(payload: ReviewBulkRequest):
+    """Approve or reject many reviews in a single transaction."""
+    results = review_store.bulk_update_reviews(payload.review_ids, payload.status, payload.notes)
+    updated = sum(1 for _, ok in results if ok)
+    return ReviewBulkResponse(
+        updated=updated,
+        not_found=len(results) - updated,
+        results=[
+            ReviewBulkResult(
+                review_id=review_id,
+                status=payload.status if ok else "NOT_FOUND",
+                updated=ok,
+                error=None if ok else "Review not found",
+            )
+            for review_id, ok in results
+        ],
+    )
+
+@router.post("/review/rescore", status_code=202)
+def start_review_rescore():
+    """Re-score pending reviews with the current model in the background."""
+    if not review_rescore_job.start(trigger="manual"):
+        raise HTTPException(status_code=409, detail="Re-scoring already running")
+    return review_rescore_job.status()
+
+@router.get("/review/rescore")
+def review_rescore_status():
+    """Progress and throughput of the latest re-scoring run."""
+    return review_rescore_job.status()
+
+@router.get("/review/stats")
+def review_stats():
+    """Backlog counts, oldest pending age and decision rates (incremental counters)."""
+    return review_store.review_stats()
+
+def _iso_bound(value: Optional[str], name: str) -> Optional[str]:
+    """Normalize an ISO-8601 bound to the UTC isoformat review timestamps are stored in."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid ISO-8601 timestamp for {name}: {value}")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+@router.get("/review/export")
+def export_reviews(
+    table: str = "audit",
+    format: str = "ndjson",
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+):
+    """
+    Stream review_records or the review_audit trail as CSV or NDJSON,
+    filtered to created_at in [created_after, created_before).
+    """
+    if table not in ("records", "audit"):
+        raise HTTPException(status_code=400, detail="table must be 'records' or 'audit'")
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+    chunks = review_store.iter_export(
+        table,
+        created_after=_iso_bound(created_after, "created_after"),
+        created_before=_iso_bound(created_before, "created_before"),
+    )
+
+    def body():
+        header_written = False
+        for rows in chunks:
+            if format == "ndjson":
+                yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+                continue
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+            if not header_written:
+                writer.writeheader()
+                header_written = True
+            writer.writerows(rows)
+            yield buffer.getvalue().encode("utf-8")
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"review_{table}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+REVIEW_EVENTS_KEEPALIVE_S = float(os.getenv("REVIEW_EVENTS_KEEPALIVE_S", "15"))
+REVIEW_EVENTS_PAGE = 500
+
+def _sse_review_event(event: dict, event_id: int) -> str:
+    return f"id: {event_id}\nevent: review\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+@router.get("/review/events")
+async def review_events(request: Request, status: Optional[str] = None, last_event_id: Optional[int] = None):
+    """
+    Server-sent events, one per review_audit row (new reviews and decisions).
+    Resumes after the Last-Event-ID header (or ?last_event_id=); without
+    either, only new events are sent.
+
+    The SSE id is a watermark, not the event's own audit_id: every audit_id
+    at or below it has been delivered. Other workers' events can arrive out
+    of order, so resuming may repeat events above it; dedupe by the payload's
+    audit_id.
+    """
+    header = request.headers.get("last-event-id")
+    if header:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    # Subscribe before reading the backlog so nothing committed in between is missed
+    subscriber = review_store.events.subscribe(status)
+    try:
+        floor = last_event_id if last_event_id is not None else await run_in_threadpool(review_store.max_audit_id)
+    except BaseException:
+        review_store.events.unsubscribe(subscriber)
+        raise
+
+    async def stream():
+        watermark = DeliveryWatermark(floor)
+        catch_up = last_event_id is not None
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if catch_up:
+                    catch_up = False
+                    # Committed before the reads below, so a short last page covers it
+                    # (status-filtered reads skip the ids in between)
+                    latest = await run_in_threadpool(review_store.max_audit_id)
+                    while True:
+                        rows = await run_in_threadpool(
+                            review_store.audit_events_after, watermark.floor, REVIEW_EVENTS_PAGE, status
+                        )
+                        for row in rows:
+                            sent = row["audit_id"] in watermark.sent_above
+                            # Rows come back in audit_id order, so each one closes the gap below it
+                            watermark.read_through(row["audit_id"])
+                            if not sent:
+                                yield _sse_review_event(row, watermark.floor)
+                        if len(rows) < REVIEW_EVENTS_PAGE:
+                            watermark.read_through(latest)
+                            break
+                if await request.is_disconnected():
+                    return
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), REVIEW_EVENTS_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    # Idle: read the gaps below live events so the watermark catches up
+                    catch_up = bool(watermark.sent_above)
+                    continue
+                if watermark.offer(event["audit_id"]):
+                    yield _sse_review_event(event, watermark.floor)
+                if subscriber.lagged and subscriber.queue.empty():
+                    # Buffer overflowed and events were dropped: re-read them from review_audit
+                    subscriber.lagged = False
+                    catch_up = True
+                elif len(watermark.sent_above) >= REVIEW_EVENTS_PAGE:
+                    # Close the gaps so sent_above stays bounded
+                    catch_up = True
+        finally:
+            review_store.events.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/review/events/stats")
+def review_events_stats():
+    """Review event subscribers and publish counts."""
+    return review_store.events.stats()
+
+@router.get("/review/buffer")
+def review_buffer_stats():
+    """Group-commit buffer depth and flush latency for review creation."""
+    return review_store.buffer_stats()
+
+def _encode_review_cursor(created_at: str, review_id: str) -> str:
+    payload = {"created_at": created_at, "review_id": review_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def _decode_review_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(payload["created_at"]), str(payload["review_id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/review/queue", response_model=ReviewQueueResponse)
+def review_queue(
+    status: Optional[str] = "PENDING_REVIEW",
+    category: Optional[str] = None,
+    urgency: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+):
+    """
+    Oldest-first review records, keyset-paginated on (created_at, review_id)
+    so deep pages cost the same as the first. Pass an empty status for all.
+    """
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+    # One extra row tells us whether there is a next page
+    records = review_store.list_reviews(
+        status=status or None,
+        category=category,
+        urgency=urgency,
+        limit=limit + 1,
+        after=_decode_review_cursor(cursor),
+    )
+    page = records[:limit]
+    next_cursor = None
+    if len(records) > limit:
+        next_cursor = _encode_review_cursor(page[-1].created_at, page[-1].review_id)
+    return ReviewQueueResponse(
+        reviews=[ReviewItem(**asdict(record)) for record in page],
+        next_cursor=next_cursor,
+    )
+
 # ============== SIMILARITY SEARCH ENDPOINTS ==============
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 
 class IndexComplaintRequest(BaseModel):
@@ -185,9 +499,26 @@ class IndexComplaintRequest(BaseModel):
     status: Optional[str] = None
     created_at: Optional[str] = None
 
+class IndexComplaintsBatchRequest(BaseModel):
+    # Bounded so one request cannot hold a worker and the embedder indefinitely
+    complaints: list[IndexComplaintRequest] = Field(..., max_length=2000)
+    batch_size: Optional[int] = Field(default=None, ge=1, le=256)
+
+class IndexComplaintResult(BaseModel):
+    complaint_id: Optional[str] = None
+    status: str
+    canonical_id: Optional[str] = None
+    error: Optional[str] = None
+
+class IndexComplaintsBatchResponse(BaseModel):
+    indexed: int
+    duplicates: int = 0
+    failed: int
+    results: list[IndexComplaintResult]
+
 class SimilarComplaintItem(BaseModel):
     id: str
-    masked_text: str
+    masked_text: Optional[str] = None
     similarity_score: float
     category: Optional[str] = None
     status: Optional[str] = None
@@ -195,15 +526,37 @@ class SimilarComplaintItem(BaseModel):
 class SimilarComplaintsResponse(BaseModel):
     similar_complaints: list[SimilarComplaintItem]
     total_indexed: int
+    embedding_source: Optional[str] = None
+    next_cursor: Optional[str] = None
 
-@router.post("/index-complaint")
-def index_complaint(payload: IndexComplaintRequest):
-    """Index a complaint for similarity search."""
-    metadata = {
+def _complaint_metadata(payload: IndexComplaintRequest) -> Dict[str, str]:
+    return {
         "category": payload.category or "",
         "status": payload.status or "",
         "created_at": payload.created_at or ""
     }
+
+INDEX_QUEUE_ENABLED = os.getenv("INDEX_QUEUE_ENABLED", "true").lower() == "true"
+
+@router.post("/index-complaint")
+def index_complaint(payload: IndexComplaintRequest, response: Response):
+    """
+    Index a complaint for similarity search (queued write-behind by default).
+
+    A 202 only means the item was accepted into an in-memory, best-effort
+    queue: it is not durable and is lost if the process crashes or restarts
+    before the flush. Items that keep failing end up in the dead-letter file.
+    """
+    metadata = _complaint_metadata(payload)
+    if INDEX_QUEUE_ENABLED:
+        if not index_queue.enqueue(payload.complaint_id, payload.masked_text, metadata):
+            raise HTTPException(
+                status_code=503,
+                detail="Index queue is full",
+                headers={"Retry-After": "1"},
+            )
+        response.status_code = 202
+        return {"status": "queued", "complaint_id": payload.complaint_id, "durable": False}
     success = similarity_service.index_complaint(
         complaint_id=payload.complaint_id,
         masked_text=payload.masked_text,
@@ -213,19 +566,127 @@ def index_complaint(payload: IndexComplaintRequest):
         raise HTTPException(status_code=500, detail="Failed to index complaint")
     return {"status": "indexed", "complaint_id": payload.complaint_id}
 
+@router.get("/index-complaint/queue")
+def index_queue_stats():
+    """Depth, lag and flush latency of the write-behind index queue."""
+    return index_queue.stats()
+
+@router.post("/index-complaints/batch", response_model=IndexComplaintsBatchResponse)
+def index_complaints_batch(payload: IndexComplaintsBatchRequest):
+    """Bulk-index complaints with batched embedding and upserts."""
+    results = similarity_service.index_complaints(
+        [
+            {
+                "complaint_id": item.complaint_id,
+                "masked_text": item.masked_text,
+                "metadata": _complaint_metadata(item),
+            }
+            for item in payload.complaints
+        ],
+        batch_size=payload.batch_size,
+    )
+    return IndexComplaintsBatchResponse(
+        indexed=sum(1 for result in results if result["status"] == "indexed"),
+        duplicates=sum(1 for result in results if result["status"] == "duplicate"),
+        failed=sum(1 for result in results if result["status"] == "failed"),
+        results=results,
+    )
+
+SIMILAR_MAX_LIMIT = 100
+
+def _encode_cursor(distance: float, complaint_id: str, depth: int) -> str:
+    payload = {"distance": distance, "id": complaint_id, "depth": depth}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """(distance, id, depth) of the last match already returned, or None for the first page."""
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        decoded = float(payload["distance"]), str(payload["id"]), int(payload["depth"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if decoded[2] < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return decoded
+
 @router.get("/similar/{complaint_id}")
 def find_similar_complaints(
     complaint_id: str,
-    query_text: str,
-    limit: int = 5
+    query_text: Optional[str] = None,
+    limit: int = Query(5, ge=1, le=SIMILAR_MAX_LIMIT),
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    ids_only: bool = False,
 ):
-    """Find complaints similar to the given query text."""
-    results = similarity_service.find_similar(
+    """
+    Find complaints similar to the given complaint.
+    Uses the stored embedding when the complaint is indexed; query_text is
+    only embedded for complaints that are not indexed yet. Filters are pushed
+    down to the vector store as a metadata ``where`` clause; created_* are
+    ISO-8601 bounds ([after, before)).
+
+    next_cursor is a keyset cursor on (distance, id): later pages continue
+    after the last match returned, so complaints indexed in between do not
+    shift them. The vector store still ranks the matches paged past, so a
+    page's cost grows with its depth.
+    """
+    try:
+        where = build_similarity_filter(category, status, created_after, created_before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    decoded = _decode_cursor(cursor)
+    after, depth = (decoded[:2], decoded[2]) if decoded else (None, 0)
+    # One extra row tells us whether there is a next page
+    found = similarity_service.find_similar_by_id(
+        complaint_id=complaint_id,
+        n_results=limit + 1,
         query_text=query_text,
-        n_results=limit,
-        exclude_id=complaint_id
+        where=where,
+        after=after,
+        depth=depth,
+        ids_only=ids_only,
     )
+    if found is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Complaint is not indexed; query_text is required",
+        )
+    results, embedding_source = found
+    page = results[:limit]
+    next_cursor = None
+    if len(results) > limit:
+        next_cursor = _encode_cursor(page[-1]["distance"], page[-1]["id"], depth + limit)
     return SimilarComplaintsResponse(
-        similar_complaints=results,
-        total_indexed=similarity_service.get_collection_count()
+        similar_complaints=page,
+        total_indexed=similarity_service.get_collection_count(),
+        embedding_source=embedding_source,
+        next_cursor=next_cursor,
     )
+
+@router.get("/similarity/stats")
+def similarity_stats():
+    """Cached indexed-complaint count and index size on disk."""
+    return similarity_service.get_index_stats()
+
+@router.get("/similarity/duplicates")
+def duplicate_clusters(min_size: int = 2, limit: int = 50):
+    """Near-duplicate clusters, largest first (incident grouping)."""
+    return {"clusters": similarity_service.near_duplicates.clusters(min_size=min_size, limit=limit)}
+
+@router.get("/similarity/duplicates/{complaint_id}")
+def duplicate_cluster(complaint_id: str):
+    """Canonical complaint and members of the cluster containing complaint_id."""
+    cluster = similarity_service.near_duplicates.cluster(complaint_id)
+    if cluster is None:
+        raise HTTPException(status_code=404, detail="Complaint not tracked by near-duplicate index")
+    return cluster
+
+@router.get("/vector-store/stats")
+def vector_store_stats():
+    """Memory use and loaded state of the shared vector store."""
+    return vector_store.memory_stats()
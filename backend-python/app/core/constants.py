@@ -19,3 +19,15 @@ CategoryLiteral = Literal[
     "INFORMATION_REQUEST",
     "CAMPAIGN_POINTS_REWARDS",
 ]
+
+# Triage results below this confidence (category or urgency) go to human review
+REVIEW_CONFIDENCE_THRESHOLD = 0.60
+
+# SOP knowledge base collections
+SOP_COLLECTION = "complaint_sops"
+GENERAL_SOP_CATEGORY = "GENERAL"
+
+
+def sop_shard_collection(category: str) -> str:
+    """Name of the per-category SOP shard written by ingest --sharded."""
+    return f"{SOP_COLLECTION}__{category.lower()}"
@@ -1,10 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 import uuid
 from app.api.routes import router as api_router
 from app.core.logging import configure_logging, request_id_var
+from app.services.index_queue import index_queue
+from app.services.review_service import review_store
+from app.services.similarity_service import similarity_service
+from app.services.warmup import warmup_state
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm models in the background; /ready stays 503 until it finishes
+    warmup_state.start_background()
+    # Not part of readiness: until it finishes, fewer complaints are deduplicated
+    similarity_service.start_near_duplicate_rebuild()
+    yield
+    # Flush queued complaint indexing before the worker exits
+    index_queue.stop()
+    review_store.close()
+
 
 # Initialize FastAPI app
-app = FastAPI(title="ComplaintOps AI Service", version="0.1.0")
+app = FastAPI(title="ComplaintOps AI Service", version="0.1.0", lifespan=lifespan)
 
 configure_logging()
 
@@ -21,6 +40,11 @@ async def add_request_id(request: Request, call_next):
 def read_root():
     return {"message": "ComplaintOps AI Service is running"}
 
+@app.get("/ready")
+def read_ready():
+    status = warmup_state.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
 app.include_router(api_router)
 
 if __name__ == "__main__":
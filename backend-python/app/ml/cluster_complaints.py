@@ -0,0 +1,226 @@
+"""
+Complaint Embedding Clustering Job
+Mini-batch k-means over the complaint_embeddings collection (the one its
+alias points to, plus any monthly/yearly partitions), streamed in pages so
+memory stays bounded by page_size x dim (plus k x dim centroids).
+Writes cluster_id back as metadata and saves a per-cluster summary report.
+
+Usage:
+    python -m app.ml.cluster_complaints --k 20 --page-size 5000 --epochs 2
+"""
+import argparse
+import heapq
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+
+
+class MiniBatchKMeans:
+    """Sculley-style mini-batch k-means with per-centroid learning rates."""
+
+    def __init__(self, k: int, seed: int = 42) -> None:
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.centroids: Optional[np.ndarray] = None
+        self.counts = np.zeros(k, dtype=np.int64)
+
+    def init_centroids(self, sample: np.ndarray) -> None:
+        """k-means++ seeding on a sample."""
+        k = min(self.k, len(sample))
+        centroids = [sample[self.rng.integers(len(sample))]]
+        closest = ((sample - centroids[0]) ** 2).sum(axis=1)
+        for _ in range(1, k):
+            total = closest.sum()
+            if total <= 0:
+                index = self.rng.integers(len(sample))
+            else:
+                index = self.rng.choice(len(sample), p=closest / total)
+            centroids.append(sample[index])
+            closest = np.minimum(closest, ((sample - sample[index]) ** 2).sum(axis=1))
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.k = len(self.centroids)
+        self.counts = np.zeros(self.k, dtype=np.int64)
+
+    def assign(self, batch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest centroid and squared distance for each row."""
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, computed as one matrix product
+        distances = (
+            (batch ** 2).sum(axis=1, keepdims=True)
+            - 2 * batch @ self.centroids.T
+            + (self.centroids ** 2).sum(axis=1)
+        )
+        labels = distances.argmin(axis=1)
+        return labels, np.maximum(distances[np.arange(len(batch)), labels], 0.0)
+
+    def partial_fit(self, batch: np.ndarray) -> None:
+        if self.centroids is None:
+            self.init_centroids(batch)
+        labels, _ = self.assign(batch)
+        for cluster in np.unique(labels):
+            members = batch[labels == cluster]
+            self.counts[cluster] += len(members)
+            rate = len(members) / self.counts[cluster]
+            self.centroids[cluster] += rate * (members.mean(axis=0) - self.centroids[cluster])
+
+
+def iter_pages(collection, page_size: int, include: List[str]) -> Iterator[Dict]:
+    offset = 0
+    while True:
+        page = collection.get(limit=page_size, offset=offset, include=include)
+        if not page["ids"]:
+            return
+        yield page
+        offset += len(page["ids"])
+
+
+def complaint_collections(name: str) -> List:
+    """Collection behind ``name``'s alias followed by its partition collections."""
+    from app.services.similarity_service import _partition_span
+    from app.services.vector_store import vector_store
+
+    partitions = sorted(
+        partition
+        for partition in vector_store.list_collections(prefix=f"{name}__")
+        if _partition_span(partition) is not None
+    )
+    return [vector_store.get_collection(vector_store.resolve_alias(name))] + [
+        vector_store.get_collection(partition) for partition in partitions
+    ]
+
+
+def run_clustering(
+    collections,
+    k: int = 20,
+    page_size: int = 5000,
+    epochs: int = 2,
+    representatives: int = 3,
+    write_back: bool = True,
+    seed: int = 42,
+) -> Dict:
+    """
+    Fit one mini-batch k-means over all vectors in ``collections`` (a
+    collection or a list of them) and (optionally) write ``cluster_id`` into
+    each record's metadata, in the collection that holds it.
+
+    Returns:
+        Summary with per-cluster size, top categories and representative ids
+    """
+    if not isinstance(collections, (list, tuple)):
+        collections = [collections]
+    start = time.perf_counter()
+    model = MiniBatchKMeans(k=k, seed=seed)
+    # Seed from at least k vectors, which may span several small partitions
+    seed_batch: List[np.ndarray] = []
+    for _ in range(epochs):
+        for collection in collections:
+            for page in iter_pages(collection, page_size, include=["embeddings"]):
+                batch = np.asarray(page["embeddings"], dtype=np.float32)
+                if model.centroids is None:
+                    seed_batch.append(batch)
+                    if sum(len(rows) for rows in seed_batch) < k:
+                        continue
+                    batch = np.vstack(seed_batch)
+                model.partial_fit(batch)
+        if model.centroids is None and seed_batch:
+            # Fewer than k vectors in total
+            model.partial_fit(np.vstack(seed_batch))
+    if model.centroids is None:
+        return {"vectors": 0, "k": 0, "clusters": []}
+
+    sizes = np.zeros(model.k, dtype=np.int64)
+    categories = [Counter() for _ in range(model.k)]
+    # Max-heaps (negated distance) of the closest members per cluster
+    closest: List[List[Tuple[float, str]]] = [[] for _ in range(model.k)]
+    inertia = 0.0
+    vectors = 0
+    for collection, page in (
+        (collection, page)
+        for collection in collections
+        for page in iter_pages(collection, page_size, include=["embeddings", "metadatas"])
+    ):
+        labels, distances = model.assign(np.asarray(page["embeddings"], dtype=np.float32))
+        metadatas = [dict(metadata or {}) for metadata in page["metadatas"]]
+        for complaint_id, label, distance, metadata in zip(page["ids"], labels, distances, metadatas):
+            label = int(label)
+            sizes[label] += 1
+            categories[label][metadata.get("category") or "UNKNOWN"] += 1
+            heap = closest[label]
+            if len(heap) < representatives:
+                heapq.heappush(heap, (-float(distance), complaint_id))
+            elif -heap[0][0] > distance:
+                heapq.heapreplace(heap, (-float(distance), complaint_id))
+            metadata["cluster_id"] = label
+        inertia += float(distances.sum())
+        vectors += len(page["ids"])
+        if write_back:
+            # Metadata-only update: no re-embedding
+            collection.update(ids=page["ids"], metadatas=metadatas)
+
+    clusters = [
+        {
+            "cluster_id": cluster,
+            "size": int(sizes[cluster]),
+            "top_categories": categories[cluster].most_common(3),
+            "representative_ids": [cid for _, cid in sorted(closest[cluster], reverse=True)],
+        }
+        for cluster in np.argsort(-sizes)
+        if sizes[cluster]
+    ]
+    elapsed = time.perf_counter() - start
+    return {
+        "vectors": vectors,
+        "k": model.k,
+        "epochs": epochs,
+        "inertia": round(inertia, 4),
+        "elapsed_s": round(elapsed, 2),
+        "vectors_per_s": round(vectors * (epochs + 1) / elapsed, 1) if elapsed else None,
+        "clusters": clusters,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cluster complaint embeddings")
+    parser.add_argument(
+        "--collection",
+        default="complaint_embeddings",
+        help="Collection or alias; its partition collections are clustered with it",
+    )
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=5000)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--representatives", type=int, default=3)
+    parser.add_argument("--dry-run", action="store_true", help="Do not write cluster_id back")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    collections = complaint_collections(args.collection)
+    summary = run_clustering(
+        collections,
+        k=args.k,
+        page_size=args.page_size,
+        epochs=args.epochs,
+        representatives=args.representatives,
+        write_back=not args.dry_run,
+        seed=args.seed,
+    )
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    report_path = os.path.join(REPORTS_DIR, f"complaint_clusters_{timestamp}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"Clustered {summary['vectors']} vectors from {len(collections)} collection(s) into {summary['k']} clusters in {summary.get('elapsed_s', 0)}s")
+    for cluster in summary["clusters"][:10]:
+        print(f"  cluster {cluster['cluster_id']}: size={cluster['size']} top={cluster['top_categories']}")
+    print(f"Cluster summary saved: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
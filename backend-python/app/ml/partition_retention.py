@@ -0,0 +1,45 @@
+"""
+Complaint Embedding Partition Retention Job
+Drops monthly complaint_embeddings partitions past the retention window and
+compacts older months into one collection per year, so queries only fan out
+over a bounded number of recent partitions.
+
+Usage:
+    python -m app.ml.partition_retention --retention-months 24 --compact-after-months 6
+"""
+import argparse
+import json
+import os
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply retention to complaint embedding partitions")
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=int(os.getenv("SIMILARITY_RETENTION_MONTHS", "24")),
+        help="Drop partitions older than this many months (0 keeps everything)",
+    )
+    parser.add_argument(
+        "--compact-after-months",
+        type=int,
+        default=int(os.getenv("SIMILARITY_COMPACT_AFTER_MONTHS", "6")),
+        help="Merge monthly partitions older than this into yearly ones (0 disables)",
+    )
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Only print the plan")
+    args = parser.parse_args()
+
+    from app.services.similarity_service import similarity_service
+
+    summary = similarity_service.apply_retention(
+        retention_months=args.retention_months,
+        compact_after_months=args.compact_after_months,
+        dry_run=args.dry_run,
+        page_size=args.page_size,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
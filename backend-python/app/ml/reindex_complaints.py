@@ -0,0 +1,266 @@
+"""
+Complaint Similarity Reindex / Backfill Job
+Rebuilds complaint_embeddings from an export of the Postgres complaints table
+(JSONL or CSV with id/complaint_id, masked_text, category, status,
+created_at). Texts are embedded in batches across worker processes while the
+main process upserts in bulk and checkpoints after every upsert, so an
+interrupted run resumes where it stopped.
+
+Export, e.g.:
+    \\copy (SELECT id, masked_text, category, status, created_at FROM complaints ORDER BY id)
+        TO 'complaints.csv' CSV HEADER
+
+The rebuilt collection holds every exported complaint, so --switch also
+retires any monthly/yearly partition collections: they still hold old-model
+vectors of the same complaints. API workers drop their partition handles
+when they see the alias change; complaints indexed after that land in fresh
+partitions. Rebuilding the live collection in place leaves partitions alone
+(workers would not notice them disappear), so use --target with --switch.
+
+Usage:
+    python -m app.ml.reindex_complaints --input complaints.csv --workers 4
+    python -m app.ml.reindex_complaints --input complaints.csv --target complaint_embeddings_v2 --switch
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+
+_worker_embedding_fn = None
+
+
+def _init_worker() -> None:
+    global _worker_embedding_fn
+    from app.services.vector_store import VectorStoreRegistry
+
+    # Local model per process, never the sidecar: the point is parallel embedding
+    _worker_embedding_fn = VectorStoreRegistry().embedding_fn
+
+
+def _worker_embed(texts: List[str]) -> List[List[float]]:
+    return [[float(value) for value in vector] for vector in _worker_embedding_fn(texts)]
+
+
+def iter_export(path: str) -> Iterator[Dict]:
+    """Stream complaints from a JSONL or CSV export, one row at a time."""
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        if path.endswith((".jsonl", ".ndjson")):
+            rows: Iterator[Dict] = (json.loads(line) for line in handle if line.strip())
+        else:
+            rows = csv.DictReader(handle)
+        for row in rows:
+            complaint_id = row.get("complaint_id") or row.get("id")
+            masked_text = (row.get("masked_text") or row.get("maskedText") or "").strip()
+            if complaint_id is None or not masked_text:
+                yield {}
+                continue
+            yield {
+                "complaint_id": str(complaint_id),
+                "masked_text": masked_text,
+                "metadata": {
+                    "category": row.get("category") or "",
+                    "status": row.get("status") or "",
+                    "created_at": str(row.get("created_at") or row.get("createdAt") or ""),
+                },
+            }
+
+
+def _load_checkpoint(path: str, input_path: str, target: str) -> Dict:
+    if not os.path.exists(path):
+        return {"input": os.path.abspath(input_path), "target": target, "rows_done": 0, "upserted": 0, "skipped": 0}
+    with open(path, "r", encoding="utf-8") as handle:
+        checkpoint = json.load(handle)
+    if checkpoint.get("input") != os.path.abspath(input_path) or checkpoint.get("target") != target:
+        raise ValueError(f"Checkpoint {path} belongs to another input/target; pass --restart to discard it")
+    return checkpoint
+
+
+def _save_checkpoint(path: str, checkpoint: Dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump({**checkpoint, "updated_at": time.time()}, handle)
+    os.replace(tmp_path, path)
+
+
+def retire_partitions(vector_store) -> List[str]:
+    """Drop the complaint partition collections; returns their names."""
+    from app.services.similarity_service import COLLECTION_NAME, _partition_span
+
+    retired = [
+        name
+        for name in vector_store.list_collections(prefix=f"{COLLECTION_NAME}__")
+        if _partition_span(name) is not None
+    ]
+    for name in retired:
+        vector_store.drop_collection(name)
+    return retired
+
+
+def run_reindex(
+    input_path: str,
+    collection,
+    checkpoint_path: str,
+    batch_size: int = 256,
+    workers: int = 0,
+    embed: Optional[Callable[[List[str]], List]] = None,
+    total_rows: Optional[int] = None,
+    progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Embed and upsert every complaint in ``input_path`` into ``collection``,
+    resuming from ``checkpoint_path`` if it exists.
+
+    Args:
+        workers: Embedding processes (0 embeds in this process with ``embed``)
+        embed: In-process embedding function (default: the shared registry's)
+        total_rows: Rows in the export, for the ETA
+        progress: Called with the stats after every upsert
+
+    Returns:
+        Final stats (rows_done, upserted, skipped, vectors_per_s, elapsed_s)
+    """
+    from app.services.similarity_service import ComplaintSimilarityService
+
+    checkpoint = _load_checkpoint(checkpoint_path, input_path, collection.name)
+    resume_from = checkpoint["rows_done"]
+    if embed is None and workers <= 0:
+        from app.services.vector_store import vector_store
+
+        embed = vector_store.embedding_fn
+
+    def batches() -> Iterator[tuple]:
+        rows, items = 0, []
+        for index, item in enumerate(iter_export(input_path)):
+            if index < resume_from:
+                continue
+            rows += 1
+            if item:
+                items.append(item)
+            if rows == batch_size:
+                yield rows, items
+                rows, items = 0, []
+        if rows:
+            yield rows, items
+
+    start = time.perf_counter()
+    upserted_this_run = 0
+
+    def commit(rows: int, items: List[Dict], vectors: List) -> None:
+        nonlocal upserted_this_run
+        if items:
+            collection.upsert(
+                ids=[item["complaint_id"] for item in items],
+                embeddings=[[float(value) for value in vector] for vector in vectors],
+                documents=[item["masked_text"] for item in items],
+                metadatas=[ComplaintSimilarityService._prepare_metadata(item["metadata"]) for item in items],
+            )
+        checkpoint["rows_done"] += rows
+        checkpoint["upserted"] += len(items)
+        checkpoint["skipped"] += rows - len(items)
+        upserted_this_run += len(items)
+        _save_checkpoint(checkpoint_path, checkpoint)
+        if progress is not None:
+            progress(_stats(checkpoint, upserted_this_run, start, total_rows))
+
+    if workers > 0:
+        # Bounded in-flight batches keep memory flat; results are committed in
+        # input order so the checkpoint is always a clean prefix of the export
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            pending: deque = deque()
+            for rows, items in batches():
+                if items:
+                    future = pool.submit(_worker_embed, [item["masked_text"] for item in items])
+                else:
+                    # All rows skipped: nothing to embed, but the rows still checkpoint in order
+                    future = Future()
+                    future.set_result([])
+                pending.append((rows, items, future))
+                if len(pending) >= workers * 2:
+                    rows, items, future = pending.popleft()
+                    commit(rows, items, future.result())
+            while pending:
+                rows, items, future = pending.popleft()
+                commit(rows, items, future.result())
+    else:
+        for rows, items in batches():
+            commit(rows, items, embed([item["masked_text"] for item in items]) if items else [])
+
+    return _stats(checkpoint, upserted_this_run, start, total_rows)
+
+
+def _stats(checkpoint: Dict, upserted_this_run: int, start: float, total_rows: Optional[int]) -> Dict:
+    elapsed = time.perf_counter() - start
+    rate = upserted_this_run / elapsed if elapsed else 0.0
+    stats = {
+        "rows_done": checkpoint["rows_done"],
+        "upserted": checkpoint["upserted"],
+        "skipped": checkpoint["skipped"],
+        "elapsed_s": round(elapsed, 1),
+        "vectors_per_s": round(rate, 1),
+        "eta_s": None,
+    }
+    if total_rows is not None and rate:
+        stats["eta_s"] = round(max(0, total_rows - checkpoint["rows_done"]) / rate, 1)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the complaint similarity index from an export")
+    parser.add_argument("--input", required=True, help="JSONL or CSV export of the complaints table")
+    parser.add_argument("--target", default=None, help="Collection to build (default: the live one)")
+    parser.add_argument("--switch", action="store_true", help="Point complaint_embeddings at --target when done")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    from app.services.similarity_service import COLLECTION_NAME
+    from app.services.vector_store import vector_store
+
+    target = args.target or vector_store.resolve_alias(COLLECTION_NAME)
+    checkpoint_path = args.checkpoint or os.path.join(REPORTS_DIR, f"reindex_{target}.checkpoint.json")
+    os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    # Streaming count pass so progress can show an ETA
+    total_rows = sum(1 for _ in iter_export(args.input))
+
+    def report(stats: Dict) -> None:
+        print(
+            f"{stats['rows_done']}/{total_rows} rows, {stats['vectors_per_s']} vectors/s, "
+            f"ETA {stats['eta_s'] if stats['eta_s'] is not None else '?'}s",
+            flush=True,
+        )
+
+    stats = run_reindex(
+        args.input,
+        vector_store.get_collection(target),
+        checkpoint_path,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        total_rows=total_rows,
+        progress=report,
+    )
+    print(f"Reindex complete: {stats['upserted']} vectors in {target} ({stats['skipped']} rows skipped)")
+    if args.switch and target != vector_store.resolve_alias(COLLECTION_NAME):
+        vector_store.set_alias(COLLECTION_NAME, target)
+        print(f"{COLLECTION_NAME} now points to {target}; API workers follow within SIMILARITY_ALIAS_REFRESH_S")
+        retired = retire_partitions(vector_store)
+        if retired:
+            print(f"Retired {len(retired)} partition collections rebuilt into {target}: {', '.join(retired)}")
+    elif vector_store.list_collections(prefix=f"{COLLECTION_NAME}__"):
+        print("Partition collections still hold old-model vectors; rebuild with --target ... --switch to retire them")
+    os.remove(checkpoint_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,149 @@
-import chromadb
-from chromadb.utils import embedding_functions
+import argparse
+import hashlib
 import os
+import re
+from typing import Callable, Dict, List, Optional
 
-def chunk_text(text: str, max_words: int = 120, overlap: int = 20) -> list[str]:
-    words = text.split()
+from app.core.constants import GENERAL_SOP_CATEGORY, SOP_COLLECTION, sop_shard_collection
+from app.services.vector_store import vector_store
+
+HEADER_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FALLBACK_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+DEFAULT_MAX_TOKENS = int(os.getenv("RAG_CHUNK_MAX_TOKENS", "200"))
+# Tokenizer of the default Chroma embedding model (all-MiniLM-L6-v2)
+TOKENIZER_NAME = os.getenv("RAG_TOKENIZER", "sentence-transformers/all-MiniLM-L6-v2")
+
+_token_counter: Optional[Callable[[str], int]] = None
+
+
+def _fallback_count_tokens(text: str) -> int:
+    # Word/punctuation split; close to (slightly under) word-piece counts
+    return len(FALLBACK_TOKEN_RE.findall(text))
+
+
+def get_token_counter() -> Callable[[str], int]:
+    """Return a token counter backed by the embedding model's tokenizer when available."""
+    global _token_counter
+    if _token_counter is not None:
+        return _token_counter
+    try:
+        from tokenizers import Tokenizer
+
+        tokenizer = Tokenizer.from_pretrained(TOKENIZER_NAME)
+        _token_counter = lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+    except Exception as e:
+        print(f"Tokenizer {TOKENIZER_NAME} unavailable ({e}), using regex token estimate.")
+        _token_counter = _fallback_count_tokens
+    return _token_counter
+
+
+def _split_sections(text: str) -> List[Dict]:
+    """Split markdown into sections keyed by their header path."""
+    sections = []
+    header_stack: List[tuple[int, str]] = []
+    heading = None
+    body: List[str] = []
+
+    def flush():
+        if any(line.strip() for line in body):
+            sections.append({
+                "section_path": " > ".join(title for _, title in header_stack),
+                "heading": heading,
+                "body": "\n".join(body).strip(),
+            })
+
+    for line in text.splitlines():
+        match = HEADER_RE.match(line)
+        if match:
+            flush()
+            level = len(match.group(1))
+            while header_stack and header_stack[-1][0] >= level:
+                header_stack.pop()
+            header_stack.append((level, match.group(2)))
+            heading = line.strip()
+            body = []
+        else:
+            body.append(line)
+    flush()
+    return sections
+
+
+def _split_oversized(block: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Split a paragraph that exceeds the budget, line by line and word by word for long lines."""
+    pieces: List[str] = []
+    current = ""
+    for line in block.splitlines():
+        if count_tokens(line) <= max_tokens:
+            units = [(line, "\n")]
+        else:
+            units = [(word, "\n" if i == 0 else " ") for i, word in enumerate(line.split())]
+        for unit, sep in units:
+            candidate = f"{current}{sep}{unit}" if current else unit
+            if current and count_tokens(candidate) > max_tokens:
+                pieces.append(current)
+                current = unit
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_markdown(
+    text: str,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    count_tokens: Optional[Callable[[str], int]] = None,
+) -> List[Dict]:
+    """
+    Chunk markdown along its header hierarchy with a token budget.
+
+    Each section becomes one chunk when it fits in ``max_tokens``; larger sections
+    are packed paragraph by paragraph without overlap. Every chunk is prefixed with
+    its own heading so it stays self-contained.
+
+    Returns:
+        List of dicts with ``text``, ``section_path`` and ``token_count``.
+    """
+    count_tokens = count_tokens or get_token_counter()
     chunks = []
-    start = 0
-    while start < len(words):
-        end = min(start + max_words, len(words))
-        chunks.append(" ".join(words[start:end]))
-        if end == len(words):
-            break
-        start = max(0, end - overlap)
-    return chunks
-
-def ingest_data():
+    for section in _split_sections(text):
+        prefix = f"{section['heading']}\n" if section["heading"] else ""
+        budget = max(1, max_tokens - count_tokens(prefix))
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", section["body"]) if p.strip()]
+
+        blocks: List[str] = []
+        for paragraph in paragraphs:
+            if count_tokens(paragraph) > budget:
+                blocks.extend(_split_oversized(paragraph, budget, count_tokens))
+            else:
+                blocks.append(paragraph)
+
+        current: List[str] = []
+        for block in blocks:
+            if current and count_tokens("\n\n".join(current + [block])) > budget:
+                chunks.append((section["section_path"], prefix + "\n\n".join(current)))
+                current = []
+            current.append(block)
+        if current:
+            chunks.append((section["section_path"], prefix + "\n\n".join(current)))
+
+    return [
+        {"text": chunk, "section_path": path, "token_count": count_tokens(chunk)}
+        for path, chunk in chunks
+    ]
+
+
+def _content_hash(text: str) -> str:
+    normalized = " ".join(text.split()).casefold()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def ingest_data(sharded: bool = False):
     print("Initializing ChromaDB for ingestion...")
-    db_path = os.path.join(os.getcwd(), "chroma_db")
-    client = chromadb.PersistentClient(path=db_path)
-    embedding_fn = embedding_functions.DefaultEmbeddingFunction()
-    
     # Delete existing to start fresh
-    try:
-        client.delete_collection("complaint_sops")
-    except:
-        pass
-
-    collection = client.create_collection(
-        name="complaint_sops",
-        embedding_function=embedding_fn
-    )
+    vector_store.drop_collection(SOP_COLLECTION)
+    collection = vector_store.get_collection(SOP_COLLECTION)
 
     # 1. Load Markdown Files from data/sops/
     documents = []
@@ -41,18 +155,18 @@ def ingest_data():
         with open(os.path.join(sops_dir, "readme.md"), "w", encoding="utf-8") as f:
             f.write("# Welcome\nSystem initialized. Please add SOPs here.")
 
-    for filename in os.listdir(sops_dir):
+    for filename in sorted(os.listdir(sops_dir)):
         if filename.endswith(".md"):
             file_path = os.path.join(sops_dir, filename)
             with open(file_path, "r", encoding="utf-8") as f:
                 text = f.read()
-            
+
             # Simple Category Heuristic based on filename
-            category = "GENERAL"
+            category = GENERAL_SOP_CATEGORY
             if "credit" in filename: category = "CARD_LIMIT_CREDIT"
             elif "transfer" in filename: category = "TRANSFER_DELAY"
             elif "security" in filename: category = "ACCESS_LOGIN_MOBILE"
-            
+
             documents.append({
                 "text": text,
                 "category": category,
@@ -62,14 +176,20 @@ def ingest_data():
     chunked_docs = []
     ids = []
     metadatas = []
-    
+    seen_hashes = set()
+    duplicates_skipped = 0
+
     for doc in documents:
         doc_name = doc["filename"]
-        # Split by headers to keep context or just simple chunking
-        # For simplicity, using valid chunk_text function
-        for chunk_index, chunk in enumerate(chunk_text(doc["text"])):
+        for chunk_index, chunk in enumerate(chunk_markdown(doc["text"])):
+            content_hash = _content_hash(chunk["text"])
+            if content_hash in seen_hashes:
+                duplicates_skipped += 1
+                continue
+            seen_hashes.add(content_hash)
+
             chunk_id = f"{doc_name}_chunk_{chunk_index}"
-            chunked_docs.append(chunk)
+            chunked_docs.append(chunk["text"])
             ids.append(chunk_id)
             metadatas.append(
                 {
@@ -77,6 +197,8 @@ def ingest_data():
                     "doc_name": doc_name,
                     "chunk_id": chunk_id,
                     "category": doc["category"],
+                    "section_path": chunk["section_path"],
+                    "token_count": chunk["token_count"],
                 }
             )
 
@@ -84,13 +206,64 @@ def ingest_data():
         print("No documents found to ingest!")
         return
 
+    token_counts = [metadata["token_count"] for metadata in metadatas]
+    stats = {
+        "files": len(documents),
+        "chunks": len(chunked_docs),
+        "duplicates_skipped": duplicates_skipped,
+        "total_tokens": sum(token_counts),
+        "avg_tokens": round(sum(token_counts) / len(token_counts), 1),
+        "max_tokens": max(token_counts),
+    }
+
     print(f"Adding {len(chunked_docs)} chunks from {len(documents)} files...")
     collection.add(
         documents=chunked_docs,
         ids=ids,
         metadatas=metadatas,
     )
+    shard_categories = set()
+    if sharded:
+        # One collection per category plus GENERAL, so category queries only
+        # search their own vectors
+        shard_categories = {metadata["category"] for metadata in metadatas} | {GENERAL_SOP_CATEGORY}
+        # Reuse the vectors just computed instead of embedding every chunk twice
+        embeddings = collection.get(ids=ids, include=["embeddings"])
+        embedding_by_id = dict(zip(embeddings["ids"], embeddings["embeddings"]))
+        for category in sorted(shard_categories):
+            shard_name = sop_shard_collection(category)
+            vector_store.drop_collection(shard_name)
+            shard = vector_store.get_collection(shard_name)
+            positions = [i for i, metadata in enumerate(metadatas) if metadata["category"] == category]
+            if positions:
+                shard.add(
+                    embeddings=[embedding_by_id[ids[i]] for i in positions],
+                    documents=[chunked_docs[i] for i in positions],
+                    ids=[ids[i] for i in positions],
+                    metadatas=[metadatas[i] for i in positions],
+                )
+            print(f"Shard {shard_name}: {len(positions)} chunks")
+        stats["shards"] = len(shard_categories)
+    # Shards from an earlier sharded ingest would keep serving stale chunks
+    current_shards = {sop_shard_collection(category) for category in shard_categories}
+    for shard_name in vector_store.list_collections(f"{SOP_COLLECTION}__"):
+        if shard_name not in current_shards:
+            vector_store.drop_collection(shard_name)
+            print(f"Dropped stale shard {shard_name}")
+
+    print(
+        "Chunk stats: chunks={chunks} total_tokens={total_tokens} avg_tokens={avg_tokens} "
+        "max_tokens={max_tokens} duplicates_skipped={duplicates_skipped}".format(**stats)
+    )
     print("Ingestion complete. ChromaDB is ready.")
+    return stats
 
 if __name__ == "__main__":
-    ingest_data()
+    parser = argparse.ArgumentParser(description="Ingest SOP markdown into ChromaDB")
+    parser.add_argument(
+        "--sharded",
+        action="store_true",
+        default=os.getenv("RAG_SHARDED", "false").lower() == "true",
+        help="Also write one collection per category plus GENERAL",
+    )
+    ingest_data(sharded=parser.parse_args().sharded)
@@ -73,6 +73,38 @@ class ReviewActionResponse(BaseModel):
     status: str
     notes: Optional[str] = None
 
+class ReviewBulkRequest(BaseModel):
+    review_ids: List[str] = Field(..., min_length=1, max_length=10000)
+    status: Literal["APPROVED", "REJECTED"]
+    notes: Optional[str] = None
+
+class ReviewBulkResult(BaseModel):
+    review_id: str
+    status: str
+    updated: bool
+    error: Optional[str] = None
+
+class ReviewBulkResponse(BaseModel):
+    updated: int
+    not_found: int
+    results: List[ReviewBulkResult]
+
+class ReviewItem(BaseModel):
+    review_id: str
+    status: str
+    created_at: str
+    updated_at: str
+    masked_text: str
+    category: str
+    category_confidence: float
+    urgency: str
+    urgency_confidence: float
+    notes: Optional[str] = None
+
+class ReviewQueueResponse(BaseModel):
+    reviews: List[ReviewItem]
+    next_cursor: Optional[str] = None
+
 
 # --- LLM Internal Models ---
 
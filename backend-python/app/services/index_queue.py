@@ -0,0 +1,244 @@
+"""
+Complaint Index Queue
+Write-behind queue for /index-complaint: requests enqueue and return 202, a
+background worker coalesces queued items into batched upserts. Items that
+fail are set aside with an exponential-backoff not-before time and picked up
+again behind new work; after INDEX_QUEUE_MAX_ATTEMPTS (or at shutdown) they
+are appended to a dead-letter JSONL file whose lines are valid
+/index-complaints/batch items, so they can be replayed.
+
+Best effort: the queue lives in memory, so accepted items that were not
+flushed are lost if the process crashes or is killed.
+"""
+import heapq
+import itertools
+import json
+import os
+import queue
+import time
+from datetime import datetime, timezone
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.services.similarity_service import similarity_service
+
+
+class ComplaintIndexQueue:
+    def __init__(self) -> None:
+        self.logger = get_logger("complaintops.index_queue")
+        self.max_size = int(os.getenv("INDEX_QUEUE_MAX_SIZE", "10000"))
+        self.batch_size = int(os.getenv("INDEX_QUEUE_BATCH_SIZE", "64"))
+        self.flush_interval = float(os.getenv("INDEX_QUEUE_FLUSH_INTERVAL_MS", "200")) / 1000
+        self.put_timeout = float(os.getenv("INDEX_QUEUE_PUT_TIMEOUT_MS", "50")) / 1000
+        self.max_attempts = int(os.getenv("INDEX_QUEUE_MAX_ATTEMPTS", "5"))
+        self.retry_backoff = float(os.getenv("INDEX_QUEUE_RETRY_BACKOFF_MS", "500")) / 1000
+        self.dead_letter_path = os.getenv("INDEX_QUEUE_DEAD_LETTER_PATH", "index_dead_letter.jsonl")
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=self.max_size)
+        self._lock = Lock()
+        self._stop = Event()
+        self._worker: Optional[Thread] = None
+        # Failed items waiting to be retried: heap of (not_before, seq, item),
+        # plus the enqueued_at of each id's live retry (older entries are stale)
+        self._retries: List[Tuple[float, int, Dict]] = []
+        self._retry_of: Dict[str, float] = {}
+        self._retry_seq = itertools.count()
+        self._stats = {
+            "enqueued": 0,
+            "rejected": 0,
+            "indexed": 0,
+            "duplicates": 0,
+            "failed": 0,
+            "retries": 0,
+            "dead_lettered": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "last_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+            "last_lag_ms": 0.0,
+        }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._stop.clear()
+                self._worker = Thread(target=self._run, name="index-queue", daemon=True)
+                self._worker.start()
+
+    def enqueue(self, complaint_id: str, masked_text: str, metadata: Optional[Dict] = None) -> bool:
+        """
+        Queue a complaint for indexing.
+
+        Returns:
+            False when the queue stays full for INDEX_QUEUE_PUT_TIMEOUT_MS (backpressure)
+        """
+        self._ensure_worker()
+        item = {
+            "complaint_id": complaint_id,
+            "masked_text": masked_text,
+            "metadata": metadata or {},
+            "enqueued_at": time.monotonic(),
+            "attempts": 0,
+        }
+        try:
+            self._queue.put(item, timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            return False
+        with self._lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    def _drain_batch(self) -> List[Dict]:
+        """New items first, topped up with retries whose not-before time has passed."""
+        wait = self.flush_interval
+        with self._lock:
+            if self._retries:
+                wait = min(wait, max(0.0, self._retries[0][0] - time.monotonic()))
+        batch: List[Dict] = []
+        try:
+            batch.append(self._queue.get(timeout=wait))
+        except queue.Empty:
+            pass
+        if batch:
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        now = time.monotonic()
+        with self._lock:
+            while self._retries and len(batch) < self.batch_size and self._retries[0][0] <= now:
+                _, _, item = heapq.heappop(self._retries)
+                if self._retry_of.get(item["complaint_id"]) == item["enqueued_at"]:
+                    del self._retry_of[item["complaint_id"]]
+                    batch.append(item)
+        return batch
+
+    def _schedule_retries(self, failed: List[Dict]) -> None:
+        """Set failed items aside until their backoff passes, or dead-letter them."""
+        give_up = []
+        now = time.monotonic()
+        with self._lock:
+            for item in failed:
+                # On shutdown do not hold up the exit
+                if item["attempts"] >= self.max_attempts or self._stop.is_set():
+                    give_up.append(item)
+                    continue
+                not_before = now + min(30.0, self.retry_backoff * 2 ** (item["attempts"] - 1))
+                heapq.heappush(self._retries, (not_before, next(self._retry_seq), item))
+                self._retry_of[item["complaint_id"]] = item["enqueued_at"]
+                self._stats["retries"] += 1
+        if give_up:
+            self._dead_letter(give_up)
+
+    def _flush(self, batch: List[Dict]) -> List[Dict]:
+        """
+        Index one batch.
+
+        Returns:
+            The items that failed, each with its ``error``
+        """
+        # Coalesce repeated ids: the most recently enqueued text/metadata wins
+        latest: Dict[str, Dict] = {}
+        for item in batch:
+            current = latest.get(item["complaint_id"])
+            if current is None or item["enqueued_at"] >= current["enqueued_at"]:
+                latest[item["complaint_id"]] = item
+        start = time.perf_counter()
+        try:
+            results = similarity_service.index_complaints(list(latest.values()), batch_size=self.batch_size)
+        except Exception as e:
+            self.logger.error("Index queue flush of %s items failed: %s", len(latest), e)
+            results = [
+                {"complaint_id": complaint_id, "status": "failed", "error": str(e)} for complaint_id in latest
+            ]
+        flush_ms = (time.perf_counter() - start) * 1000
+        oldest = min(item["enqueued_at"] for item in batch)
+        failed = []
+        with self._lock:
+            for item, result in zip(latest.values(), results):
+                if result["status"] == "failed":
+                    failed.append({**item, "attempts": item["attempts"] + 1, "error": result.get("error")})
+                    continue
+                self._stats["indexed" if result["status"] == "indexed" else "duplicates"] += 1
+                if self._retry_of.get(item["complaint_id"], item["enqueued_at"]) < item["enqueued_at"]:
+                    # Newer text is indexed; drop the older pending retry
+                    del self._retry_of[item["complaint_id"]]
+            self._stats["coalesced"] += len(batch) - len(latest)
+            self._stats["flushes"] += 1
+            self._stats["last_flush_ms"] = round(flush_ms, 1)
+            self._stats["total_flush_ms"] += flush_ms
+            self._stats["last_lag_ms"] = round((time.monotonic() - oldest) * 1000, 1)
+        return failed
+
+    def _dead_letter(self, items: List[Dict]) -> None:
+        failed_at = datetime.now(timezone.utc).isoformat()
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as handle:
+                for item in items:
+                    record = {
+                        "complaint_id": item["complaint_id"],
+                        "masked_text": item["masked_text"],
+                        **item["metadata"],
+                        "error": item.get("error"),
+                        "attempts": item["attempts"],
+                        "failed_at": failed_at,
+                    }
+                    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            self.logger.error("Could not write index dead letters to %s: %s", self.dead_letter_path, e)
+        self.logger.error(
+            "Index queue gave up on %s complaints (dead letters in %s): %s",
+            len(items),
+            self.dead_letter_path,
+            ",".join(item["complaint_id"] for item in items),
+        )
+        with self._lock:
+            self._stats["failed"] += len(items)
+            self._stats["dead_lettered"] += len(items)
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._drain_batch()
+            if batch:
+                self._schedule_retries(self._flush(batch))
+        with self._lock:
+            pending = [
+                item for _, _, item in sorted(self._retries)
+                if self._retry_of.get(item["complaint_id"]) == item["enqueued_at"]
+            ]
+            self._retries, self._retry_of = [], {}
+        if pending:
+            self._dead_letter(pending)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Drain what is queued and stop the worker."""
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+
+    def stats(self) -> Dict:
+        with self._queue.mutex:
+            oldest = self._queue.queue[0]["enqueued_at"] if self._queue.queue else None
+            depth = len(self._queue.queue)
+        with self._lock:
+            stats = dict(self._stats)
+            stats["retry_pending"] = len(self._retry_of)
+        total_flush_ms = stats.pop("total_flush_ms")
+        stats["avg_flush_ms"] = round(total_flush_ms / stats["flushes"], 1) if stats["flushes"] else 0.0
+        stats["depth"] = depth
+        stats["max_size"] = self.max_size
+        stats["lag_ms"] = round((time.monotonic() - oldest) * 1000, 1) if oldest is not None else 0.0
+        return stats
+
+
+# Global instance
+index_queue = ComplaintIndexQueue()
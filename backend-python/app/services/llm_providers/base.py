@@ -1,7 +1,15 @@
 from abc import ABC, abstractmethod
+import asyncio
+import os
+from typing import AsyncIterator, Optional, Tuple
 
 
 class AbstractLLMProvider(ABC):
+    # Env var bounding this provider's in-flight async generations
+    # (falls back to LLM_MAX_CONCURRENCY)
+    concurrency_env = "LLM_MAX_CONCURRENCY"
+    _concurrency: Optional[asyncio.Semaphore] = None
+
     @abstractmethod
     def generate_response(self, text: str, category: str, urgency: str, snippets: list) -> dict:
         """
@@ -17,3 +25,34 @@ class AbstractLLMProvider(ABC):
             dict: Structured response containing action_plan, customer_reply_draft, etc.
         """
         pass
+
+    @property
+    def concurrency(self) -> asyncio.Semaphore:
+        """Per-provider limit on concurrent upstream calls; excess callers wait on it."""
+        if self._concurrency is None:
+            limit = os.getenv(self.concurrency_env) or os.getenv("LLM_MAX_CONCURRENCY", "64")
+            self._concurrency = asyncio.Semaphore(int(limit))
+        return self._concurrency
+
+    async def agenerate_response(self, text: str, category: str, urgency: str, snippets: list) -> dict:
+        """
+        Async variant of generate_response. Providers with an async client
+        override this; the default runs the sync call in a worker thread.
+        """
+        async with self.concurrency:
+            return await asyncio.to_thread(self.generate_response, text, category, urgency, snippets)
+
+    async def astream_response(
+        self, text: str, category: str, urgency: str, snippets: list
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Streaming variant yielding (event, data) pairs: "delta" with field,
+        index and text as the reply is produced, "reset" when a failed
+        attempt is retried (discard earlier deltas), and one terminal "final"
+        with the validated result. The default emits the whole result at once.
+        """
+        result = await self.agenerate_response(text, category, urgency, snippets)
+        yield "delta", {"field": "customer_reply_draft", "index": None, "text": result["customer_reply_draft"]}
+        for index, step in enumerate(result["action_plan"]):
+            yield "delta", {"field": "action_plan", "index": index, "text": step}
+        yield "final", result
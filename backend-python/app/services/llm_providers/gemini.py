@@ -7,6 +7,8 @@ from app.core.logging import get_logger
 logger = get_logger("complaintops.llm_gemini")
 
 class GeminiProvider(AbstractLLMProvider):
+    concurrency_env = "GEMINI_MAX_CONCURRENCY"
+
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY") or os.getenv("API_KEY")
         if not api_key:
@@ -19,22 +21,31 @@ class GeminiProvider(AbstractLLMProvider):
         else:
             self.model = None
 
-    def generate_response(self, text: str, category: str, urgency: str, snippets: list) -> dict:
-        if not self.model:
-            return {
-                "action_plan": ["Gemini Key Missing"],
-                "customer_reply_draft": "System configuration error.",
-                "risk_flags": ["CONFIG_ERROR"],
-                "sources": [],
-                "error_code": "GEMINI_MISSING"
-            }
+    def _missing_key_response(self) -> dict:
+        return {
+            "action_plan": ["Gemini Key Missing"],
+            "customer_reply_draft": "System configuration error.",
+            "risk_flags": ["CONFIG_ERROR"],
+            "sources": [],
+            "error_code": "GEMINI_MISSING"
+        }
 
+    def _error_response(self) -> dict:
+        return {
+            "action_plan": ["Error calling Gemini"],
+            "customer_reply_draft": "System Error: Could not generate draft.",
+            "risk_flags": ["LLM_ERROR"],
+            "sources": [],
+            "error_code": "GEMINI_ERROR"
+        }
+
+    def _build_prompt(self, text: str, category: str, urgency: str, snippets: list) -> str:
         context = "\n".join(
             f"[{item.get('doc_name', 'unknown')}:{item.get('chunk_id', 'unknown')}] {item.get('snippet', '')}"
             for item in snippets
         )
         
-        prompt = f"""
+        return f"""
         You are a helpful banking customer support assistant.
         
         Task: Analyze the complaint and provide a structured JSON response.
@@ -64,24 +75,39 @@ class GeminiProvider(AbstractLLMProvider):
             ]
         }}
         """
-        
+
+    def _parse(self, content: str) -> dict:
+        # Cleanup JSON markdown if present
+        if content.startswith("```json"):
+            content = content.replace("```json", "").replace("```", "")
+
+        parsed = json.loads(content.strip())
+        parsed["error_code"] = None
+        return parsed
+
+    def generate_response(self, text: str, category: str, urgency: str, snippets: list) -> dict:
+        if not self.model:
+            return self._missing_key_response()
+
         try:
-            response = self.model.generate_content(prompt)
-            # Cleanup JSON markdown if present
-            content = response.text
-            if content.startswith("```json"):
-                content = content.replace("```json", "").replace("```", "")
-            
-            parsed = json.loads(content.strip())
-            parsed["error_code"] = None
-            return parsed
-            
+            response = self.model.generate_content(self._build_prompt(text, category, urgency, snippets))
+            return self._parse(response.text)
+
         except Exception as e:
             logger.error(f"Gemini generation error: {e}")
-            return {
-                "action_plan": ["Error calling Gemini"],
-                "customer_reply_draft": "System Error: Could not generate draft.",
-                "risk_flags": ["LLM_ERROR"],
-                "sources": [],
-                "error_code": "GEMINI_ERROR"
-            }
+            return self._error_response()
+
+    async def agenerate_response(self, text: str, category: str, urgency: str, snippets: list) -> dict:
+        if not self.model:
+            return self._missing_key_response()
+
+        try:
+            async with self.concurrency:
+                response = await self.model.generate_content_async(
+                    self._build_prompt(text, category, urgency, snippets)
+                )
+            return self._parse(response.text)
+
+        except Exception as e:
+            logger.error(f"Gemini async generation error: {e}")
+            return self._error_response()
@@ -0,0 +1,133 @@
+"""
+Incremental JSON scanning for streamed LLM output.
+Consumes the model's token stream character by character and emits the
+decoded text of ``customer_reply_draft`` and of each ``action_plan`` item as
+soon as it is produced, long before the document is complete enough to
+json.loads. Anything before the first ``{`` (e.g. a ```json fence) and after
+the root object is ignored; full validation still happens on the final text.
+"""
+from typing import List, Optional, Tuple
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# (field, action_plan index or None, text)
+FieldDelta = Tuple[str, Optional[int], str]
+
+
+class _Frame:
+    __slots__ = ("is_object", "key", "expect_key", "items")
+
+    def __init__(self, is_object: bool) -> None:
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.expect_key = is_object
+        self.items = 0
+
+
+class StreamingFieldParser:
+    def __init__(self) -> None:
+        self._stack: List[_Frame] = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._string_is_key = False
+        self._target: Optional[Tuple[str, Optional[int]]] = None
+        self._key_chars: List[str] = []
+        self._escape = False
+        self._unicode: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._out: List[FieldDelta] = []
+
+    def feed(self, chunk: str) -> List[FieldDelta]:
+        """Scan the next piece of output; returns the field text it completed, coalesced."""
+        self._out = []
+        for char in chunk:
+            if self._done:
+                break
+            if self._in_string:
+                self._string_char(char)
+            else:
+                self._structural_char(char)
+        return self._out
+
+    def _structural_char(self, char: str) -> None:
+        if not self._started:
+            if char == "{":
+                self._started = True
+                self._stack.append(_Frame(is_object=True))
+            return
+        frame = self._stack[-1]
+        if char == '"':
+            self._in_string = True
+            self._string_is_key = frame.is_object and frame.expect_key
+            self._key_chars = []
+            self._target = None if self._string_is_key else self._value_target(frame)
+        elif char in "{[":
+            if not frame.is_object:
+                frame.items += 1
+            self._stack.append(_Frame(is_object=char == "{"))
+        elif char in "}]":
+            self._stack.pop()
+            if not self._stack:
+                self._done = True
+        elif char == ":":
+            frame.expect_key = False
+        elif char == "," and frame.is_object:
+            frame.expect_key = True
+
+    def _value_target(self, frame: _Frame) -> Optional[Tuple[str, Optional[int]]]:
+        if not frame.is_object:
+            frame.items += 1
+        if len(self._stack) == 1 and frame.key == "customer_reply_draft":
+            return ("customer_reply_draft", None)
+        if len(self._stack) == 2 and not frame.is_object and self._stack[0].key == "action_plan":
+            return ("action_plan", frame.items - 1)
+        return None
+
+    def _string_char(self, char: str) -> None:
+        if self._unicode is not None:
+            self._unicode += char
+            if len(self._unicode) == 4:
+                try:
+                    code = int(self._unicode, 16)
+                except ValueError:
+                    code = 0xFFFD
+                self._unicode = None
+                self._code_point(code)
+            return
+        if self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode = ""
+            else:
+                self._emit(_ESCAPES.get(char, char))
+            return
+        if char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._string_is_key:
+                self._stack[-1].key = "".join(self._key_chars)
+        else:
+            self._emit(char)
+
+    def _code_point(self, code: int) -> None:
+        if 0xD800 <= code < 0xDC00:
+            self._high_surrogate = code
+            return
+        if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self._high_surrogate = None
+        self._emit(chr(code) if not 0xD800 <= code < 0xE000 else "\ufffd")
+
+    def _emit(self, text: str) -> None:
+        if self._string_is_key:
+            self._key_chars.append(text)
+            return
+        if self._target is None:
+            return
+        field, index = self._target
+        if self._out and self._out[-1][:2] == (field, index):
+            self._out[-1] = (field, index, self._out[-1][2] + text)
+        else:
+            self._out.append((field, index, text))
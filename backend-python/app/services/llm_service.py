@@ -61,17 +61,35 @@ class LLMClient:
             logger.error(f"Could not init LLM Provider: {e}. Switching to Mock Mode.")
             self.mock_mode = True
 
+    def _mock_response(self, category: str, urgency: str) -> dict:
+        return {
+            "action_plan": ["Mock Step 1 (Fallback)", "Mock Step 2"],
+            "customer_reply_draft": f"MOCK RESPONSE: Received {category}/{urgency} complaint. Provider init failed.",
+            "risk_flags": ["MOCK_MODE_ACTIVE"],
+            "sources": [],
+            "error_code": None,
+        }
+
     def generate_response(self, text: str, category: str, urgency: str, snippets: list) -> dict:
         if self.mock_mode:
-             return {
-                "action_plan": ["Mock Step 1 (Fallback)", "Mock Step 2"],
-                "customer_reply_draft": f"MOCK RESPONSE: Received {category}/{urgency} complaint. Provider init failed.",
-                "risk_flags": ["MOCK_MODE_ACTIVE"],
-                "sources": [],
-                "error_code": None,
-            }
-        
+            return self._mock_response(category, urgency)
+
         return self.provider.generate_response(text, category, urgency, snippets)
 
+    async def agenerate_response(self, text: str, category: str, urgency: str, snippets: list) -> dict:
+        if self.mock_mode:
+            return self._mock_response(category, urgency)
+
+        return await self.provider.agenerate_response(text, category, urgency, snippets)
+
+    async def astream_response(self, text: str, category: str, urgency: str, snippets: list):
+        """(event, data) pairs from the provider; see AbstractLLMProvider.astream_response."""
+        if self.mock_mode:
+            yield "final", self._mock_response(category, urgency)
+            return
+
+        async for event, data in self.provider.astream_response(text, category, urgency, snippets):
+            yield event, data
+
 # Global Instance
 llm_client = LLMClient()
@@ -0,0 +1,181 @@
+"""
+Near-Duplicate Detection
+MinHash signatures + banded LSH over complaint text, used by the similarity
+service to catch near-identical complaints (e.g. incident storms) before they
+reach the embedding model, and to group them into duplicate clusters.
+"""
+import re
+import zlib
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_NON_WORD_RE = re.compile(r"[^\w\s]", re.UNICODE)
+
+
+def _shingles(text: str, size: int) -> Set[int]:
+    """Character shingles of the normalized text, hashed to 31 bits."""
+    normalized = " ".join(_NON_WORD_RE.sub(" ", text.casefold()).split())
+    if len(normalized) <= size:
+        return {zlib.crc32(normalized.encode("utf-8")) & _MERSENNE_PRIME}
+    return {
+        zlib.crc32(normalized[i:i + size].encode("utf-8")) & _MERSENNE_PRIME
+        for i in range(len(normalized) - size + 1)
+    }
+
+
+class MinHashLSHIndex:
+    """
+    In-memory MinHash/LSH index mapping complaints to canonical complaints.
+
+    A complaint whose estimated Jaccard similarity to an indexed canonical is
+    at least ``threshold`` is linked to that canonical; otherwise it becomes a
+    canonical itself. Beyond ``max_tracked`` complaints, the groups matched
+    least recently are forgotten first.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        threshold: float = 0.85,
+        shingle_size: int = 5,
+        seed: int = 42,
+        max_tracked: int = 100_000,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_tracked = max_tracked
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._lock = Lock()
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._canonical_of: Dict[str, str] = {}
+        self._clusters: Dict[str, Set[str]] = {}
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(_shingles(text, self.shingle_size), dtype=np.uint64)
+        # (a * x + b) mod p for every permutation/shingle pair; fits in uint64
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _best_match(self, signature: np.ndarray, band_keys: List[bytes]) -> Optional[Tuple[str, float]]:
+        candidates: Set[str] = set()
+        for band, key in enumerate(band_keys):
+            candidates |= self._buckets[band].get(key, set())
+        best = None
+        for candidate in candidates:
+            score = float(np.mean(self._signatures[candidate] == signature))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate, score)
+        return best
+
+    def add(self, complaint_id: str, text: str) -> Optional[Tuple[str, float]]:
+        """
+        Register a complaint, or re-register it with its current text.
+
+        Returns:
+            (canonical_id, estimated_jaccard) when it is a near-duplicate of an
+            indexed canonical, else None (it is now a canonical itself)
+        """
+        signature = self.signature(text)
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            if complaint_id in self._canonical_of:
+                canonical = self._canonical_of[complaint_id]
+                if np.array_equal(self._signatures[complaint_id], signature):
+                    if canonical == complaint_id:
+                        return None
+                    return canonical, float(np.mean(self._signatures[canonical] == signature))
+                # Text changed since it was linked: relink from scratch
+                self._remove_locked(complaint_id)
+            self._signatures[complaint_id] = signature
+            match = self._best_match(signature, band_keys)
+            if match is not None:
+                canonical = match[0]
+                self._canonical_of[complaint_id] = canonical
+                # Re-insert so the clusters stay ordered least recently matched first
+                self._clusters[canonical] = self._clusters.pop(canonical)
+                self._clusters[canonical].add(complaint_id)
+                self._evict_locked()
+                return match
+            # Only canonicals go into the LSH buckets, so candidate lookups
+            # grow with distinct complaints rather than with storm volume
+            for band, key in enumerate(band_keys):
+                self._buckets[band].setdefault(key, set()).add(complaint_id)
+            self._canonical_of[complaint_id] = complaint_id
+            self._clusters[complaint_id] = {complaint_id}
+            self._evict_locked()
+            return None
+
+    def remove(self, complaint_id: str) -> None:
+        """Forget a complaint (e.g. deleted, or its indexing failed)."""
+        with self._lock:
+            self._remove_locked(complaint_id)
+
+    def _evict_locked(self) -> None:
+        # The first cluster is the least recently matched one
+        while len(self._canonical_of) > self.max_tracked and len(self._clusters) > 1:
+            self._remove_locked(next(iter(self._clusters)))
+
+    def _remove_locked(self, complaint_id: str) -> None:
+        canonical = self._canonical_of.pop(complaint_id, None)
+        if canonical is None:
+            return
+        signature = self._signatures.pop(complaint_id)
+        self._clusters.get(canonical, set()).discard(complaint_id)
+        if canonical != complaint_id:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(complaint_id)
+                if not bucket:
+                    del self._buckets[band][key]
+        # Orphaned members fall back to being their own singleton groups
+        for member in self._clusters.pop(complaint_id, set()):
+            self._canonical_of.pop(member, None)
+            self._signatures.pop(member, None)
+
+    def canonical_of(self, complaint_id: str) -> Optional[str]:
+        return self._canonical_of.get(complaint_id)
+
+    def cluster(self, complaint_id: str) -> Optional[Dict]:
+        with self._lock:
+            canonical = self._canonical_of.get(complaint_id)
+            if canonical is None:
+                return None
+            members = sorted(self._clusters[canonical])
+        return {"canonical_id": canonical, "size": len(members), "member_ids": members}
+
+    def clusters(self, min_size: int = 2, limit: int = 50) -> List[Dict]:
+        """Largest duplicate clusters first."""
+        with self._lock:
+            sized = [
+                (canonical, len(members))
+                for canonical, members in self._clusters.items()
+                if len(members) >= min_size
+            ]
+        sized.sort(key=lambda item: item[1], reverse=True)
+        return [{"canonical_id": canonical, "size": size} for canonical, size in sized[:limit]]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "tracked": len(self._canonical_of),
+                "canonicals": len(self._clusters),
+                "duplicates": len(self._canonical_of) - len(self._clusters),
+                "threshold": self.threshold,
+            }
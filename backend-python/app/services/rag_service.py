@@ -1,27 +1,57 @@
-import chromadb
-from chromadb.utils import embedding_functions
 import os
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Set
 
+from app.core.constants import GENERAL_SOP_CATEGORY, SOP_COLLECTION, sop_shard_collection
 from app.core.logging import get_logger
+from app.services.vector_store import vector_store
 
 class RAGManager:
     def __init__(self):
-        # Initialize ChromaDB Client
-        # Persistent storage in ./chroma_db
-        db_path = os.path.join(os.getcwd(), "chroma_db")
-        self.client = chromadb.PersistentClient(path=db_path)
+        # Client and embedding function are shared with the similarity service
         self.default_top_k = int(os.getenv("RAG_TOP_K", "4"))
         self.logger = get_logger("complaintops.rag_manager")
-        
-        # Use simple default embedding function (all-MiniLM-L6-v2)
-        # Note: In production for Turkish, a multilingual model like 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2' is better
-        self.embedding_fn = embedding_functions.DefaultEmbeddingFunction() 
-        
-        self.collection = self.client.get_or_create_collection(
-            name="complaint_sops",
-            embedding_function=self.embedding_fn
-        )
+        self.collection = vector_store.get_collection(SOP_COLLECTION)
+        # Route category queries to per-category shards (see ingest --sharded)
+        self.sharded = os.getenv("RAG_SHARDED", "false").lower() == "true"
+        self.shard_refresh_s = float(os.getenv("RAG_SHARD_REFRESH_S", "60"))
+        self._shards: Set[str] = set()
+        self._shards_listed_at = float("-inf")
+
+    def _existing_shards(self) -> Set[str]:
+        """Shard collections on disk, re-listed every RAG_SHARD_REFRESH_S (picks up re-ingests)."""
+        if time.monotonic() - self._shards_listed_at > self.shard_refresh_s:
+            self._shards = set(vector_store.list_collections(f"{SOP_COLLECTION}__"))
+            self._shards_listed_at = time.monotonic()
+        return self._shards
+
+    def _retrieve_sharded(self, query: str, top_k: int, category: str) -> Optional[List[Dict]]:
+        """
+        Query the category shard and the GENERAL shard, merged by distance.
+
+        Returns:
+            None when the category has no shard (the caller falls back to the
+            filtered query on the combined collection)
+        """
+        # get_collection creates missing collections, so never probe with it
+        existing = self._existing_shards()
+        if sop_shard_collection(category) not in existing:
+            return None
+        query_embedding = vector_store.embedding_fn([query])[0]
+        shards = [sop_shard_collection(category)]
+        if category != GENERAL_SOP_CATEGORY and sop_shard_collection(GENERAL_SOP_CATEGORY) in existing:
+            shards.append(sop_shard_collection(GENERAL_SOP_CATEGORY))
+        hits = []
+        for shard in shards:
+            results = vector_store.get_collection(shard).query(
+                query_embeddings=[query_embedding],
+                n_results=top_k,
+                include=["documents", "metadatas", "distances"],
+            )
+            if results["documents"]:
+                hits.extend(zip(results["distances"][0], results["documents"][0], results["metadatas"][0]))
+        hits.sort(key=lambda hit: hit[0])
+        return [(doc, metadata) for _, doc, metadata in hits[:top_k]]
 
     def retrieve(
         self,
@@ -31,27 +61,28 @@ class RAGManager:
     ) -> List[Dict[str, str]]:
         try:
             resolved_top_k = n_results or self.default_top_k
-            where_filter = {"category": category} if category else None
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=resolved_top_k,
-                where=where_filter,
-                include=["documents", "metadatas"]
-            )
-            # Flatten results list
-            if results["documents"]:
-                documents = results["documents"][0]
-                metadatas = results["metadatas"][0]
-                return [
-                    {
-                        "snippet": doc,
-                        "source": metadata.get("source", "unknown"),
-                        "doc_name": metadata.get("doc_name", "unknown"),
-                        "chunk_id": metadata.get("chunk_id", "unknown"),
-                    }
-                    for doc, metadata in zip(documents, metadatas)
-                ]
-            return []
+            hits = None
+            if self.sharded and category:
+                hits = self._retrieve_sharded(query, resolved_top_k, category)
+            if hits is None:
+                where_filter = {"category": category} if category else None
+                results = self.collection.query(
+                    query_texts=[query],
+                    n_results=resolved_top_k,
+                    where=where_filter,
+                    include=["documents", "metadatas"]
+                )
+                # Flatten results list
+                hits = list(zip(results["documents"][0], results["metadatas"][0])) if results["documents"] else []
+            return [
+                {
+                    "snippet": doc,
+                    "source": metadata.get("source", "unknown"),
+                    "doc_name": metadata.get("doc_name", "unknown"),
+                    "chunk_id": metadata.get("chunk_id", "unknown"),
+                }
+                for doc, metadata in hits
+            ]
         except Exception as e:
             self.logger.error("RAG retrieve error: %s", e)
             return []
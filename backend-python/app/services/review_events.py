@@ -0,0 +1,153 @@
+"""
+Review Event Bus
+In-process pub/sub behind GET /review/events. ReviewStore publishes one event
+per review_audit row (event id = audit_id) after the write commits; each SSE
+subscriber gets a bounded asyncio queue. A subscriber that falls behind is
+marked lagged instead of growing its buffer, and catches up from
+review_audit by audit_id, the same path used to resume from Last-Event-ID.
+
+Writes made by other gunicorn workers are picked up by a tailer thread that
+follows review_audit by audit_id while this process has subscribers, so live
+ids can arrive out of order; streams send a DeliveryWatermark as the SSE id.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from threading import Lock, Thread
+from typing import Callable, Dict, List, Optional, Set
+
+from app.core.logging import get_logger
+
+
+class ReviewSubscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int, status: Optional[str]) -> None:
+        self.loop = loop
+        self.queue: "asyncio.Queue[Dict]" = asyncio.Queue(maxsize=maxsize)
+        self.status = status
+        self.lagged = False
+        self.overflows = 0
+
+    def _offer(self, event: Dict) -> None:
+        # Runs on the subscriber's event loop
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+            self.overflows += 1
+
+
+class DeliveryWatermark:
+    """
+    Highest audit_id at or below which every event has been delivered, sent
+    as the SSE event id so a client resuming from Last-Event-ID cannot skip
+    a lower id that arrived after a higher one. Ids sent live above it are
+    tracked until the gap below them closes.
+    """
+
+    def __init__(self, floor: int) -> None:
+        self.floor = floor
+        self.sent_above: Set[int] = set()
+
+    def offer(self, audit_id: int) -> bool:
+        """Record a live event; False if it was already delivered."""
+        if audit_id <= self.floor or audit_id in self.sent_above:
+            return False
+        self.sent_above.add(audit_id)
+        self._close_gaps()
+        return True
+
+    def read_through(self, audit_id: int) -> None:
+        """Every event up to ``audit_id`` was read from review_audit and delivered."""
+        if audit_id > self.floor:
+            self.floor = audit_id
+            self.sent_above = {sent for sent in self.sent_above if sent > audit_id}
+            self._close_gaps()
+
+    def _close_gaps(self) -> None:
+        while self.floor + 1 in self.sent_above:
+            self.floor += 1
+            self.sent_above.discard(self.floor)
+
+
+class ReviewEventBus:
+    def __init__(self, fetch_after: Callable[[int, int], List[Dict]], latest_id: Callable[[], int]) -> None:
+        self.logger = get_logger("complaintops.review_events")
+        self.buffer_size = int(os.getenv("REVIEW_EVENTS_BUFFER", "1000"))
+        self.tail_interval = float(os.getenv("REVIEW_EVENTS_TAIL_MS", "1000")) / 1000
+        self._fetch_after = fetch_after
+        self._latest_id = latest_id
+        self._lock = Lock()
+        self._subscribers: Set[ReviewSubscriber] = set()
+        # Ids already fanned out, so tailed rows from this worker are not sent twice
+        self._recent: "OrderedDict[int, None]" = OrderedDict()
+        self._tailer: Optional[Thread] = None
+        self._stats = {"published": 0, "overflows": 0}
+
+    def subscribe(self, status: Optional[str] = None) -> ReviewSubscriber:
+        """Register a subscriber on the running event loop."""
+        subscriber = ReviewSubscriber(asyncio.get_running_loop(), self.buffer_size, status)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            start_tailer = self.tail_interval > 0 and (self._tailer is None or not self._tailer.is_alive())
+            if start_tailer:
+                self._tailer = Thread(target=self._tail, name="review-events-tail", daemon=True)
+                self._tailer.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: ReviewSubscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            self._stats["overflows"] += subscriber.overflows
+
+    def publish(self, events: List[Dict]) -> None:
+        """Fan committed audit events out to subscribers (thread-safe, non-blocking)."""
+        with self._lock:
+            fresh = []
+            for event in events:
+                if event["audit_id"] in self._recent:
+                    continue
+                self._recent[event["audit_id"]] = None
+                fresh.append(event)
+            while len(self._recent) > 10000:
+                self._recent.popitem(last=False)
+            self._stats["published"] += len(fresh)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            for event in fresh:
+                if subscriber.status and event["status"] != subscriber.status:
+                    continue
+                try:
+                    subscriber.loop.call_soon_threadsafe(subscriber._offer, event)
+                except RuntimeError:
+                    # Loop closed; the stream's finally will unsubscribe it
+                    break
+
+    def _tail(self) -> None:
+        watermark = self._latest_id()
+        while True:
+            time.sleep(self.tail_interval)
+            with self._lock:
+                if not self._subscribers:
+                    self._tailer = None
+                    return
+            try:
+                rows = self._fetch_after(watermark, 1000)
+            except Exception as e:
+                self.logger.warning("Review event tail failed: %s", e)
+                continue
+            if rows:
+                watermark = rows[-1]["audit_id"]
+                self.publish(rows)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "published": self._stats["published"],
+                "overflows": self._stats["overflows"] + sum(subscriber.overflows for subscriber in self._subscribers),
+                "subscribers": len(self._subscribers),
+                "lagged_now": sum(1 for subscriber in self._subscribers if subscriber.lagged),
+                "buffer_size": self.buffer_size,
+            }
@@ -0,0 +1,109 @@
+"""
+Review Re-scoring Job
+After a triage model update, streams PENDING_REVIEW records in keyset pages,
+re-scores their stored masked_text with batched TriageEngine inference, and
+auto-approves the ones the new model is now confident about (audited in
+review_audit). Runs in a background thread, on model reload or on demand.
+"""
+import os
+import time
+from datetime import datetime, timezone
+from threading import Lock, Thread
+from typing import Dict, Optional
+
+from app.core.constants import REVIEW_CONFIDENCE_THRESHOLD
+from app.core.logging import get_logger
+from app.services.review_service import ReviewStore, review_store
+from app.services.triage_service import TriageEngine, triage_engine
+
+
+class ReviewRescoreJob:
+    def __init__(self, store: ReviewStore, engine: TriageEngine) -> None:
+        self.logger = get_logger("complaintops.review_rescore")
+        self.store = store
+        self.engine = engine
+        self.page_size = int(os.getenv("REVIEW_RESCORE_PAGE_SIZE", "500"))
+        self.threshold = float(os.getenv("REVIEW_RESCORE_THRESHOLD", str(REVIEW_CONFIDENCE_THRESHOLD)))
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._status: Dict = {"running": False}
+
+    def start(self, trigger: str = "manual") -> bool:
+        """
+        Start a background run.
+
+        Returns:
+            False if a run is already in progress
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._status = {"running": True, "trigger": trigger}
+            self._thread = Thread(target=self.run, args=(trigger,), name="review-rescore", daemon=True)
+            self._thread.start()
+        return True
+
+    def run(self, trigger: str = "manual") -> Dict:
+        """Re-score every pending review once (blocking)."""
+        start = time.perf_counter()
+        status = {
+            "running": True,
+            "trigger": trigger,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "scanned": 0,
+            "approved": 0,
+            "pages": 0,
+        }
+        self._status = status
+        if not self.engine.model_loaded:
+            status.update(running=False, error="Triage model not loaded")
+            return status
+        notes = f"Auto-approved by re-scoring ({trigger}), confidence >= {self.threshold:.2f}"
+        after = None
+        try:
+            while True:
+                page = self.store.list_reviews(status="PENDING_REVIEW", limit=self.page_size, after=after)
+                if not page:
+                    break
+                # Keyset on the page's last row: approved rows leave the
+                # pending set, so offsets would skip records
+                after = (page[-1].created_at, page[-1].review_id)
+                predictions = self.engine.predict_batch([record.masked_text for record in page])
+                confident = [
+                    {"review_id": record.review_id, **prediction}
+                    for record, prediction in zip(page, predictions)
+                    if prediction["category_confidence"] >= self.threshold
+                    and prediction["urgency_confidence"] >= self.threshold
+                ]
+                if confident:
+                    status["approved"] += len(self.store.auto_approve_reviews(confident, notes))
+                status["scanned"] += len(page)
+                status["pages"] += 1
+                elapsed = time.perf_counter() - start
+                status["elapsed_s"] = round(elapsed, 2)
+                status["records_per_s"] = round(status["scanned"] / elapsed, 1) if elapsed else None
+        except Exception as e:
+            self.logger.error("Review re-scoring failed after %s records: %s", status["scanned"], e)
+            status["error"] = str(e)
+        elapsed = time.perf_counter() - start
+        status.update(
+            running=False,
+            finished_at=datetime.now(timezone.utc).isoformat(),
+            elapsed_s=round(elapsed, 2),
+            records_per_s=round(status["scanned"] / elapsed, 1) if elapsed else None,
+        )
+        self.logger.info(
+            "Review re-scoring (%s): scanned=%s approved=%s in %.2fs",
+            trigger,
+            status["scanned"],
+            status["approved"],
+            elapsed,
+        )
+        return status
+
+    def status(self) -> Dict:
+        return dict(self._status)
+
+
+# Global instance
+review_rescore_job = ReviewRescoreJob(review_store, triage_engine)
@@ -1,9 +1,27 @@
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from threading import Lock
-from typing import Optional
+from threading import Condition, Event, Lock, Thread, local
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+import glob
+import json
 import os
 import sqlite3
+import time
+
+from app.core.logging import get_logger
+from app.services.review_events import ReviewEventBus
+from app.services.review_stats import ReviewStats
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
 
 
 @dataclass
@@ -21,18 +39,119 @@ class ReviewRecord:
 
 
 class ReviewStore:
-    def __init__(self) -> None:
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        # Serializes writers inside this process; other gunicorn workers wait
+        # on SQLite's busy timeout instead. Reads never take it.
         self._lock = Lock()
-        self._db_path = os.getenv("REVIEW_DB_PATH", "reviews.db")
+        self._db_path = db_path or os.getenv("REVIEW_DB_PATH", "reviews.db")
+        self._busy_timeout_ms = int(os.getenv("REVIEW_DB_BUSY_TIMEOUT_MS", "5000"))
+        self._cache_kb = int(os.getenv("REVIEW_DB_CACHE_KB", "16384"))
+        self._local = local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = Lock()
+        self.logger = get_logger("complaintops.review_store")
+
+        # Optional group commit for create_review: records are journaled,
+        # buffered and inserted in batched transactions by a flusher thread
+        self.group_commit = os.getenv("REVIEW_GROUP_COMMIT", "false").lower() == "true"
+        self._flush_interval = float(os.getenv("REVIEW_GROUP_COMMIT_INTERVAL_MS", "5")) / 1000
+        self._flush_max_batch = int(os.getenv("REVIEW_GROUP_COMMIT_MAX_BATCH", "256"))
+        self._max_pending = int(os.getenv("REVIEW_GROUP_COMMIT_MAX_PENDING", "10000"))
+        self._pending: List[Tuple[ReviewRecord, float]] = []
+        self._pending_ids: Set[str] = set()
+        self._pending_cond = Condition()
+        self._flush_lock = Lock()
+        self._flusher: Optional[Thread] = None
+        self._stopping = False
+        self._journal = None
+        self._buffer_stats = {
+            "buffered": 0,
+            "sync_fallbacks": 0,
+            "flushes": 0,
+            "flushed": 0,
+            "flush_errors": 0,
+            "replayed": 0,
+            "last_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "last_batch_size": 0,
+            "max_depth": 0,
+        }
+        self.stats = ReviewStats(self._oldest_pending)
+        self._stats_reconcile_s = float(os.getenv("REVIEW_STATS_RECONCILE_S", "300"))
+        self._stats_reconciler: Optional[Thread] = None
+        self._stats_stop = Event()
+        # Committed audit rows are published here for GET /review/events
+        self.events = ReviewEventBus(self.audit_events_after, self.max_audit_id)
         self._init_db()
+        self._replay_journals()
+        self.stats.rebuild(self._get_connection())
 
     def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
+        """This thread's persistent connection (reopened after a fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(
+            self._db_path,
+            timeout=self._busy_timeout_ms / 1000,
+            # Transactions are opened explicitly (BEGIN IMMEDIATE for writes)
+            isolation_level=None,
+            # Only this thread uses it; close() may run from another thread
+            check_same_thread=False,
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {self._busy_timeout_ms}")
+        # WAL: readers do not block the writer and fsync happens at checkpoints
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{self._cache_kb}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        with self._connections_lock:
+            self._connections.append(conn)
         return conn
 
+    @contextmanager
+    def _write_transaction(self, events: Optional[List[Dict]] = None) -> Iterator[sqlite3.Connection]:
+        """
+        Take the write lock up front (BEGIN IMMEDIATE) so a read-then-write
+        transaction never fails on lock upgrade; waits up to the busy timeout.
+
+        Args:
+            events: Filled by the caller with audit events, published after
+                COMMIT while the lock is still held (so in audit_id order)
+        """
+        conn = self._get_connection()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            if events:
+                self.events.publish(events)
+
+    def close(self) -> None:
+        """Flush buffered reviews and close every connection this store opened (call on shutdown)."""
+        self._stop_flusher()
+        self._stop_stats_reconciler()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = local()
+
     def _init_db(self) -> None:
-        with self._get_connection() as conn:
+        conn = self._get_connection()
+        # Persistent per database file, so every later connection is in WAL mode
+        conn.execute("PRAGMA journal_mode = WAL")
+        with self._write_transaction() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS review_records (
@@ -61,6 +180,30 @@ class ReviewStore:
                 """
             )
 
+            # Review queue listing: equality filters first, then the keyset
+            # (created_at, review_id) so every page is an index range scan
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_records_status_created "
+                "ON review_records (status, created_at, review_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_records_status_category_created "
+                "ON review_records (status, category, created_at, review_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_records_status_urgency_created "
+                "ON review_records (status, urgency, created_at, review_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_records_created "
+                "ON review_records (created_at, review_id)"
+            )
+            # Recent decisions for the stats rebuild
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_audit_created "
+                "ON review_audit (created_at)"
+            )
+
     def create_review(
         self,
         review_id: str,
@@ -82,7 +225,11 @@ class ReviewStore:
             urgency=urgency,
             urgency_confidence=urgency_confidence,
         )
-        with self._lock, self._get_connection() as conn:
+        if self.group_commit and self._buffer(record):
+            self.stats.record_created(record.review_id, category, urgency, now)
+            return record
+        events: List[Dict] = []
+        with self._write_transaction(events) as conn:
             conn.execute(
                 """
                 INSERT INTO review_records (
@@ -90,31 +237,263 @@ class ReviewStore:
                     category_confidence, urgency, urgency_confidence, notes
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    record.review_id,
-                    record.status,
-                    record.created_at,
-                    record.updated_at,
-                    record.masked_text,
-                    record.category,
-                    record.category_confidence,
-                    record.urgency,
-                    record.urgency_confidence,
-                    record.notes,
-                ),
-            )
-            conn.execute(
-                """
-                INSERT INTO review_audit (review_id, status, notes, created_at)
-                VALUES (?, ?, ?, ?)
-                """,
-                (record.review_id, record.status, record.notes, now),
+                self._record_row(record),
             )
+            [audit_id] = self._insert_audit(conn, [(record.review_id, record.status, record.notes, now)])
+            events.append(self._audit_event(audit_id, record.status, record.notes, now, asdict(record)))
+        self.stats.record_created(record.review_id, category, urgency, now)
         return record
 
+    @staticmethod
+    def _record_row(record: ReviewRecord) -> Tuple:
+        return (
+            record.review_id,
+            record.status,
+            record.created_at,
+            record.updated_at,
+            record.masked_text,
+            record.category,
+            record.category_confidence,
+            record.urgency,
+            record.urgency_confidence,
+            record.notes,
+        )
+
+    @staticmethod
+    def _existing_rows(conn: sqlite3.Connection, ids: List[str]) -> Dict[str, sqlite3.Row]:
+        existing: Dict[str, sqlite3.Row] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                "SELECT review_id, status, category, category_confidence, urgency, urgency_confidence "
+                "FROM review_records "
+                f"WHERE review_id IN ({placeholders})",
+                chunk,
+            ):
+                existing[row["review_id"]] = row
+        return existing
+
+    @staticmethod
+    def _insert_audit(conn: sqlite3.Connection, rows: List[Tuple]) -> List[int]:
+        """
+        Insert (review_id, status, notes, created_at) audit rows.
+
+        Returns:
+            Their audit_ids; contiguous because the write lock is held
+        """
+        if not rows:
+            return []
+        conn.executemany(
+            """
+            INSERT INTO review_audit (review_id, status, notes, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows,
+        )
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    @staticmethod
+    def _audit_event(audit_id: int, status: str, notes: Optional[str], at: str, labels: Mapping) -> Dict:
+        """Event payload for one audit row; ``labels`` holds the review's triage fields."""
+        return {
+            "audit_id": audit_id,
+            "review_id": labels["review_id"],
+            "status": status,
+            "notes": notes,
+            "created_at": at,
+            "category": labels["category"],
+            "category_confidence": labels["category_confidence"],
+            "urgency": labels["urgency"],
+            "urgency_confidence": labels["urgency_confidence"],
+        }
+
+    def _insert_new_records(self, conn: sqlite3.Connection, records: Iterable[ReviewRecord]) -> List[Dict]:
+        """
+        Insert records (and their creation audit rows) not already stored; idempotent.
+
+        Returns:
+            Audit events for the inserted records
+        """
+        records = list({record.review_id: record for record in records}.values())
+        existing = self._existing_rows(conn, [record.review_id for record in records])
+        new = [record for record in records if record.review_id not in existing]
+        conn.executemany(
+            """
+            INSERT INTO review_records (
+                review_id, status, created_at, updated_at, masked_text, category,
+                category_confidence, urgency, urgency_confidence, notes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [self._record_row(record) for record in new],
+        )
+        audit_ids = self._insert_audit(
+            conn, [(record.review_id, record.status, record.notes, record.created_at) for record in new]
+        )
+        return [
+            self._audit_event(audit_id, record.status, record.notes, record.created_at, asdict(record))
+            for audit_id, record in zip(audit_ids, new)
+        ]
+
+    # ---- group commit ----
+
+    @property
+    def _journal_path(self) -> str:
+        return f"{self._db_path}.journal.{os.getpid()}"
+
+    def _buffer(self, record: ReviewRecord) -> bool:
+        """
+        Journal and queue a record for the next group commit.
+
+        Returns:
+            False when the buffer is full (the caller inserts synchronously)
+        """
+        with self._pending_cond:
+            if len(self._pending) >= self._max_pending or self._stopping:
+                self._buffer_stats["sync_fallbacks"] += 1
+                return False
+            if self._journal is None:
+                self._journal = open(self._journal_path, "a", encoding="utf-8")
+            # Survives a worker crash; replayed by the next ReviewStore on this database
+            self._journal.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+            self._journal.flush()
+            self._pending.append((record, time.monotonic()))
+            self._pending_ids.add(record.review_id)
+            self._buffer_stats["buffered"] += 1
+            self._buffer_stats["max_depth"] = max(self._buffer_stats["max_depth"], len(self._pending))
+            if len(self._pending) >= self._flush_max_batch:
+                self._pending_cond.notify()
+        self._ensure_flusher()
+        return True
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._pending_cond:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = Thread(target=self._flush_loop, name="review-group-commit", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._pending_cond:
+                if not self._pending:
+                    if self._stopping:
+                        return
+                    self._pending_cond.wait(self._flush_interval)
+                elif len(self._pending) < self._flush_max_batch and not self._stopping:
+                    # Let a group form for up to one interval after the first record
+                    self._pending_cond.wait(max(0.0, self._pending[0][1] + self._flush_interval - time.monotonic()))
+            if not self.flush() and self._pending:
+                # Flush failed; records stay buffered and journaled, retry shortly
+                time.sleep(min(1.0, self._flush_interval * 10))
+
+    def flush(self) -> bool:
+        """Commit buffered reviews now (one transaction per batch)."""
+        # One flusher at a time: each removes exactly the prefix it committed
+        with self._flush_lock:
+            return self._flush_batch()
+
+    def _flush_batch(self) -> bool:
+        with self._pending_cond:
+            batch = self._pending[:self._flush_max_batch]
+        if not batch:
+            return True
+        start = time.perf_counter()
+        try:
+            events: List[Dict] = []
+            with self._write_transaction(events) as conn:
+                events.extend(self._insert_new_records(conn, [record for record, _ in batch]))
+        except sqlite3.Error as e:
+            self.logger.error("Review group commit of %s records failed: %s", len(batch), e)
+            with self._pending_cond:
+                self._buffer_stats["flush_errors"] += 1
+            return False
+        flush_ms = (time.perf_counter() - start) * 1000
+        with self._pending_cond:
+            del self._pending[:len(batch)]
+            self._pending_ids.difference_update(record.review_id for record, _ in batch)
+            if self._journal is not None:
+                # Keep only what is still uncommitted (usually nothing)
+                self._journal.seek(0)
+                self._journal.truncate()
+                for record, _ in self._pending:
+                    self._journal.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+                self._journal.flush()
+            stats = self._buffer_stats
+            stats["flushes"] += 1
+            stats["flushed"] += len(batch)
+            stats["last_batch_size"] = len(batch)
+            stats["last_flush_ms"] = round(flush_ms, 2)
+            stats["total_flush_ms"] += flush_ms
+            stats["max_flush_ms"] = round(max(stats["max_flush_ms"], flush_ms), 2)
+        return True
+
+    def _flush_pending_ids(self, ids: List[str]) -> None:
+        """Commit any of ``ids`` still in the buffer before they are updated."""
+        while not self._pending_ids.isdisjoint(ids):
+            if not self.flush():
+                raise sqlite3.OperationalError("Buffered reviews could not be committed")
+
+    def _stop_flusher(self) -> None:
+        with self._pending_cond:
+            self._stopping = True
+            self._pending_cond.notify_all()
+        if self._flusher is not None:
+            self._flusher.join(timeout=10)
+        self.flush()
+        with self._pending_cond:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+                if not self._pending:
+                    os.remove(self._journal_path)
+            self._stopping = False
+
+    def _replay_journals(self) -> None:
+        """Insert reviews left in group-commit journals by crashed workers."""
+        for path in glob.glob(f"{glob.escape(self._db_path)}.journal.*"):
+            try:
+                pid = int(path.rsplit(".", 1)[1])
+            except ValueError:
+                continue
+            records = []
+            with open(path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        records.append(ReviewRecord(**json.loads(line)))
+                    except (ValueError, TypeError):
+                        # Torn final line from a crash mid-write
+                        continue
+            if records:
+                with self._write_transaction() as conn:
+                    replayed = len(self._insert_new_records(conn, records))
+                self._buffer_stats["replayed"] += replayed
+                if replayed:
+                    self.logger.warning("Replayed %s buffered reviews from %s", replayed, path)
+            if pid != os.getpid() and not _pid_alive(pid):
+                os.remove(path)
+
+    def buffer_stats(self) -> Dict:
+        """Group-commit depth, oldest buffered age and flush latency."""
+        with self._pending_cond:
+            stats = dict(self._buffer_stats)
+            depth = len(self._pending)
+            oldest = self._pending[0][1] if self._pending else None
+        total_flush_ms = stats.pop("total_flush_ms")
+        stats["avg_flush_ms"] = round(total_flush_ms / stats["flushes"], 2) if stats["flushes"] else 0.0
+        stats["enabled"] = self.group_commit
+        stats["depth"] = depth
+        stats["oldest_age_ms"] = round((time.monotonic() - oldest) * 1000, 1) if oldest is not None else 0.0
+        return stats
+
     def update_review(self, review_id: str, status: str, notes: Optional[str] = None) -> Optional[ReviewRecord]:
+        self._flush_pending_ids([review_id])
         now = datetime.now(timezone.utc).isoformat()
-        with self._lock, self._get_connection() as conn:
+        events: List[Dict] = []
+        with self._write_transaction(events) as conn:
             cursor = conn.execute(
                 """
                 SELECT * FROM review_records WHERE review_id = ?
@@ -132,25 +511,277 @@ class ReviewStore:
                 """,
                 (status, now, notes, review_id),
             )
-            conn.execute(
+            [audit_id] = self._insert_audit(conn, [(review_id, status, notes, now)])
+            events.append(self._audit_event(audit_id, status, notes, now, row))
+            record = self._row_to_record(row)
+        self.stats.record_transition(review_id, record.status, status, record.category, record.urgency, now)
+        record.status = status
+        record.updated_at = now
+        record.notes = notes
+        return record
+
+    def bulk_update_reviews(
+        self,
+        review_ids: List[str],
+        status: str,
+        notes: Optional[str] = None,
+    ) -> List[Tuple[str, bool]]:
+        """
+        Set ``status`` on many reviews in one transaction (one UPDATE batch,
+        one audit batch).
+
+        Returns:
+            (review_id, updated) per distinct id in input order; False when
+            the review does not exist
+        """
+        ids = list(dict.fromkeys(review_ids))
+        self._flush_pending_ids(ids)
+        now = datetime.now(timezone.utc).isoformat()
+        events: List[Dict] = []
+        with self._write_transaction(events) as conn:
+            existing = self._existing_rows(conn, ids)
+            found = [review_id for review_id in ids if review_id in existing]
+            conn.executemany(
                 """
-                INSERT INTO review_audit (review_id, status, notes, created_at)
-                VALUES (?, ?, ?, ?)
+                UPDATE review_records
+                SET status = ?, updated_at = ?, notes = ?
+                WHERE review_id = ?
                 """,
-                (review_id, status, notes, now),
+                [(status, now, notes, review_id) for review_id in found],
+            )
+            audit_ids = self._insert_audit(conn, [(review_id, status, notes, now) for review_id in found])
+            events.extend(
+                self._audit_event(audit_id, status, notes, now, existing[review_id])
+                for audit_id, review_id in zip(audit_ids, found)
+            )
+        for review_id in found:
+            row = existing[review_id]
+            self.stats.record_transition(review_id, row["status"], status, row["category"], row["urgency"], now)
+        return [(review_id, review_id in existing) for review_id in ids]
+
+    def _oldest_pending(self) -> Optional[Tuple[str, str]]:
+        row = self._get_connection().execute(
+            "SELECT created_at, review_id FROM review_records WHERE status = 'PENDING_REVIEW' "
+            "ORDER BY created_at, review_id LIMIT 1"
+        ).fetchone()
+        return (row["created_at"], row["review_id"]) if row else None
+
+    def review_stats(self) -> Dict:
+        """Counters for GET /review/stats (rebuilt every REVIEW_STATS_RECONCILE_S in the background)."""
+        self._ensure_stats_reconciler()
+        return self.stats.snapshot()
+
+    def _ensure_stats_reconciler(self) -> None:
+        if self._stats_reconcile_s <= 0 or (self._stats_reconciler is not None and self._stats_reconciler.is_alive()):
+            return
+        with self._connections_lock:
+            if self._stats_reconciler is None or not self._stats_reconciler.is_alive():
+                self._stats_reconciler = Thread(
+                    target=self._stats_reconcile_loop, name="review-stats-reconcile", daemon=True
+                )
+                self._stats_reconciler.start()
+
+    def _stats_reconcile_loop(self) -> None:
+        # Picks up other workers' writes; a poll never waits on the table scan
+        while not self._stats_stop.wait(self._stats_reconcile_s):
+            try:
+                self.stats.rebuild(self._get_connection())
+            except sqlite3.Error as e:
+                self.logger.warning("Review stats rebuild failed: %s", e)
+
+    def _stop_stats_reconciler(self) -> None:
+        self._stats_stop.set()
+        if self._stats_reconciler is not None:
+            self._stats_reconciler.join(timeout=10)
+            self._stats_reconciler = None
+        self._stats_stop.clear()
+
+    def auto_approve_reviews(self, rescored: List[Dict], notes: str) -> List[str]:
+        """
+        Mark re-scored reviews AUTO_APPROVED with their new triage labels, in
+        one transaction. Reviews a human decided meanwhile are left alone.
+
+        Args:
+            rescored: Dicts with review_id, category, category_confidence,
+                urgency and urgency_confidence
+
+        Returns:
+            Ids that were approved
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        approved = []
+        events: List[Dict] = []
+        with self._write_transaction(events) as conn:
+            previous = self._existing_rows(conn, [item["review_id"] for item in rescored])
+            for item in rescored:
+                cursor = conn.execute(
+                    """
+                    UPDATE review_records
+                    SET status = 'AUTO_APPROVED', updated_at = ?, notes = ?, category = ?,
+                        category_confidence = ?, urgency = ?, urgency_confidence = ?
+                    WHERE review_id = ? AND status = 'PENDING_REVIEW'
+                    """,
+                    (
+                        now,
+                        notes,
+                        item["category"],
+                        item["category_confidence"],
+                        item["urgency"],
+                        item["urgency_confidence"],
+                        item["review_id"],
+                    ),
+                )
+                if cursor.rowcount:
+                    approved.append(item)
+            audit_ids = self._insert_audit(
+                conn, [(item["review_id"], "AUTO_APPROVED", notes, now) for item in approved]
             )
-            return ReviewRecord(
-                review_id=row["review_id"],
-                status=status,
-                created_at=row["created_at"],
-                updated_at=now,
-                masked_text=row["masked_text"],
-                category=row["category"],
-                category_confidence=row["category_confidence"],
-                urgency=row["urgency"],
-                urgency_confidence=row["urgency_confidence"],
-                notes=notes,
+            events.extend(
+                self._audit_event(audit_id, "AUTO_APPROVED", notes, now, item)
+                for audit_id, item in zip(audit_ids, approved)
             )
+        for item in approved:
+            row = previous[item["review_id"]]
+            self.stats.record_transition(
+                item["review_id"],
+                "PENDING_REVIEW",
+                "AUTO_APPROVED",
+                row["category"],
+                row["urgency"],
+                now,
+                new_category=item["category"],
+                new_urgency=item["urgency"],
+            )
+        return [item["review_id"] for item in approved]
+
+    def max_audit_id(self) -> int:
+        row = self._get_connection().execute("SELECT MAX(audit_id) FROM review_audit").fetchone()
+        return row[0] or 0
+
+    def audit_events_after(self, after_id: int, limit: int = 1000, status: Optional[str] = None) -> List[Dict]:
+        """
+        Audit rows with audit_id > ``after_id`` as event payloads, oldest
+        first (primary-key range scan). Triage labels are the review's
+        current ones.
+        """
+        clauses, params = ["a.audit_id > ?"], [after_id]
+        if status:
+            clauses.append("a.status = ?")
+            params.append(status)
+        rows = self._get_connection().execute(
+            f"""
+            SELECT a.audit_id, a.review_id, a.status, a.notes, a.created_at, r.category,
+                r.category_confidence, r.urgency, r.urgency_confidence
+            FROM review_audit a LEFT JOIN review_records r ON r.review_id = a.review_id
+            WHERE {' AND '.join(clauses)} ORDER BY a.audit_id LIMIT ?
+            """,
+            (*params, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_review(self, review_id: str) -> Optional[ReviewRecord]:
+        if review_id in self._pending_ids:
+            with self._pending_cond:
+                for record, _ in self._pending:
+                    if record.review_id == review_id:
+                        return record
+        row = self._get_connection().execute(
+            "SELECT * FROM review_records WHERE review_id = ?",
+            (review_id,),
+        ).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def list_reviews(
+        self,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        urgency: Optional[str] = None,
+        limit: int = 50,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[ReviewRecord]:
+        """
+        Oldest-first page of review records.
+
+        Args:
+            after: (created_at, review_id) of the last record of the previous
+                page; pages continue strictly after it (keyset pagination)
+        """
+        clauses = []
+        params: List = []
+        for column, value in (("status", status), ("category", category), ("urgency", urgency)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if after is not None:
+            clauses.append("(created_at, review_id) > (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._get_connection().execute(
+            f"SELECT * FROM review_records {where} ORDER BY created_at, review_id LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [self._row_to_record(row) for row in rows]
+
+    def iter_export(
+        self,
+        table: str,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream ``review_records`` or ``review_audit`` rows in [after, before)
+        as chunks of dicts, oldest first.
+
+        Each chunk is its own short keyset query on the created_at index, so
+        memory stays at one chunk and no long read transaction holds back
+        writers or WAL checkpoints.
+        """
+        if table == "records":
+            sql_table, key_columns = "review_records", ("created_at", "review_id")
+        elif table == "audit":
+            # Audit's created_at index is implicitly ordered by rowid (audit_id)
+            sql_table, key_columns = "review_audit", ("created_at", "audit_id")
+        else:
+            raise ValueError(f"Unknown export table: {table}")
+        bounds, bound_params = [], []
+        if created_after:
+            bounds.append("created_at >= ?")
+            bound_params.append(created_after)
+        if created_before:
+            bounds.append("created_at < ?")
+            bound_params.append(created_before)
+        order = ", ".join(key_columns)
+        last_key = None
+        while True:
+            clauses, params = list(bounds), list(bound_params)
+            if last_key is not None:
+                clauses.append(f"({order}) > (?, ?)")
+                params.extend(last_key)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            rows = self._get_connection().execute(
+                f"SELECT * FROM {sql_table} {where} ORDER BY {order} LIMIT ?",
+                (*params, chunk_size),
+            ).fetchall()
+            if not rows:
+                return
+            yield [dict(row) for row in rows]
+            last_key = tuple(rows[-1][column] for column in key_columns)
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> ReviewRecord:
+        return ReviewRecord(
+            review_id=row["review_id"],
+            status=row["status"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            masked_text=row["masked_text"],
+            category=row["category"],
+            category_confidence=row["category_confidence"],
+            urgency=row["urgency"],
+            urgency_confidence=row["urgency_confidence"],
+            notes=row["notes"],
+        )
 
 
 review_store = ReviewStore()
@@ -0,0 +1,146 @@
+"""
+Review Statistics
+Counters for GET /review/stats maintained incrementally by ReviewStore on
+create/update, rebuilt from review_records / review_audit at startup (and
+every REVIEW_STATS_RECONCILE_S on a background thread, to pick up other
+workers' writes), so a dashboard poll never scans the tables.
+"""
+import sqlite3
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple
+
+from app.services.ring_counter import RingCounter
+
+PENDING_STATUS = "PENDING_REVIEW"
+DECISION_STATUSES = ("APPROVED", "REJECTED", "AUTO_APPROVED")
+RATE_WINDOWS_MINUTES = {"1h": 60, "24h": 24 * 60, "7d": 7 * 24 * 60}
+
+
+def _epoch_minute(iso: str) -> int:
+    return int(datetime.fromisoformat(iso).timestamp() // 60)
+
+
+class ReviewStats:
+    def __init__(self, oldest_pending_lookup: Callable[[], Optional[Tuple[str, str]]]) -> None:
+        # Index seek for the oldest pending review; only used when the cached
+        # one leaves PENDING_REVIEW
+        self._oldest_pending_lookup = oldest_pending_lookup
+        self._lock = Lock()
+        self._by_status: Counter = Counter()
+        self._by_category: Dict[str, Counter] = {}
+        self._by_urgency: Dict[str, Counter] = {}
+        self._decisions = {status: RingCounter(max(RATE_WINDOWS_MINUTES.values())) for status in DECISION_STATUSES}
+        self._oldest_pending: Optional[Tuple[str, str]] = None
+        self._oldest_stale = True
+        self.rebuilt_at = 0.0
+
+    def rebuild(self, conn: sqlite3.Connection) -> None:
+        """Recompute every counter from the tables (one grouped scan + an indexed audit range)."""
+        since = (datetime.now(timezone.utc) - timedelta(minutes=max(RATE_WINDOWS_MINUTES.values()))).isoformat()
+        groups = conn.execute(
+            "SELECT status, category, urgency, COUNT(*) FROM review_records GROUP BY status, category, urgency"
+        ).fetchall()
+        decisions = conn.execute(
+            f"SELECT status, created_at FROM review_audit WHERE created_at >= ? "
+            f"AND status IN ({','.join('?' * len(DECISION_STATUSES))})",
+            (since, *DECISION_STATUSES),
+        ).fetchall()
+        with self._lock:
+            self._by_status = Counter()
+            self._by_category = {}
+            self._by_urgency = {}
+            for status, category, urgency, count in groups:
+                self._count(status, category, urgency, count)
+            self._decisions = {
+                status: RingCounter(max(RATE_WINDOWS_MINUTES.values())) for status in DECISION_STATUSES
+            }
+            for status, created_at in decisions:
+                self._decisions[status].add(_epoch_minute(created_at))
+            self._oldest_stale = True
+            self.rebuilt_at = time.monotonic()
+
+    def _count(self, status: str, category: str, urgency: str, amount: int) -> None:
+        self._by_status[status] += amount
+        self._by_category.setdefault(category, Counter())[status] += amount
+        self._by_urgency.setdefault(urgency, Counter())[status] += amount
+
+    def record_created(self, review_id: str, category: str, urgency: str, created_at: str) -> None:
+        with self._lock:
+            self._count(PENDING_STATUS, category, urgency, 1)
+            if not self._oldest_stale and self._oldest_pending is None:
+                self._oldest_pending = (created_at, review_id)
+
+    def record_transition(
+        self,
+        review_id: str,
+        old_status: str,
+        new_status: str,
+        category: str,
+        urgency: str,
+        at: str,
+        new_category: Optional[str] = None,
+        new_urgency: Optional[str] = None,
+    ) -> None:
+        """Move one review between counters (and relabel it, after re-scoring)."""
+        new_category = new_category or category
+        new_urgency = new_urgency or urgency
+        with self._lock:
+            if (old_status, category, urgency) != (new_status, new_category, new_urgency):
+                self._count(old_status, category, urgency, -1)
+                self._count(new_status, new_category, new_urgency, 1)
+            if new_status in self._decisions:
+                self._decisions[new_status].add(_epoch_minute(at))
+            if old_status == PENDING_STATUS and self._oldest_pending and self._oldest_pending[1] == review_id:
+                self._oldest_stale = True
+
+    def snapshot(self, now: Optional[datetime] = None) -> Dict:
+        now = now or datetime.now(timezone.utc)
+        if self._oldest_stale:
+            oldest = self._oldest_pending_lookup()
+            with self._lock:
+                self._oldest_pending = oldest
+                self._oldest_stale = False
+        minute = int(now.timestamp() // 60)
+        with self._lock:
+            rates = {}
+            for window, minutes in RATE_WINDOWS_MINUTES.items():
+                counts = {
+                    status.lower(): int(ring.series(minute, minutes).sum())
+                    for status, ring in self._decisions.items()
+                }
+                decided = sum(counts.values())
+                approved = counts["approved"] + counts["auto_approved"]
+                rates[window] = {
+                    **counts,
+                    "approve_rate": round(approved / decided, 4) if decided else None,
+                    "reject_rate": round(counts["rejected"] / decided, 4) if decided else None,
+                }
+            oldest = self._oldest_pending
+            stats = {
+                "by_status": {status: n for status, n in self._by_status.items() if n},
+                "by_category": {
+                    key: {status: n for status, n in counter.items() if n}
+                    for key, counter in self._by_category.items()
+                    if any(counter.values())
+                },
+                "by_urgency": {
+                    key: {status: n for status, n in counter.items() if n}
+                    for key, counter in self._by_urgency.items()
+                    if any(counter.values())
+                },
+            }
+        stats["pending"] = stats["by_status"].get(PENDING_STATUS, 0)
+        stats["oldest_pending"] = None
+        if oldest is not None:
+            age = now - datetime.fromisoformat(oldest[0])
+            stats["oldest_pending"] = {
+                "review_id": oldest[1],
+                "created_at": oldest[0],
+                "age_seconds": round(age.total_seconds(), 1),
+            }
+        stats["decision_rates"] = rates
+        stats["rebuilt_seconds_ago"] = round(time.monotonic() - self.rebuilt_at, 1)
+        return stats
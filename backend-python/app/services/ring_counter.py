@@ -0,0 +1,28 @@
+"""
+Ring Counter
+Fixed-size per-slot event counts for sliding time windows (e.g. one slot per
+second or per minute), shared by the spike detector and the review stats.
+"""
+import numpy as np
+
+
+class RingCounter:
+    """Counts per time slot; a slot is reset lazily when its epoch rolls over."""
+
+    def __init__(self, slots: int) -> None:
+        self.slots = slots
+        self.counts = np.zeros(slots, dtype=np.int64)
+        self.stamps = np.full(slots, -1, dtype=np.int64)
+
+    def add(self, epoch: int, amount: int = 1) -> None:
+        slot = epoch % self.slots
+        if self.stamps[slot] != epoch:
+            self.stamps[slot] = epoch
+            self.counts[slot] = 0
+        self.counts[slot] += amount
+
+    def series(self, last_epoch: int, length: int) -> np.ndarray:
+        """Counts for epochs (last_epoch - length, last_epoch], oldest first."""
+        epochs = np.arange(last_epoch - length + 1, last_epoch + 1)
+        slots = epochs % self.slots
+        return np.where(self.stamps[slots] == epochs, self.counts[slots], 0)
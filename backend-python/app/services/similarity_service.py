@@ -4,11 +4,112 @@ Uses ChromaDB embeddings to find semantically similar past complaints.
 Based on ADR-002: ChromaDB for Similarity Search
 """
 import os
-import chromadb
-from chromadb.utils import embedding_functions
-from typing import List, Dict, Optional
+import time
+from datetime import datetime, timezone
+from threading import Lock, Thread
+from typing import Any, List, Dict, Optional, Tuple
 
 from app.core.logging import get_logger
+from app.services.near_duplicate import MinHashLSHIndex
+from app.services.vector_store import vector_store
+
+COLLECTION_NAME = "complaint_embeddings"
+
+
+def _created_at_ts(created_at: Optional[str]) -> Optional[int]:
+    """Epoch seconds for an ISO-8601 created_at (Chroma range filters need numbers)."""
+    if not created_at:
+        return None
+    try:
+        parsed = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def build_similarity_filter(
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Turn /similar filter parameters into a Chroma ``where`` clause.
+    
+    Raises:
+        ValueError: If a created_at bound is not ISO-8601
+    """
+    clauses: List[Dict[str, Any]] = []
+    if category:
+        clauses.append({"category": category})
+    if status:
+        clauses.append({"status": status})
+    for bound, operator in ((created_after, "$gte"), (created_before, "$lt")):
+        if bound:
+            timestamp = _created_at_ts(bound)
+            if timestamp is None:
+                raise ValueError(f"Invalid ISO-8601 timestamp: {bound}")
+            clauses.append({"created_at_ts": {operator: timestamp}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _month_index(moment: datetime) -> int:
+    return moment.year * 12 + moment.month - 1
+
+
+def partition_name(moment: datetime) -> str:
+    """Monthly partition collection holding complaints created in ``moment``'s month."""
+    return f"{COLLECTION_NAME}__{moment:%Y%m}"
+
+
+def _partition_span(name: str) -> Optional[Tuple[int, int]]:
+    """
+    First and last month index covered by a partition collection: one month
+    for ``complaint_embeddings__YYYYMM``, a year for a compacted
+    ``complaint_embeddings__YYYY``. None for any other collection.
+    """
+    prefix = f"{COLLECTION_NAME}__"
+    suffix = name[len(prefix):] if name.startswith(prefix) else ""
+    if not suffix.isdigit():
+        return None
+    if len(suffix) == 6:
+        month = int(suffix[:4]) * 12 + int(suffix[4:]) - 1
+        return month, month
+    if len(suffix) == 4:
+        return int(suffix) * 12, int(suffix) * 12 + 11
+    return None
+
+
+def plan_partition_retention(
+    names: List[str],
+    now: datetime,
+    retention_months: int,
+    compact_after_months: int,
+) -> Dict[str, Any]:
+    """
+    Decide which partitions to drop and which monthly partitions to compact
+    into their yearly partition. A value of 0 disables that step.
+
+    Returns:
+        {"drop": [name, ...], "compact": {monthly_name: yearly_name}}
+    """
+    current = _month_index(now)
+    drop: List[str] = []
+    compact: Dict[str, str] = {}
+    for name in sorted(names):
+        span = _partition_span(name)
+        if span is None:
+            continue
+        first, last = span
+        if retention_months and current - last >= retention_months:
+            drop.append(name)
+        elif compact_after_months and first == last and current - last >= compact_after_months:
+            compact[name] = f"{COLLECTION_NAME}__{first // 12:04d}"
+    return {"drop": drop, "compact": compact}
 
 
 class ComplaintSimilarityService:
@@ -17,21 +118,118 @@ class ComplaintSimilarityService:
     def __init__(self):
         self.logger = get_logger("complaintops.similarity")
         
-        # Initialize ChromaDB Client (same path as RAG)
-        db_path = os.path.join(os.getcwd(), "chroma_db")
-        self.client = chromadb.PersistentClient(path=db_path)
+        # Separate collection for complaints (not SOPs), on the shared client and
+        # embedding function so the model is loaded once per worker. The name
+        # may be aliased to a rebuilt collection (see app.ml.reindex_complaints)
+        self.collection_name = vector_store.resolve_alias(COLLECTION_NAME)
+        self.collection = vector_store.get_collection(self.collection_name)
+        # Reads and writes re-check the alias this often, so a switch is
+        # followed within seconds rather than at the next count reconcile
+        self.alias_refresh_interval = float(os.getenv("SIMILARITY_ALIAS_REFRESH_S", "5"))
+        self._alias_checked_at = time.monotonic()
+        self.index_batch_size = int(os.getenv("SIMILARITY_INDEX_BATCH_SIZE", "64"))
         
-        # Use same embedding function as RAG for consistency
-        # Note: For Turkish, consider 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
-        self.embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+        # In-memory count, adjusted on index/delete and reconciled with the
+        # store every SIMILARITY_COUNT_RECONCILE_S (covers other workers' writes)
+        self.count_reconcile_interval = float(os.getenv("SIMILARITY_COUNT_RECONCILE_S", "60"))
+        self._count_lock = Lock()
+        self._count: Optional[int] = None
+        self._vector_index_bytes: Optional[int] = None
+        self._count_reconciled_at = 0.0
         
-        # Separate collection for complaints (not SOPs)
-        self.collection = self.client.get_or_create_collection(
-            name="complaint_embeddings",
-            embedding_function=self.embedding_fn
+        # Near-duplicate stage ahead of embedding: "reuse" indexes duplicates
+        # with their canonical's vector, "skip" only links them, "off" disables
+        self.dedup_mode = os.getenv("SIMILARITY_DEDUP_MODE", "reuse").lower()
+        self.near_duplicates = MinHashLSHIndex(
+            threshold=float(os.getenv("SIMILARITY_DEDUP_THRESHOLD", "0.85")),
+            max_tracked=int(os.getenv("SIMILARITY_DEDUP_MAX_TRACKED", "100000")),
         )
+        # Stored complaints re-registered in the background at startup
+        self.dedup_rebuild_limit = int(os.getenv("SIMILARITY_DEDUP_REBUILD_LIMIT", "20000"))
+        
+        # SIMILARITY_PARTITIONING=monthly writes into complaint_embeddings__YYYYMM
+        # by created_at and queries only the last SIMILARITY_QUERY_HORIZON_MONTHS;
+        # the unpartitioned collection stays readable for vectors indexed before
+        self.partitioned = os.getenv("SIMILARITY_PARTITIONING", "off").lower() == "monthly"
+        self.query_horizon_months = max(1, int(os.getenv("SIMILARITY_QUERY_HORIZON_MONTHS", "6")))
+        self._partitions: Optional[List[str]] = None
         
-        self.logger.info("ComplaintSimilarityService initialized with collection: complaint_embeddings")
+        self.logger.info(
+            "ComplaintSimilarityService initialized with collection: %s (partitioning=%s)",
+            self.collection_name,
+            "monthly" if self.partitioned else "off",
+        )
+    
+    def refresh_collection(self) -> bool:
+        """Follow the complaint_embeddings alias if a reindex switched it."""
+        self._alias_checked_at = time.monotonic()
+        name = vector_store.resolve_alias(COLLECTION_NAME)
+        if name == self.collection_name:
+            return False
+        self.collection = vector_store.get_collection(name)
+        self.collection_name = name
+        # A reindex retires the partitions it rebuilt; list them afresh
+        for partition in self._partitions or []:
+            vector_store.forget_collection(partition)
+        self._partitions = None
+        with self._count_lock:
+            self._count = None
+        self.logger.info("Similarity collection switched to %s", name)
+        return True
+    
+    def _follow_alias(self) -> None:
+        if time.monotonic() - self._alias_checked_at > self.alias_refresh_interval:
+            self.refresh_collection()
+    
+    def _partition_names(self, refresh: bool = False) -> List[str]:
+        """Known partition collections, newest first (listed once, then tracked)."""
+        if self._partitions is None or refresh:
+            names = vector_store.list_collections(prefix=f"{COLLECTION_NAME}__")
+            self._partitions = sorted(
+                (name for name in names if _partition_span(name) is not None),
+                key=_partition_span,
+                reverse=True,
+            )
+        return self._partitions
+    
+    def _write_collection(self, metadata: Optional[Dict]):
+        """Collection a complaint is written to: its created_at month's partition."""
+        if not self.partitioned:
+            return self.collection
+        timestamp = (metadata or {}).get("created_at_ts")
+        moment = (
+            datetime.fromtimestamp(timestamp, tz=timezone.utc)
+            if timestamp is not None
+            else datetime.now(timezone.utc)
+        )
+        name = partition_name(moment)
+        partitions = self._partition_names()
+        if name not in partitions:
+            self._partitions = sorted(partitions + [name], key=_partition_span, reverse=True)
+        return vector_store.get_collection(name)
+    
+    def _read_collections(self) -> List:
+        """Every collection that can hold a complaint, newest partition first."""
+        if not self.partitioned:
+            return [self.collection]
+        return [vector_store.get_collection(name) for name in self._partition_names()] + [self.collection]
+    
+    def _query_collections(self, now: Optional[datetime] = None) -> List:
+        """Collections a similarity query fans out to: partitions inside the horizon."""
+        if not self.partitioned:
+            return [self.collection]
+        oldest = _month_index(now or datetime.now(timezone.utc)) - (self.query_horizon_months - 1)
+        names = [name for name in self._partition_names() if _partition_span(name)[1] >= oldest]
+        return [vector_store.get_collection(name) for name in names] + [self.collection]
+    
+    @staticmethod
+    def _prepare_metadata(metadata: Optional[Dict]) -> Optional[Dict]:
+        """Add the numeric created_at_ts used by range filters."""
+        prepared = dict(metadata or {})
+        timestamp = _created_at_ts(prepared.get("created_at"))
+        if timestamp is not None:
+            prepared["created_at_ts"] = timestamp
+        return prepared or None
     
     def index_complaint(
         self, 
@@ -50,24 +248,166 @@ class ComplaintSimilarityService:
         Returns:
             True if indexed successfully
         """
+        result = self.index_complaints(
+            [{"complaint_id": complaint_id, "masked_text": masked_text, "metadata": metadata}]
+        )[0]
+        if result["status"] == "failed":
+            self.logger.error("Failed to index complaint %s: %s", complaint_id, result.get("error"))
+            return False
+        self.logger.info("Indexed complaint: %s", complaint_id)
+        return True
+    
+    def index_complaints(
+        self,
+        complaints: List[Dict],
+        batch_size: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Add many complaints to the embedding index.
+        
+        Texts are embedded in batches of ``batch_size`` with one model call and
+        one upsert per batch.
+        
+        Args:
+            complaints: Dicts with complaint_id, masked_text and optional metadata
+            batch_size: Items per embedding/upsert batch (default SIMILARITY_INDEX_BATCH_SIZE)
+            
+        Returns:
+            Per-item status dicts in input order; when a batch fails, its
+            items are retried one by one so only the bad ones fail
+        """
+        batch_size = max(1, batch_size or self.index_batch_size)
+        self._follow_alias()
+        results: List[Dict] = [{}] * len(complaints)
+        valid = []
+        for position, item in enumerate(complaints):
+            if not item.get("complaint_id") or not (item.get("masked_text") or "").strip():
+                results[position] = {
+                    "complaint_id": item.get("complaint_id"),
+                    "status": "failed",
+                    "error": "complaint_id and masked_text are required",
+                }
+            else:
+                valid.append(position)
+
+        for start in range(0, len(valid), batch_size):
+            positions = valid[start:start + batch_size]
+            batch = [complaints[position] for position in positions]
+            statuses = self._index_batch(batch)
+            if len(batch) > 1 and all(status["status"] == "failed" for status in statuses):
+                # One bad item fails the whole embed/upsert; isolate it
+                statuses = [self._index_batch([item])[0] for item in batch]
+            for position, status in zip(positions, statuses):
+                results[position] = status
+
+        self.logger.info(
+            "Batch indexed %s/%s complaints",
+            sum(1 for result in results if result["status"] == "indexed"),
+            len(complaints),
+        )
+        return results
+    
+    def _index_batch(self, batch: List[Dict]) -> List[Dict]:
+        """Deduplicate, embed what is new, and upsert one batch."""
+        canonical_of: Dict[int, str] = {}
+        registered: List[str] = []
+        if self.dedup_mode != "off":
+            for index, item in enumerate(batch):
+                if self.near_duplicates.canonical_of(item["complaint_id"]) is None:
+                    registered.append(item["complaint_id"])
+                match = self.near_duplicates.add(item["complaint_id"], item["masked_text"])
+                if match is not None:
+                    canonical_of[index] = match[0]
+        
+        written: List[str] = []
         try:
-            # Upsert to handle re-indexing
-            self.collection.upsert(
-                ids=[complaint_id],
-                documents=[masked_text],
-                metadatas=[metadata or {}]
-            )
-            self.logger.info("Indexed complaint: %s", complaint_id)
-            return True
+            vectors: Dict[str, List[float]] = {}
+            batch_ids = {item["complaint_id"] for item in batch}
+            upsert = [i for i in range(len(batch)) if not (i in canonical_of and self.dedup_mode == "skip")]
+            if self.dedup_mode == "reuse" and canonical_of:
+                # Canonicals indexed earlier: reuse their stored vectors
+                stored_ids = sorted(set(canonical_of.values()) - batch_ids)
+                if stored_ids:
+                    vectors.update(self._stored_embeddings(stored_ids))
+            
+            # Duplicates are only embedded when their canonical's vector is unavailable
+            to_embed = [
+                i for i in upsert
+                if i not in canonical_of
+                or (canonical_of[i] not in batch_ids and canonical_of[i] not in vectors)
+            ]
+            if to_embed:
+                embeddings = vector_store.embedding_fn([batch[i]["masked_text"] for i in to_embed])
+                for i, vector in zip(to_embed, embeddings):
+                    vectors[batch[i]["complaint_id"]] = [float(value) for value in vector]
+            
+            if upsert:
+                # One upsert per target collection (a single one unless partitioned)
+                groups: Dict[str, Tuple[Any, List[int], List[Optional[Dict]]]] = {}
+                target_of: Dict[str, str] = {}
+                for i in upsert:
+                    metadata = self._prepare_metadata(batch[i].get("metadata")) or {}
+                    if i in canonical_of:
+                        metadata["canonical_id"] = canonical_of[i]
+                    target = self._write_collection(metadata)
+                    group = groups.setdefault(target.name, (target, [], []))
+                    group[1].append(i)
+                    group[2].append(metadata or None)
+                    target_of[batch[i]["complaint_id"]] = target.name
+                
+                located = self._locate(list(target_of)) if self._count is not None or self.partitioned else {}
+                new_count = len(set(target_of) - set(located)) if self._count is not None else 0
+                for target, indices, metadatas in groups.values():
+                    written.append(target.name)
+                    target.upsert(
+                        ids=[batch[i]["complaint_id"] for i in indices],
+                        embeddings=[
+                            vectors.get(batch[i]["complaint_id"]) or vectors[canonical_of[i]]
+                            for i in indices
+                        ],
+                        documents=[batch[i]["masked_text"] for i in indices],
+                        metadatas=metadatas,
+                    )
+                # A re-indexed complaint whose created_at changed month leaves its old partition
+                for complaint_id, holder in located.items():
+                    if holder.name != target_of[complaint_id]:
+                        holder.delete(ids=[complaint_id])
+                self._adjust_count(new_count)
         except Exception as e:
-            self.logger.error("Failed to index complaint %s: %s", complaint_id, e)
-            return False
+            self.logger.error("Failed to index batch of %s complaints: %s", len(batch), e)
+            for name in written:
+                if name != self.collection_name:
+                    # Possibly retired by a reindex in another process; reopen on retry
+                    vector_store.forget_collection(name)
+                    self._partitions = None
+            for complaint_id in registered:
+                self.near_duplicates.remove(complaint_id)
+            return [
+                {"complaint_id": item["complaint_id"], "status": "failed", "error": str(e)}
+                for item in batch
+            ]
+        
+        statuses = []
+        for index, item in enumerate(batch):
+            status = {"complaint_id": item["complaint_id"], "status": "indexed"}
+            if index in canonical_of:
+                status["canonical_id"] = canonical_of[index]
+                if self.dedup_mode == "skip":
+                    status["status"] = "duplicate"
+            statuses.append(status)
+        return statuses
     
     def find_similar(
         self, 
-        query_text: str, 
+        query_text: Optional[str] = None, 
         n_results: int = 5, 
-        exclude_id: Optional[str] = None
+        exclude_id: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        ids_only: bool = False,
+        after: Optional[Tuple[float, str]] = None,
+        depth: int = 0,
     ) -> List[Dict]:
         """
         Find complaints similar to the query text.
@@ -76,61 +416,322 @@ class ComplaintSimilarityService:
             query_text: Text to find similar complaints for
             n_results: Maximum number of results to return
             exclude_id: Optional complaint ID to exclude (e.g., self)
+            query_embedding: Precomputed vector; skips embedding query_text
+            where: Chroma metadata filter (see build_similarity_filter)
+            offset: Number of leading matches to skip (pagination)
+            ids_only: Return only ids and scores, without fetching documents
+            after: Keyset pagination: only matches ordered after this
+                (distance, id), so writes between pages do not shift them
+            depth: Matches already paged past with ``after``; sizes the
+                per-partition top-k (the store has no distance predicate)
             
         Returns:
-            List of similar complaints with similarity scores
+            List of similar complaints with similarity scores and the raw
+            distance (the keyset for the next page)
         """
         try:
-            # Query with +1 to allow for self-exclusion
-            results = self.collection.query(
-                query_texts=[query_text],
-                n_results=n_results + (1 if exclude_id else 0),
-                include=["documents", "metadatas", "distances"]
+            self._follow_alias()
+            collections = self._query_collections()
+            if query_embedding is None and len(collections) > 1:
+                # Embed once, not once per partition
+                query_embedding = [float(value) for value in vector_store.embedding_fn([query_text])[0]]
+            query = (
+                {"query_embeddings": [query_embedding]}
+                if query_embedding is not None
+                else {"query_texts": [query_text]}
             )
-            
-            if not results["documents"] or not results["documents"][0]:
-                return []
+            include = ["distances"] if ids_only else ["documents", "metadatas", "distances"]
+            # Query with +1 to allow for self-exclusion
+            top_k = depth + offset + n_results + (1 if exclude_id else 0)
+            while True:
+                # Each partition's top-k, merged by distance below
+                hits = []
+                truncated = False
+                for collection in collections:
+                    try:
+                        results = collection.query(**query, n_results=top_k, where=where, include=include)
+                    except Exception as e:
+                        if collection is self.collection:
+                            raise
+                        # e.g. dropped by a retention run in another process
+                        self.logger.warning("Skipping partition %s: %s", collection.name, e)
+                        self._partitions = None
+                        continue
+                    if not results["ids"] or not results["ids"][0]:
+                        continue
+                    truncated = truncated or len(results["ids"][0]) == top_k
+                    for i, complaint_id in enumerate(results["ids"][0]):
+                        hits.append((
+                            results["distances"][0][i],
+                            complaint_id,
+                            None if ids_only else results["documents"][0][i],
+                            None if ids_only else results["metadatas"][0][i],
+                        ))
+                hits.sort(key=lambda hit: (hit[0], hit[1]))
+                if after is None:
+                    break
+                hits = [hit for hit in hits if (hit[0], hit[1]) > after]
+                remaining = len({hit[1] for hit in hits} - {exclude_id})
+                if remaining >= offset + n_results or not truncated:
+                    break
+                # Complaints indexed closer than the cursor since the last page
+                # pushed it down: rank deeper
+                top_k *= 2
             
             similar = []
-            for i, doc in enumerate(results["documents"][0]):
-                complaint_id = results["ids"][0][i]
-                
+            seen = set()
+            for distance, complaint_id, doc, metadata in hits:
                 # Skip self
-                if exclude_id and complaint_id == exclude_id:
+                if (exclude_id and complaint_id == exclude_id) or complaint_id in seen:
                     continue
+                seen.add(complaint_id)
                 
                 # Convert L2 distance to similarity score (0-1 range)
-                distance = results["distances"][0][i]
                 similarity = 1 / (1 + distance)
+                item = {"id": complaint_id, "similarity_score": round(similarity, 2), "distance": distance}
                 
-                # Truncate long text for response
-                truncated_text = doc[:200] + "..." if len(doc) > 200 else doc
-                
-                similar.append({
-                    "id": complaint_id,
-                    "masked_text": truncated_text,
-                    "similarity_score": round(similarity, 2),
-                    **(results["metadatas"][0][i] if results["metadatas"][0] else {})
-                })
+                if not ids_only:
+                    # Truncate long text for response
+                    item["masked_text"] = doc[:200] + "..." if len(doc) > 200 else doc
+                    item.update(metadata or {})
+                similar.append(item)
             
-            return similar[:n_results]
+            return similar[offset:offset + n_results]
             
         except Exception as e:
             self.logger.error("Similarity search failed: %s", e)
             return []
     
+    def get_stored_embedding(self, complaint_id: str) -> Optional[List[float]]:
+        """Return the indexed vector for a complaint, or None if it is not indexed."""
+        try:
+            return self._stored_embeddings([complaint_id]).get(complaint_id)
+        except Exception as e:
+            self.logger.error("Embedding lookup failed for %s: %s", complaint_id, e)
+            return None
+
+    def find_similar_by_id(
+        self,
+        complaint_id: str,
+        n_results: int = 5,
+        query_text: Optional[str] = None,
+        **search: Any,
+    ) -> Optional[Tuple[List[Dict], str]]:
+        """
+        Find complaints similar to an indexed complaint using its stored vector.
+        
+        Falls back to embedding ``query_text`` only when the id is not indexed.
+        Extra keyword arguments (where, offset, ids_only, after, depth) go to
+        find_similar.
+        
+        Returns:
+            (results, embedding_source) with source "stored" or "query_text",
+            or None when the id is unknown and no query_text was given
+        """
+        embedding = self.get_stored_embedding(complaint_id)
+        if embedding is not None:
+            results = self.find_similar(
+                n_results=n_results, exclude_id=complaint_id, query_embedding=embedding, **search
+            )
+            return results, "stored"
+        if not query_text:
+            return None
+        # Not indexed, so no self-match to over-fetch for
+        results = self.find_similar(query_text=query_text, n_results=n_results, **search)
+        return [item for item in results if item["id"] != complaint_id], "query_text"
+    
     def delete_complaint(self, complaint_id: str) -> bool:
         """Remove a complaint from the index."""
         try:
-            self.collection.delete(ids=[complaint_id])
+            self._follow_alias()
+            located = self._locate([complaint_id])
+            for holder in located.values():
+                holder.delete(ids=[complaint_id])
+            self._adjust_count(-len(located))
+            self.near_duplicates.remove(complaint_id)
             return True
         except Exception as e:
             self.logger.error("Failed to delete complaint %s: %s", complaint_id, e)
             return False
     
+    def _locate(self, ids: List[str]) -> Dict[str, Any]:
+        """Map each indexed id to the collection holding it."""
+        remaining = list(dict.fromkeys(ids))
+        located: Dict[str, Any] = {}
+        for collection in self._read_collections():
+            if not remaining:
+                break
+            # include=[] only touches the id index, not documents or vectors
+            for found in collection.get(ids=remaining, include=[])["ids"]:
+                located[found] = collection
+            remaining = [complaint_id for complaint_id in remaining if complaint_id not in located]
+        return located
+    
+    def _stored_embeddings(self, ids: List[str]) -> Dict[str, List[float]]:
+        remaining = list(dict.fromkeys(ids))
+        vectors: Dict[str, List[float]] = {}
+        for collection in self._read_collections():
+            if not remaining:
+                break
+            stored = collection.get(ids=remaining, include=["embeddings"])
+            embeddings = stored.get("embeddings")
+            if embeddings is None:
+                continue
+            for stored_id, vector in zip(stored["ids"], embeddings):
+                vectors[stored_id] = [float(value) for value in vector]
+            remaining = [complaint_id for complaint_id in remaining if complaint_id not in vectors]
+        return vectors
+    
+    def start_near_duplicate_rebuild(self) -> None:
+        """Rebuild the near-duplicate index on a daemon thread; serving does not wait for it."""
+        if self.dedup_mode == "off" or self.dedup_rebuild_limit <= 0:
+            return
+        Thread(target=self.rebuild_near_duplicates, name="near-duplicate-rebuild", daemon=True).start()
+    
+    def rebuild_near_duplicates(self, limit: Optional[int] = None, page_size: int = 1000) -> int:
+        """
+        Re-register stored complaints with the near-duplicate index, which is
+        in-memory and starts empty in each worker: at most ``limit`` (default
+        SIMILARITY_DEDUP_REBUILD_LIMIT) from the collections inside the query
+        horizon, newest partition first. Canonicals go in first so stored
+        duplicates link back to them.
+        """
+        if self.dedup_mode == "off":
+            return 0
+        limit = self.dedup_rebuild_limit if limit is None else limit
+        duplicates: List[Tuple[str, str]] = []
+        registered = 0
+        scanned = 0
+        for collection in self._query_collections():
+            offset = 0
+            # Offset paging rescans skipped rows, so the limit also bounds that cost
+            while scanned < limit:
+                size = min(page_size, limit - scanned)
+                page = collection.get(include=["documents", "metadatas"], limit=size, offset=offset)
+                scanned += len(page["ids"])
+                for complaint_id, document, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+                    if not document:
+                        continue
+                    if (metadata or {}).get("canonical_id"):
+                        duplicates.append((complaint_id, document))
+                    else:
+                        self.near_duplicates.add(complaint_id, document)
+                        registered += 1
+                if len(page["ids"]) < size:
+                    break
+                offset += size
+        for complaint_id, document in duplicates:
+            self.near_duplicates.add(complaint_id, document)
+        registered += len(duplicates)
+        self.logger.info("Near-duplicate index rebuilt from %s stored complaints", registered)
+        return registered
+    
+    def _adjust_count(self, delta: int) -> None:
+        with self._count_lock:
+            if self._count is not None:
+                self._count = max(0, self._count + delta)
+    
+    def reconcile_count(self) -> int:
+        """Refresh the cached count and index size from the store."""
+        self.refresh_collection()
+        if self.partitioned:
+            self._partition_names(refresh=True)
+        collections = self._read_collections()
+        count = sum(collection.count() for collection in collections)
+        size = vector_store.collection_disk_bytes([collection.name for collection in collections])
+        with self._count_lock:
+            self._count = count
+            self._vector_index_bytes = size
+            self._count_reconciled_at = time.monotonic()
+        return count
+    
     def get_collection_count(self) -> int:
-        """Return number of indexed complaints."""
-        return self.collection.count()
+        """Return number of indexed complaints (cached; no store query per call)."""
+        if self._count is None or time.monotonic() - self._count_reconciled_at > self.count_reconcile_interval:
+            try:
+                return self.reconcile_count()
+            except Exception as e:
+                self.logger.error("Count reconcile failed: %s", e)
+                if self._count is None:
+                    raise
+        return self._count
+    
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Cached complaint count plus the on-disk size of its vector index (all partitions)."""
+        count = self.get_collection_count()
+        return {
+            "count": count,
+            "vector_index_bytes": self._vector_index_bytes,
+            "reconciled_seconds_ago": round(time.monotonic() - self._count_reconciled_at, 1),
+            "near_duplicates": {"mode": self.dedup_mode, **self.near_duplicates.stats()},
+            "partitioning": {
+                "mode": "monthly" if self.partitioned else "off",
+                "query_horizon_months": self.query_horizon_months,
+                "partitions": list(self._partitions or []),
+            },
+        }
+    
+    def apply_retention(
+        self,
+        retention_months: int,
+        compact_after_months: int,
+        now: Optional[datetime] = None,
+        dry_run: bool = False,
+        page_size: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Drop partitions older than ``retention_months`` and merge monthly
+        partitions older than ``compact_after_months`` into one collection per
+        year (vectors are copied, not re-embedded). 0 disables either step.
+        
+        Returns:
+            The plan plus the number of vectors dropped and compacted
+        """
+        plan = plan_partition_retention(
+            self._partition_names(refresh=True),
+            now or datetime.now(timezone.utc),
+            retention_months,
+            compact_after_months,
+        )
+        summary = {**plan, "vectors_dropped": 0, "vectors_compacted": 0, "dry_run": dry_run}
+        if dry_run:
+            return summary
+        
+        for name, yearly in plan["compact"].items():
+            source = vector_store.get_collection(name)
+            target = vector_store.get_collection(yearly)
+            while True:
+                # The source shrinks as pages move, so always read from offset 0
+                page = source.get(limit=page_size, include=["embeddings", "documents", "metadatas"])
+                if not page["ids"]:
+                    break
+                target.upsert(
+                    ids=page["ids"],
+                    embeddings=page["embeddings"],
+                    documents=page["documents"],
+                    metadatas=page["metadatas"],
+                )
+                source.delete(ids=page["ids"])
+                summary["vectors_compacted"] += len(page["ids"])
+            vector_store.drop_collection(name)
+            self.logger.info("Compacted partition %s into %s", name, yearly)
+        
+        for name in plan["drop"]:
+            collection = vector_store.get_collection(name)
+            offset = 0
+            while True:
+                page = collection.get(limit=page_size, offset=offset, include=[])
+                if not page["ids"]:
+                    break
+                for complaint_id in page["ids"]:
+                    self.near_duplicates.remove(complaint_id)
+                offset += len(page["ids"])
+            vector_store.drop_collection(name)
+            summary["vectors_dropped"] += offset
+            self.logger.info("Dropped partition %s (%s vectors)", name, offset)
+        
+        self.reconcile_count()
+        return summary
 
 
 # Global instance
@@ -0,0 +1,102 @@
+"""
+Category Spike Detector
+Streaming per-category / per-urgency counters fed by /predict. Fixed-size
+ring buffers (60 one-second slots + one-minute slots over the baseline
+horizon) give sliding 1m/15m/1h counts and a baseline to compare them with,
+without querying the complaint tables.
+"""
+import os
+import time
+from threading import Lock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.services.ring_counter import RingCounter
+
+WINDOWS_MINUTES = {"1m": 1, "15m": 15, "1h": 60}
+
+
+class SpikeDetector:
+    def __init__(
+        self,
+        baseline_hours: Optional[float] = None,
+        z_threshold: Optional[float] = None,
+        min_count: Optional[int] = None,
+    ) -> None:
+        self.logger = get_logger("complaintops.spike_detector")
+        self.baseline_minutes = int(60 * (baseline_hours or float(os.getenv("SPIKE_BASELINE_HOURS", "24"))))
+        self.z_threshold = z_threshold or float(os.getenv("SPIKE_Z_THRESHOLD", "3.0"))
+        self.min_count = min_count or int(os.getenv("SPIKE_MIN_COUNT", "5"))
+        self._lock = Lock()
+        self._seconds: Dict[str, RingCounter] = {}
+        self._minutes: Dict[str, RingCounter] = {}
+        self._spiking: set = set()
+
+    def record(self, category: str, urgency: str, now: Optional[float] = None) -> None:
+        """Count one triaged complaint."""
+        now = time.time() if now is None else now
+        second, minute = int(now), int(now // 60)
+        with self._lock:
+            for key in (f"category:{category}", f"urgency:{urgency}"):
+                if key not in self._seconds:
+                    self._seconds[key] = RingCounter(60)
+                    # Current window + baseline horizon
+                    self._minutes[key] = RingCounter(self.baseline_minutes + max(WINDOWS_MINUTES.values()))
+                self._seconds[key].add(second)
+                self._minutes[key].add(minute)
+
+    def _window_stats(self, key: str, now: float) -> Dict[str, Dict]:
+        second, minute = int(now), int(now // 60)
+        history = self._minutes[key].series(minute, self.baseline_minutes + max(WINDOWS_MINUTES.values()))
+        stats = {}
+        for name, minutes in WINDOWS_MINUTES.items():
+            if minutes == 1:
+                # Sliding last 60 seconds rather than the partial current minute
+                current = int(self._seconds[key].series(second, 60).sum())
+            else:
+                current = int(history[-minutes:].sum())
+            # Baseline: non-overlapping blocks of the same length before the current window
+            past = history[:-minutes][-self.baseline_minutes:]
+            blocks = past[len(past) % minutes:].reshape(-1, minutes).sum(axis=1)
+            mean = float(blocks.mean()) if len(blocks) else 0.0
+            std = float(blocks.std()) if len(blocks) else 0.0
+            # Poisson floor keeps sparse keys from alerting on a handful of events
+            scale = max(std, np.sqrt(mean), 1.0)
+            z_score = (current - mean) / scale
+            stats[name] = {
+                "count": current,
+                "baseline_mean": round(mean, 2),
+                "baseline_std": round(std, 2),
+                "z_score": round(z_score, 2),
+                "spiking": current >= self.min_count and z_score >= self.z_threshold,
+            }
+        return stats
+
+    def snapshot(self, now: Optional[float] = None) -> Dict:
+        """Per-key window counts/deviation, plus the keys currently spiking."""
+        now = time.time() if now is None else now
+        with self._lock:
+            metrics = {key: self._window_stats(key, now) for key in sorted(self._minutes)}
+        spiking: List[Dict] = [
+            {"key": key, "window": window, **values}
+            for key, windows in metrics.items()
+            for window, values in windows.items()
+            if values["spiking"]
+        ]
+        spiking.sort(key=lambda item: item["z_score"], reverse=True)
+        spiking_keys = {item["key"] for item in spiking}
+        for key in spiking_keys - self._spiking:
+            self.logger.warning("spike_detected key=%s", key)
+        self._spiking = spiking_keys
+        return {
+            "baseline_minutes": self.baseline_minutes,
+            "z_threshold": self.z_threshold,
+            "spiking": spiking,
+            "metrics": metrics,
+        }
+
+
+# Global instance
+spike_detector = SpikeDetector()
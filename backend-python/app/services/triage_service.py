@@ -2,6 +2,7 @@ import joblib
 import logging
 import json
 from pathlib import Path
+from typing import List
 
 
 class TriageEngine:
@@ -23,7 +24,18 @@ class TriageEngine:
         self.logger = logging.getLogger("complaintops.triage_model")
         self._load_models()
 
-    def _load_models(self):
+    def reload(self) -> bool:
+        """
+        Reload models from models/latest.json (e.g. after retraining).
+
+        Returns:
+            True if new models were loaded; False if loading failed (any
+            previously loaded models keep serving)
+        """
+        return self._load_models()
+
+    def _load_models(self) -> bool:
+        category_model = urgency_model = None
         try:
             # Use pathlib for cross-platform compatibility
             base_dir = Path(__file__).parent.parent.parent
@@ -38,8 +50,8 @@ class TriageEngine:
                 urgency_path = base_dir / metadata.get("urgency_model_path", "")
 
                 if category_path.exists() and urgency_path.exists():
-                    self.category_model = joblib.load(str(category_path))
-                    self.urgency_model = joblib.load(str(urgency_path))
+                    category_model = joblib.load(str(category_path))
+                    urgency_model = joblib.load(str(urgency_path))
                     self.logger.info("✅ Models loaded from %s", category_path.parent)
                 else:
                     self.logger.warning("Model files not found at %s", category_path)
@@ -48,15 +60,20 @@ class TriageEngine:
                 legacy_cat = base_dir / "models" / "category_model.pkl"
                 legacy_urg = base_dir / "models" / "urgency_model.pkl"
                 if legacy_cat.exists() and legacy_urg.exists():
-                    self.category_model = joblib.load(str(legacy_cat))
-                    self.urgency_model = joblib.load(str(legacy_urg))
+                    category_model = joblib.load(str(legacy_cat))
+                    urgency_model = joblib.load(str(legacy_urg))
                     self.logger.info("✅ Models loaded from legacy paths")
                 else:
                     self.logger.warning("Models not found. Please run train_triage_model.py first.")
         except Exception as e:
             self.logger.error("❌ Error loading models: %s", e)
 
+        loaded = category_model is not None and urgency_model is not None
+        if loaded:
+            # Swap both at once so in-flight predictions never mix model versions
+            self.category_model, self.urgency_model = category_model, urgency_model
         self.model_loaded = bool(self.category_model and self.urgency_model)
+        return loaded
 
     def predict(self, text: str):
         if not self.model_loaded:
@@ -89,6 +106,28 @@ class TriageEngine:
             "model_loaded": True,
         }
 
+    def predict_batch(self, texts: List[str]) -> List[dict]:
+        """predict() for many texts with one vectorized call per model."""
+        if not self.model_loaded:
+            return [self.predict(text) for text in texts]
+        category_model, urgency_model = self.category_model, self.urgency_model
+        categories = category_model.predict(texts)
+        category_confidences = category_model.predict_proba(texts).max(axis=1)
+        urgencies = urgency_model.predict(texts)
+        urgency_confidences = urgency_model.predict_proba(texts).max(axis=1)
+        return [
+            {
+                "category": category,
+                "category_confidence": float(category_confidence),
+                "urgency": self.URGENCY_MAPPING.get(str(urgency).upper(), "LOW"),
+                "urgency_confidence": float(urgency_confidence),
+                "model_loaded": True,
+            }
+            for category, category_confidence, urgency, urgency_confidence in zip(
+                categories, category_confidences, urgencies, urgency_confidences
+            )
+        ]
+
 
 triage_engine = TriageEngine()
 
@@ -0,0 +1,329 @@
+"""
+Vector Sidecar
+Optional local process that owns the embedding model and every ChromaDB read
+and write, serving all API workers over a UNIX socket.
+
+Run it once per host:
+    python -m app.services.vector_sidecar --socket /tmp/complaintops-vector.sock
+
+and point the workers at it with VECTOR_SIDECAR_SOCKET. Concurrent embed and
+query calls are coalesced into batched model invocations, and all store
+operations run on a single thread so writes are serialized.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import configure_logging, get_logger
+
+_HEADER = struct.Struct("!I")
+# Per-query keys in Chroma query results; everything else is shared
+_QUERY_RESULT_KEYS = ("ids", "documents", "metadatas", "distances", "embeddings", "uris", "data")
+# Side-effect free ops, safe to resend when the reply is lost
+_READ_OPS = frozenset({"embed", "query", "get", "count", "stats", "list_collections", "collection_disk_bytes"})
+
+
+def _json_default(value: Any):
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def _encode(message: Dict) -> bytes:
+    body = json.dumps(message, default=_json_default, ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Vector sidecar closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+# ============== CLIENT (API workers) ==============
+
+class VectorSidecarClient:
+    """Thin client keeping one persistent socket per thread."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        self.socket_path = socket_path
+        self.timeout = timeout or float(os.getenv("VECTOR_SIDECAR_TIMEOUT", "30"))
+        self._local = threading.local()
+        self._request_ids = iter(range(1, 1 << 62))
+        self._id_lock = threading.Lock()
+
+    def _connection(self) -> socket.socket:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.settimeout(self.timeout)
+            conn.connect(self.socket_path)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+        self._local.conn = None
+
+    def call(self, op: str, collection: Optional[str] = None, **args) -> Any:
+        with self._id_lock:
+            request_id = next(self._request_ids)
+        payload = _encode({"id": request_id, "op": op, "collection": collection, "args": args})
+        # One reconnect attempt covers a sidecar restart between calls. Once
+        # the request is out, only reads are resent: a lost reply to a write
+        # may mean it was applied
+        for attempt in range(2):
+            sent = False
+            try:
+                conn = self._connection()
+                conn.sendall(payload)
+                sent = True
+                (size,) = _HEADER.unpack(_recv_exact(conn, _HEADER.size))
+                response = json.loads(_recv_exact(conn, size))
+                break
+            except (ConnectionError, OSError) as e:
+                self._reset()
+                if attempt or isinstance(e, socket.timeout) or (sent and op not in _READ_OPS):
+                    raise
+        if not response.get("ok"):
+            raise RuntimeError(f"Vector sidecar {op} failed: {response.get('error')}")
+        return response.get("result")
+
+
+class RemoteCollection:
+    """Subset of the Chroma Collection API, proxied to the sidecar."""
+
+    def __init__(self, client: VectorSidecarClient, name: str):
+        self._client = client
+        self.name = name
+
+    def query(self, **kwargs) -> Dict:
+        return self._client.call("query", self.name, **kwargs)
+
+    def get(self, **kwargs) -> Dict:
+        return self._client.call("get", self.name, **kwargs)
+
+    def add(self, **kwargs) -> None:
+        self._client.call("add", self.name, **kwargs)
+
+    def upsert(self, **kwargs) -> None:
+        self._client.call("upsert", self.name, **kwargs)
+
+    def update(self, **kwargs) -> None:
+        self._client.call("update", self.name, **kwargs)
+
+    def delete(self, **kwargs) -> None:
+        self._client.call("delete", self.name, **kwargs)
+
+    def count(self) -> int:
+        return self._client.call("count", self.name)
+
+
+class RemoteEmbeddingFunction:
+    """Embedding function that runs inside the sidecar."""
+
+    def __init__(self, client: VectorSidecarClient):
+        self._client = client
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return self._client.call("embed", texts=list(input))
+
+
+# ============== SERVER (sidecar process) ==============
+
+class _Batcher:
+    """Coalesces concurrent calls sharing a key into one executor invocation."""
+
+    def __init__(self, executor: ThreadPoolExecutor, window_ms: float, max_batch: int):
+        self._executor = executor
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._pending: Dict[Any, List] = {}
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, key, items: List, run) -> List:
+        """Queue ``items``; ``run(all_items)`` must return one result per item."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            loop.call_later(self._window, lambda: self._flush(key, run))
+        batch.append((items, future))
+        if sum(len(entry[0]) for entry in batch) >= self._max_batch:
+            self._flush(key, run)
+        return await future
+
+    def _flush(self, key, run) -> None:
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        all_items = [item for items, _ in batch for item in items]
+        self.batches += 1
+        self.items += len(all_items)
+
+        def _resolve(task: asyncio.Future) -> None:
+            try:
+                results = task.result()
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            offset = 0
+            for items, future in batch:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(items)])
+                offset += len(items)
+
+        asyncio.get_running_loop().run_in_executor(self._executor, run, all_items).add_done_callback(_resolve)
+
+
+class VectorSidecarServer:
+    def __init__(self, socket_path: str, db_path: Optional[str] = None):
+        from app.services.vector_store import VectorStoreRegistry
+
+        self.socket_path = socket_path
+        self.logger = get_logger("complaintops.vector_sidecar")
+        self.registry = VectorStoreRegistry(db_path=db_path)
+        # Single store thread: Chroma writes never contend with each other
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-store")
+        self._batcher = _Batcher(
+            self._executor,
+            window_ms=float(os.getenv("VECTOR_SIDECAR_BATCH_WINDOW_MS", "5")),
+            max_batch=int(os.getenv("VECTOR_SIDECAR_MAX_BATCH", "64")),
+        )
+        self._started_at = time.time()
+
+    def _run_embed(self, texts: List[str]) -> List:
+        return [_json_default(vector) for vector in self.registry.embedding_fn(texts)]
+
+    def _run_query(self, collection: str, field: str, args: Dict, queries: List) -> List[Dict]:
+        results = self.registry.get_collection(collection).query(**{**args, field: queries})
+        per_query = []
+        for index in range(len(queries)):
+            per_query.append({
+                key: ([value[index]] if key in _QUERY_RESULT_KEYS and value is not None else value)
+                for key, value in results.items()
+            })
+        return per_query
+
+    def _run_direct(self, op: str, collection: str, args: Dict) -> Any:
+        target = self.registry.get_collection(collection)
+        if op == "count":
+            return target.count()
+        result = getattr(target, op)(**args)
+        return dict(result) if result is not None else None
+
+    async def _dispatch(self, request: Dict) -> Any:
+        op = request["op"]
+        collection = request.get("collection")
+        args = request.get("args") or {}
+        loop = asyncio.get_running_loop()
+
+        if op == "embed":
+            return await self._batcher.submit(("embed",), args["texts"], self._run_embed)
+        if op == "query":
+            field = "query_embeddings" if "query_embeddings" in args else "query_texts"
+            queries = args.pop(field)
+            key = ("query", collection, field, json.dumps(args, sort_keys=True, default=_json_default))
+            results = await self._batcher.submit(
+                key, queries, lambda items: self._run_query(collection, field, args, items)
+            )
+            merged: Dict[str, Any] = {}
+            for result in results:
+                for name, value in result.items():
+                    if name in _QUERY_RESULT_KEYS and value is not None:
+                        merged.setdefault(name, []).extend(value)
+                    else:
+                        merged.setdefault(name, value)
+            return merged
+        if op == "stats":
+            return {
+                **self.registry.memory_stats(),
+                "uptime_s": round(time.time() - self._started_at, 1),
+                "batches": self._batcher.batches,
+                "batched_items": self._batcher.items,
+            }
+        if op == "list_collections":
+            return await loop.run_in_executor(self._executor, self.registry.list_collections)
+        if op == "collection_disk_bytes":
+            return await loop.run_in_executor(self._executor, self.registry.collection_disk_bytes, args["names"])
+        if op == "delete_collection":
+            return await loop.run_in_executor(self._executor, self.registry.drop_collection, collection)
+        if op in ("get", "add", "upsert", "update", "delete", "count"):
+            return await loop.run_in_executor(self._executor, self._run_direct, op, collection, args)
+        raise ValueError(f"Unknown op: {op}")
+
+    async def _handle(self, request: Dict, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        try:
+            response = {"id": request.get("id"), "ok": True, "result": await self._dispatch(request)}
+        except Exception as e:
+            self.logger.error("Sidecar %s failed: %s", request.get("op"), e)
+            response = {"id": request.get("id"), "ok": False, "error": str(e)}
+        async with write_lock:
+            writer.write(_encode(response))
+            await writer.drain()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        # The loop only keeps weak references to tasks; hold them until done
+        tasks = set()
+        try:
+            while True:
+                (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                request = json.loads(await reader.readexactly(size))
+                task = asyncio.ensure_future(self._handle(request, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        # Load the model before accepting connections
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._run_embed, ["warmup"])
+        except Exception as e:
+            self.logger.warning("Sidecar embedding warmup failed: %s", e)
+        server = await asyncio.start_unix_server(self._serve_connection, path=self.socket_path)
+        self.logger.info("Vector sidecar listening on %s", self.socket_path)
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ComplaintOps vector/embedding sidecar")
+    parser.add_argument(
+        "--socket",
+        default=os.getenv("VECTOR_SIDECAR_SOCKET", "/tmp/complaintops-vector.sock"),
+    )
+    parser.add_argument("--db-path", default=None)
+    args = parser.parse_args()
+    configure_logging()
+    asyncio.run(VectorSidecarServer(args.socket, db_path=args.db_path).serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Vector Store Registry
+Owns the single ChromaDB client and embedding function shared by the RAG and
+similarity services, so each worker loads the embedding model only once.
+When VECTOR_SIDECAR_SOCKET is set, collections and embeddings are proxied to
+the vector sidecar process instead (see vector_sidecar.py).
+"""
+import json
+import os
+import sqlite3
+from threading import Lock
+from typing import Dict, List, Optional
+
+import chromadb
+from chromadb.utils import embedding_functions
+
+from app.core.logging import get_logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Alias -> collection name map, swapped atomically by reindex jobs
+ALIASES_FILE = "collection_aliases.json"
+
+
+class VectorStoreRegistry:
+    """Process-wide, lazily initialised ChromaDB client + embedding function."""
+
+    def __init__(self, db_path: Optional[str] = None, sidecar_socket: Optional[str] = None):
+        self.logger = get_logger("complaintops.vector_store")
+        self._db_path = db_path or os.getenv("CHROMA_DB_PATH", os.path.join(os.getcwd(), "chroma_db"))
+        self._lock = Lock()
+        self._client = None
+        self._embedding_fn = None
+        self._collections: Dict[str, object] = {}
+        self._sidecar = None
+        if sidecar_socket:
+            from app.services.vector_sidecar import VectorSidecarClient
+
+            self._sidecar = VectorSidecarClient(sidecar_socket)
+            self.logger.info("Vector store proxied to sidecar at %s", sidecar_socket)
+
+    @property
+    def uses_sidecar(self) -> bool:
+        return self._sidecar is not None
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = chromadb.PersistentClient(path=self._db_path)
+                    self.logger.info("Chroma client opened at %s", self._db_path)
+        return self._client
+
+    @property
+    def embedding_fn(self):
+        if self._embedding_fn is None:
+            with self._lock:
+                if self._embedding_fn is None and self._sidecar is not None:
+                    from app.services.vector_sidecar import RemoteEmbeddingFunction
+
+                    self._embedding_fn = RemoteEmbeddingFunction(self._sidecar)
+                elif self._embedding_fn is None:
+                    # Default embedding function (all-MiniLM-L6-v2, ONNX)
+                    # Note: For Turkish, consider 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+                    self._embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+        return self._embedding_fn
+
+    def get_collection(self, name: str):
+        """Return a cached collection handle bound to the shared embedding function."""
+        collection = self._collections.get(name)
+        if collection is not None:
+            return collection
+        if self._sidecar is not None:
+            from app.services.vector_sidecar import RemoteCollection
+
+            with self._lock:
+                return self._collections.setdefault(name, RemoteCollection(self._sidecar, name))
+        client = self.client
+        embedding_fn = self.embedding_fn
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = client.get_or_create_collection(
+                    name=name,
+                    embedding_function=embedding_fn,
+                )
+            return self._collections[name]
+
+    def forget_collection(self, name: str) -> None:
+        """Drop the cached handle only (the collection was deleted by another process)."""
+        with self._lock:
+            self._collections.pop(name, None)
+
+    def drop_collection(self, name: str) -> None:
+        """Delete a collection and forget its cached handle."""
+        with self._lock:
+            self._collections.pop(name, None)
+        if self._sidecar is not None:
+            self._sidecar.call("delete_collection", name)
+            return
+        try:
+            self.client.delete_collection(name)
+        except Exception as e:
+            self.logger.warning("Could not delete collection %s: %s", name, e)
+
+    @property
+    def _aliases_path(self) -> str:
+        return os.path.join(self._db_path, ALIASES_FILE)
+
+    def resolve_alias(self, name: str) -> str:
+        """Collection an alias currently points to (the name itself if unaliased)."""
+        try:
+            with open(self._aliases_path, "r", encoding="utf-8") as handle:
+                return json.load(handle).get(name, name)
+        except (OSError, ValueError):
+            return name
+
+    def set_alias(self, name: str, target: str) -> None:
+        """Point ``name`` at ``target``; readers see either the old or the new mapping."""
+        try:
+            with open(self._aliases_path, "r", encoding="utf-8") as handle:
+                aliases = json.load(handle)
+        except (OSError, ValueError):
+            aliases = {}
+        aliases[name] = target
+        os.makedirs(self._db_path, exist_ok=True)
+        tmp_path = f"{self._aliases_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(aliases, handle, indent=2)
+        os.replace(tmp_path, self._aliases_path)
+        self.logger.info("Collection alias %s -> %s", name, target)
+
+    def list_collections(self, prefix: str = "") -> List[str]:
+        """Names of the stored collections starting with ``prefix``."""
+        if self._sidecar is not None:
+            names = self._sidecar.call("list_collections")
+        else:
+            # Chroma < 0.6 returns Collection objects, later versions return names
+            names = [getattr(item, "name", item) for item in self.client.list_collections()]
+        return sorted(name for name in names if name.startswith(prefix))
+
+    def collection_disk_bytes(self, names: List[str]) -> Optional[int]:
+        """
+        On-disk size of the HNSW vector segments of the named collections.
+        Documents and metadata live in chroma.sqlite3 next to every other
+        collection's and are not counted. None when it cannot be measured.
+        """
+        if self._sidecar is not None:
+            return self._sidecar.call("collection_disk_bytes", names=list(names))
+        collection_ids = []
+        for name in names:
+            try:
+                collection_ids.append(str(self.client.get_collection(name).id))
+            except Exception:
+                continue
+        if not collection_ids:
+            return 0
+        try:
+            conn = sqlite3.connect(f"file:{os.path.join(self._db_path, 'chroma.sqlite3')}?mode=ro", uri=True)
+            try:
+                segment_ids = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT id FROM segments WHERE scope = 'VECTOR' "
+                        f"AND collection IN ({','.join('?' * len(collection_ids))})",
+                        collection_ids,
+                    )
+                ]
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.warning("Could not read Chroma segments: %s", e)
+            return None
+        total = 0
+        for segment_id in segment_ids:
+            for root, _, files in os.walk(os.path.join(self._db_path, segment_id)):
+                for filename in files:
+                    try:
+                        total += os.path.getsize(os.path.join(root, filename))
+                    except OSError:
+                        pass
+        return total
+
+    def memory_stats(self) -> Dict:
+        """Report process memory plus what this registry has loaded."""
+        peak_rss_mb = None
+        if resource is not None:
+            # ru_maxrss is KiB on Linux
+            peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        rss_mb = None
+        try:
+            with open("/proc/self/statm", "r") as handle:
+                rss_pages = int(handle.read().split()[1])
+            rss_mb = rss_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        except (OSError, ValueError, IndexError, AttributeError):
+            pass
+        stats = {
+            "mode": "sidecar" if self._sidecar is not None else "local",
+            "pid": os.getpid(),
+            "rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+            "peak_rss_mb": round(peak_rss_mb, 1) if peak_rss_mb is not None else None,
+            "client_open": self._client is not None,
+            "embedding_fn_loaded": self._embedding_fn is not None,
+            "collections": sorted(self._collections),
+        }
+        if self._sidecar is not None:
+            try:
+                stats["sidecar"] = self._sidecar.call("stats")
+            except Exception as e:
+                stats["sidecar"] = {"error": str(e)}
+        return stats
+
+
+# Global instance
+vector_store = VectorStoreRegistry(sidecar_socket=os.getenv("VECTOR_SIDECAR_SOCKET"))
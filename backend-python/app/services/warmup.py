@@ -0,0 +1,84 @@
+"""
+Startup Warmup
+Pays the lazy model-load costs (ONNX embedding session, triage pipelines,
+Presidio) before traffic arrives, and gates /ready on completion.
+"""
+import os
+import time
+from threading import Lock, Thread
+from typing import Callable, Dict, List
+
+from app.core.logging import get_logger
+from app.services.masking_service import masker
+from app.services.rag_service import rag_manager
+from app.services.similarity_service import similarity_service
+from app.services.triage_service import triage_engine
+
+WARMUP_QUERIES = [
+    "Kartımdan bilgim dışında para çekildi",
+    "EFT yaptım ama karşı hesaba geçmedi",
+    "Mobil uygulamaya giriş yapamıyorum, şifremi unuttum",
+]
+
+
+class WarmupState:
+    def __init__(self) -> None:
+        self.logger = get_logger("complaintops.warmup")
+        self._lock = Lock()
+        self.started = False
+        self.completed = False
+        self.components: Dict[str, Dict] = {}
+        self.total_ms = 0.0
+
+    def _run_component(self, name: str, fn: Callable[[], None]) -> None:
+        start = time.perf_counter()
+        try:
+            fn()
+            result = {"ok": True}
+        except Exception as e:
+            self.logger.warning("Warmup of %s failed: %s", name, e)
+            result = {"ok": False, "error": str(e)}
+        result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        self.components[name] = result
+        self.logger.info("warmup component=%s duration_ms=%s ok=%s", name, result["duration_ms"], result["ok"])
+
+    def run(self) -> None:
+        """Warm every component once; failures are reported but do not block readiness."""
+        with self._lock:
+            if self.started:
+                return
+            self.started = True
+
+        queries: List[str] = list(WARMUP_QUERIES)
+        start = time.perf_counter()
+        # Query the collections directly: retrieve/find_similar swallow errors
+        self._run_component(
+            "rag_embedding",
+            lambda: rag_manager.collection.query(query_texts=queries, n_results=1),
+        )
+        self._run_component(
+            "similarity_embedding",
+            lambda: similarity_service.collection.query(query_texts=queries, n_results=1),
+        )
+        self._run_component("triage", lambda: triage_engine.predict(queries[0]))
+        self._run_component("masking", lambda: masker.mask(queries[2]))
+        self.total_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.completed = True
+        self.logger.info("Warmup complete in %sms", self.total_ms)
+
+    def start_background(self) -> None:
+        if os.getenv("WARMUP_ENABLED", "true").lower() != "true":
+            self.started = self.completed = True
+            return
+        Thread(target=self.run, name="warmup", daemon=True).start()
+
+    def status(self) -> Dict:
+        return {
+            "ready": self.completed,
+            "total_ms": self.total_ms,
+            "components": dict(self.components),
+        }
+
+
+# Global instance
+warmup_state = WarmupState()
@@ -0,0 +1,64 @@
+import numpy as np
+
+from app.ml.cluster_complaints import MiniBatchKMeans, run_clustering
+from app.services.vector_store import VectorStoreRegistry
+
+
+def _blobs(rng, centers, per_center):
+    return np.vstack([c + rng.normal(scale=0.05, size=(per_center, len(c))) for c in centers]).astype(np.float32)
+
+
+def test_minibatch_kmeans_recovers_separated_blobs():
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.0, 0.0], [5.0, 5.0], [-5.0, 5.0]])
+    data = _blobs(rng, centers, 200)
+    model = MiniBatchKMeans(k=3, seed=1)
+    for _ in range(2):
+        shuffled = data[rng.permutation(len(data))]
+        for start in range(0, len(shuffled), 64):
+            model.partial_fit(shuffled[start:start + 64])
+    found = sorted(map(tuple, np.round(model.centroids)))
+    assert found == sorted(map(tuple, centers))
+
+
+def test_run_clustering_pages_and_writes_cluster_ids(tmp_path):
+    rng = np.random.default_rng(1)
+    collection = VectorStoreRegistry(db_path=str(tmp_path / "chroma")).get_collection("complaint_embeddings")
+    data = _blobs(rng, np.array([[1.0, 0.0], [0.0, 1.0]]), 30)
+    collection.upsert(
+        ids=[f"c{i}" for i in range(len(data))],
+        embeddings=data.tolist(),
+        metadatas=[{"category": "TRANSFER_DELAY" if i < 30 else "FRAUD_UNAUTHORIZED_TX"} for i in range(len(data))],
+    )
+
+    summary = run_clustering(collection, k=2, page_size=7, epochs=2)
+
+    assert summary["vectors"] == 60
+    assert sorted(c["size"] for c in summary["clusters"]) == [30, 30]
+    assert all(len(c["top_categories"]) == 1 for c in summary["clusters"])
+    stored = collection.get(ids=["c0", "c59"], include=["metadatas"])
+    assert stored["metadatas"][0]["cluster_id"] != stored["metadatas"][1]["cluster_id"]
+    assert stored["metadatas"][0]["category"] == "TRANSFER_DELAY"
+
+
+def test_clustering_spans_alias_target_and_partitions(tmp_path, monkeypatch):
+    from app.ml.cluster_complaints import complaint_collections
+    from app.services import vector_store as vector_store_module
+
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(vector_store_module, "vector_store", registry)
+    registry.get_collection("complaint_embeddings").upsert(ids=["stale"], embeddings=[[5.0, 5.0]])
+    registry.get_collection("complaint_embeddings_v2").upsert(ids=["live"], embeddings=[[1.0, 0.0]])
+    registry.get_collection("complaint_embeddings__202609").upsert(ids=["sept"], embeddings=[[0.0, 1.0]])
+    registry.set_alias("complaint_embeddings", "complaint_embeddings_v2")
+
+    collections = complaint_collections("complaint_embeddings")
+    assert [collection.name for collection in collections] == ["complaint_embeddings_v2", "complaint_embeddings__202609"]
+
+    summary = run_clustering(collections, k=2, page_size=1, epochs=1)
+    assert summary["vectors"] == 2
+    labels = [
+        collection.get(ids=[complaint_id], include=["metadatas"])["metadatas"][0]["cluster_id"]
+        for collection, complaint_id in zip(collections, ["live", "sept"])
+    ]
+    assert labels[0] != labels[1]
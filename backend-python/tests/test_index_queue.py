@@ -0,0 +1,112 @@
+import json
+import time
+
+from app.services import index_queue as index_queue_module
+from app.services.index_queue import ComplaintIndexQueue
+
+
+def test_queue_coalesces_items_into_batched_upserts(monkeypatch):
+    batches = []
+
+    def fake_index_complaints(items, batch_size=None):
+        batches.append([item["complaint_id"] for item in items])
+        return [{"complaint_id": item["complaint_id"], "status": "indexed"} for item in items]
+
+    monkeypatch.setattr(index_queue_module.similarity_service, "index_complaints", fake_index_complaints)
+    queue = ComplaintIndexQueue()
+    queue.flush_interval = 0.05
+    for complaint_id in ["1", "2", "1", "3"]:
+        assert queue.enqueue(complaint_id, f"şikayet {complaint_id}")
+    queue.stop()
+
+    assert sorted(i for batch in batches for i in batch) == ["1", "2", "3"]
+    stats = queue.stats()
+    assert stats["indexed"] == 3 and stats["coalesced"] == 1
+    assert stats["depth"] == 0
+
+
+def test_full_queue_applies_backpressure(monkeypatch):
+    monkeypatch.setattr(
+        index_queue_module.similarity_service,
+        "index_complaints",
+        lambda items, batch_size=None: time.sleep(0.5) or [],
+    )
+    queue = ComplaintIndexQueue()
+    queue._queue.maxsize = 1
+    queue.put_timeout = 0.01
+    queue.flush_interval = 0.01
+    assert queue.enqueue("0", "metin")
+    time.sleep(0.1)  # worker is now busy flushing
+    assert queue.enqueue("1", "metin")
+    assert not queue.enqueue("2", "metin")
+    assert queue.stats()["rejected"] >= 1
+
+
+def test_failed_items_are_retried_then_dead_lettered(monkeypatch, tmp_path):
+    calls = []
+
+    def flaky_index_complaints(items, batch_size=None):
+        calls.append([item["complaint_id"] for item in items])
+        if len(calls) == 1:
+            raise RuntimeError("chroma unavailable")
+        return [
+            {"complaint_id": item["complaint_id"], "status": "failed", "error": "bad"}
+            if item["complaint_id"] == "poison"
+            else {"complaint_id": item["complaint_id"], "status": "indexed"}
+            for item in items
+        ]
+
+    monkeypatch.setattr(index_queue_module.similarity_service, "index_complaints", flaky_index_complaints)
+    queue = ComplaintIndexQueue()
+    queue.flush_interval = 0.05
+    queue.retry_backoff = 0.01
+    queue.max_attempts = 3
+    queue.dead_letter_path = str(tmp_path / "dead.jsonl")
+    assert queue.enqueue("ok", "şikayet", {"category": "TRANSFER_DELAY"})
+    assert queue.enqueue("poison", "şikayet", {"category": "TRANSFER_DELAY"})
+    deadline = time.time() + 5
+    while queue.stats()["dead_lettered"] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    queue.stop()
+
+    assert calls == [["ok", "poison"], ["ok", "poison"], ["poison"]]
+    stats = queue.stats()
+    assert (stats["indexed"], stats["failed"], stats["retries"], stats["dead_lettered"]) == (1, 1, 3, 1)
+    [line] = (tmp_path / "dead.jsonl").read_text(encoding="utf-8").splitlines()
+    record = json.loads(line)
+    assert (record["complaint_id"], record["category"], record["error"], record["attempts"]) == (
+        "poison", "TRANSFER_DELAY", "bad", 3
+    )
+
+
+def test_new_items_are_indexed_while_a_retry_waits(monkeypatch, tmp_path):
+    indexed = []
+
+    def poison_index_complaints(items, batch_size=None):
+        indexed.extend(item["complaint_id"] for item in items if item["complaint_id"] != "poison")
+        return [
+            {"complaint_id": item["complaint_id"], "status": "failed", "error": "bad"}
+            if item["complaint_id"] == "poison"
+            else {"complaint_id": item["complaint_id"], "status": "indexed"}
+            for item in items
+        ]
+
+    monkeypatch.setattr(index_queue_module.similarity_service, "index_complaints", poison_index_complaints)
+    queue = ComplaintIndexQueue()
+    queue.flush_interval = 0.01
+    queue.retry_backoff = 30
+    queue.dead_letter_path = str(tmp_path / "dead.jsonl")
+    assert queue.enqueue("poison", "şikayet")
+    deadline = time.time() + 5
+    while queue.stats()["retry_pending"] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert queue.enqueue("fresh", "şikayet")
+    deadline = time.time() + 1
+    while "fresh" not in indexed and time.time() < deadline:
+        time.sleep(0.01)
+    assert indexed == ["fresh"]
+    queue.stop(timeout=1)
+
+    assert not queue._worker.is_alive()
+    [line] = (tmp_path / "dead.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(line)["complaint_id"] == "poison"
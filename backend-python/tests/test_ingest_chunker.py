@@ -0,0 +1,37 @@
+from app.rag.ingest import _content_hash, _fallback_count_tokens, chunk_markdown
+
+SOP = """# Prosedür (SOP-X-001)
+
+## 1. Kart Teslimatı
+Normal teslimat 7-10 iş günüdür.
+
+## 2. Limit Artışı
+### 2.1 Otomatik Onay
+Düzenli ödeme yapan müşteriler.
+"""
+
+
+def _chunk(text, max_tokens=200):
+    return chunk_markdown(text, max_tokens=max_tokens, count_tokens=_fallback_count_tokens)
+
+
+def test_chunks_follow_header_hierarchy():
+    chunks = _chunk(SOP)
+    assert [c["section_path"] for c in chunks] == [
+        "Prosedür (SOP-X-001) > 1. Kart Teslimatı",
+        "Prosedür (SOP-X-001) > 2. Limit Artışı > 2.1 Otomatik Onay",
+    ]
+    assert chunks[0]["text"].startswith("## 1. Kart Teslimatı\n")
+    assert "Limit" not in chunks[0]["text"]
+
+
+def test_oversized_section_respects_token_budget():
+    body = "\n".join(f"- Madde {i}: müşteri bilgilendirilir ve kayıt açılır." for i in range(40))
+    chunks = _chunk(f"## Uzun Bölüm\n{body}\n", max_tokens=50)
+    assert len(chunks) > 1
+    assert all(c["token_count"] <= 50 for c in chunks)
+    assert all(c["text"].startswith("## Uzun Bölüm\n") for c in chunks)
+
+
+def test_content_hash_ignores_whitespace_and_case():
+    assert _content_hash("## Başlık\nMetin  burada") == _content_hash("## başlık metin burada")
@@ -0,0 +1,115 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.services.llm_providers.openai import OpenAIProvider
+from app.services.llm_providers.streaming import StreamingFieldParser
+
+VALID_REPLY = {
+    "action_plan": ["Limit değişikliğini kontrol et"],
+    "customer_reply_draft": "Talebiniz inceleniyor.",
+    "risk_flags": ["NONE"],
+    "sources": [{"doc_name": "sop", "source": "sop.md", "snippet": "limit", "chunk_id": "1"}],
+}
+
+
+class _FakeCompletions:
+    def __init__(self, replies):
+        self.replies = replies
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, stream=False, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        content = self.replies[(self.calls - 1) % len(self.replies)]
+        if stream:
+            return _FakeStream(content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class _FakeStream:
+    def __init__(self, content, size=3):
+        self.tokens = [content[start:start + size] for start in range(0, len(content), size)]
+        self.closed = False
+
+    async def __aiter__(self):
+        for token in self.tokens:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+    async def close(self):
+        self.closed = True
+
+
+def _provider(monkeypatch, replies, limit="3"):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("OPENAI_MAX_CONCURRENCY", limit)
+    provider = OpenAIProvider()
+    completions = _FakeCompletions(replies)
+    provider.async_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return provider, completions
+
+
+def test_async_generation_is_bounded_per_provider(monkeypatch):
+    provider, completions = _provider(monkeypatch, [json.dumps(VALID_REPLY)])
+
+    async def scenario():
+        return await asyncio.gather(
+            *(provider.agenerate_response("limitim düştü", "CARD_LIMIT_CREDIT", "LOW", []) for _ in range(20))
+        )
+
+    results = asyncio.run(scenario())
+    assert all(result["error_code"] is None for result in results)
+    assert results[0]["customer_reply_draft"] == VALID_REPLY["customer_reply_draft"]
+    assert completions.calls == 20
+    assert completions.max_in_flight == 3
+
+
+def test_async_generation_retries_with_strict_json_then_reports_errors(monkeypatch):
+    provider, completions = _provider(monkeypatch, ["not json", json.dumps(VALID_REPLY)])
+    result = asyncio.run(provider.agenerate_response("limitim düştü", "CARD_LIMIT_CREDIT", "LOW", []))
+    assert result["error_code"] is None and completions.calls == 2
+
+    provider, _ = _provider(monkeypatch, ["not json"])
+    result = asyncio.run(provider.agenerate_response("limitim düştü", "CARD_LIMIT_CREDIT", "LOW", []))
+    assert result["error_code"] == "LLM_VALIDATION_ERROR"
+
+    provider.async_client = None
+    result = asyncio.run(provider.agenerate_response("limitim düştü", "CARD_LIMIT_CREDIT", "LOW", []))
+    assert result["error_code"] == "OPENAI_MISSING"
+
+
+def test_streaming_parser_emits_reply_and_plan_text_incrementally():
+    document = "```json\n" + json.dumps(
+        {"risk_flags": ["X"], "customer_reply_draft": 'Sayın "müşteri",\nçözüldü 😊', "action_plan": ["a\\b", "c"]}
+    ) + "\n```"
+    parser = StreamingFieldParser()
+    deltas = [delta for start in range(0, len(document), 2) for delta in parser.feed(document[start:start + 2])]
+    assert len(deltas) > 3
+    text = {}
+    for field, index, piece in deltas:
+        text[(field, index)] = text.get((field, index), "") + piece
+    assert text == {
+        ("customer_reply_draft", None): 'Sayın "müşteri",\nçözüldü 😊',
+        ("action_plan", 0): "a\\b",
+        ("action_plan", 1): "c",
+    }
+
+
+def test_stream_response_yields_deltas_then_validated_final(monkeypatch):
+    provider, completions = _provider(monkeypatch, ["{\"broken", json.dumps(VALID_REPLY)])
+
+    async def scenario():
+        return [event async for event in provider.astream_response("limitim düştü", "CARD_LIMIT_CREDIT", "LOW", [])]
+
+    events = asyncio.run(scenario())
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "reset" and kinds[-1] == "final" and completions.calls == 2
+    draft = "".join(data["text"] for kind, data in events if kind == "delta" and data["field"] == "customer_reply_draft")
+    assert draft == VALID_REPLY["customer_reply_draft"]
+    assert events[-1][1]["error_code"] is None
+    assert events[-1][1]["sources"][0]["doc_name"] == "sop"
@@ -0,0 +1,47 @@
+from app.services.near_duplicate import MinHashLSHIndex
+
+STORM = "Mobil uygulamaya giriş yapamıyorum, sürekli hata veriyor. Acil çözüm bekliyorum."
+
+
+def test_near_duplicates_link_to_canonical():
+    index = MinHashLSHIndex(threshold=0.8)
+    assert index.add("c1", STORM) is None
+    match = index.add("c2", STORM.replace("Acil", "acil") + "!!")
+    assert match is not None and match[0] == "c1"
+    assert index.add("c3", "Kredi kartı limitimin artırılmasını talep ediyorum.") is None
+
+    assert index.cluster("c2") == {"canonical_id": "c1", "size": 2, "member_ids": ["c1", "c2"]}
+    assert index.clusters() == [{"canonical_id": "c1", "size": 2}]
+    assert index.stats()["duplicates"] == 1
+
+
+def test_removing_canonical_releases_its_members():
+    index = MinHashLSHIndex(threshold=0.8)
+    index.add("c1", STORM)
+    index.add("c2", STORM)
+    index.remove("c1")
+    assert index.canonical_of("c2") is None
+    assert index.add("c2", STORM) is None
+
+
+def test_readding_with_changed_text_relinks():
+    index = MinHashLSHIndex(threshold=0.8)
+    index.add("c1", STORM)
+    assert index.add("c2", STORM) == ("c1", 1.0)
+    assert index.add("c2", STORM) == ("c1", 1.0)
+
+    assert index.add("c2", "Kredi kartı limitimin artırılmasını talep ediyorum.") is None
+    assert index.canonical_of("c2") == "c2"
+    assert index.cluster("c1")["member_ids"] == ["c1"]
+    assert index.stats()["duplicates"] == 0
+
+
+def test_least_recently_matched_groups_are_evicted_past_max_tracked():
+    index = MinHashLSHIndex(threshold=0.8, max_tracked=3)
+    index.add("c1", STORM)
+    index.add("c2", "Kredi kartı limitimin artırılmasını talep ediyorum.")
+    index.add("c3", STORM + "!")
+    index.add("c4", "EFT yaptım ama karşı hesaba geçmedi.")
+    assert index.canonical_of("c2") is None
+    assert index.cluster("c3")["canonical_id"] == "c1"
+    assert index.stats()["tracked"] == 3
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+from app.core.constants import SOP_COLLECTION, sop_shard_collection
+from app.services import rag_service as rag_module
+from app.services.rag_service import RAGManager
+from app.services.vector_store import VectorStoreRegistry
+
+CHUNKS = {
+    "general-close": ([0.99, 0.01], "GENERAL"),
+    "card": ([0.9, 0.1], "CARD_LIMIT_CREDIT"),
+    "general-far": ([0.0, 1.0], "GENERAL"),
+    "transfer": ([0.95, 0.05], "TRANSFER_DELAY"),
+}
+
+
+class _QueryEmbeddings(EmbeddingFunction):
+    def __init__(self) -> None:
+        pass
+
+    @staticmethod
+    def name() -> str:
+        return "rag-test-vectors"
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return [np.array([1.0, 0.0], dtype=np.float32) for _ in input]
+
+
+def _add(collection, chunk_ids):
+    collection.add(
+        ids=list(chunk_ids),
+        embeddings=[CHUNKS[chunk_id][0] for chunk_id in chunk_ids],
+        documents=[f"SOP {chunk_id}" for chunk_id in chunk_ids],
+        metadatas=[
+            {"category": CHUNKS[chunk_id][1], "doc_name": f"{chunk_id}.md", "chunk_id": chunk_id}
+            for chunk_id in chunk_ids
+        ],
+    )
+
+
+@pytest.fixture
+def rag(tmp_path, monkeypatch):
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    registry._embedding_fn = _QueryEmbeddings()
+    monkeypatch.setattr(rag_module, "vector_store", registry)
+    _add(registry.get_collection(SOP_COLLECTION), CHUNKS)
+    # Sharded ingest for CARD_LIMIT_CREDIT and GENERAL only
+    _add(registry.get_collection(sop_shard_collection("CARD_LIMIT_CREDIT")), ["card"])
+    _add(registry.get_collection(sop_shard_collection("GENERAL")), ["general-close", "general-far"])
+    manager = RAGManager()
+    manager.sharded = True
+    return manager, registry
+
+
+def test_category_query_searches_its_shard_and_general_merged_by_distance(rag):
+    manager, _ = rag
+    results = manager.retrieve("kart limitim düştü", n_results=2, category="CARD_LIMIT_CREDIT")
+    # TRANSFER_DELAY is closer than "card" but lives in another shard
+    assert [item["chunk_id"] for item in results] == ["general-close", "card"]
+
+
+def test_category_without_shard_falls_back_to_filtered_query_without_creating_it(rag):
+    manager, registry = rag
+    results = manager.retrieve("eft gecikti", n_results=2, category="TRANSFER_DELAY")
+    assert [item["chunk_id"] for item in results] == ["transfer"]
+    assert sop_shard_collection("TRANSFER_DELAY") not in registry.list_collections()
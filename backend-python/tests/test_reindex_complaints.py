@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from app.ml.reindex_complaints import run_reindex
+from app.services.vector_store import VectorStoreRegistry
+
+
+def _embed(texts):
+    return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_reindex_resumes_from_checkpoint(tmp_path):
+    export = tmp_path / "complaints.jsonl"
+    rows = [
+        {"id": 1, "masked_text": "kart çalındı", "category": "FRAUD_UNAUTHORIZED_TX", "created_at": "2026-10-01T10:00:00Z"},
+        {"id": 2, "masked_text": "eft gecikti", "status": "OPEN"},
+        {"id": 3, "masked_text": ""},
+        {"id": 4, "masked_text": "şifremi unuttum"},
+        {"id": 5, "masked_text": "aidat iadesi"},
+    ]
+    export.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in rows), encoding="utf-8")
+    collection = VectorStoreRegistry(db_path=str(tmp_path / "chroma")).get_collection("complaint_embeddings_v2")
+    checkpoint = tmp_path / "reindex.checkpoint.json"
+
+    calls = []
+
+    def flaky_embed(texts):
+        calls.append(texts)
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        return _embed(texts)
+
+    with pytest.raises(RuntimeError):
+        run_reindex(str(export), collection, str(checkpoint), batch_size=2, embed=flaky_embed)
+    assert json.loads(checkpoint.read_text())["rows_done"] == 2
+    assert collection.count() == 2
+
+    embedded = []
+    stats = run_reindex(
+        str(export), collection, str(checkpoint), batch_size=2, total_rows=5,
+        embed=lambda texts: embedded.extend(texts) or _embed(texts),
+    )
+    assert embedded == ["şifremi unuttum", "aidat iadesi"]
+    assert (stats["rows_done"], stats["upserted"], stats["skipped"]) == (5, 4, 1)
+    assert stats["eta_s"] == 0
+    stored = collection.get(ids=["1"], include=["metadatas"])["metadatas"][0]
+    assert stored["category"] == "FRAUD_UNAUTHORIZED_TX" and stored["created_at_ts"] > 0
+
+
+def test_worker_pool_skips_embedding_batches_without_text(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.ml import reindex_complaints as reindex_module
+
+    embedded = []
+    monkeypatch.setattr(reindex_module, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(reindex_module, "_init_worker", lambda: None)
+    monkeypatch.setattr(reindex_module, "_worker_embed", lambda texts: embedded.append(texts) or _embed(texts))
+    export = tmp_path / "complaints.jsonl"
+    rows = [{"id": 1, "masked_text": ""}, {"id": 2, "masked_text": " "}, {"id": 3, "masked_text": "eft gecikti"}]
+    export.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+    collection = VectorStoreRegistry(db_path=str(tmp_path / "chroma")).get_collection("complaint_embeddings_v2")
+
+    stats = run_reindex(str(export), collection, str(tmp_path / "reindex.json"), batch_size=2, workers=1)
+
+    assert embedded == [["eft gecikti"]]
+    assert (stats["rows_done"], stats["upserted"], stats["skipped"]) == (3, 1, 2)
+
+
+def test_switch_retires_partitions_and_workers_follow_the_alias(tmp_path, monkeypatch):
+    from app.ml.reindex_complaints import retire_partitions
+    from app.services import similarity_service as similarity_module
+    from app.services.similarity_service import ComplaintSimilarityService
+
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(similarity_module, "vector_store", registry)
+    monkeypatch.setenv("SIMILARITY_PARTITIONING", "monthly")
+    monkeypatch.setenv("SIMILARITY_ALIAS_REFRESH_S", "0")
+    service = ComplaintSimilarityService()
+    registry.get_collection("complaint_embeddings__202609").upsert(ids=["old"], embeddings=[[1.0, 0.0]])
+    assert service._partition_names() == ["complaint_embeddings__202609"]
+
+    rebuilt = registry.get_collection("complaint_embeddings_v2")
+    rebuilt.upsert(ids=["old"], embeddings=[[0.0, 1.0]])
+    registry.set_alias("complaint_embeddings", "complaint_embeddings_v2")
+    assert retire_partitions(registry) == ["complaint_embeddings__202609"]
+
+    results = service.find_similar(query_embedding=[0.0, 1.0], n_results=5, ids_only=True)
+    assert service.collection_name == "complaint_embeddings_v2"
+    assert [item["id"] for item in results] == ["old"]
+    assert registry.list_collections(prefix="complaint_embeddings__") == []
@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.api import routes
+from app.services.review_service import ReviewStore
+
+
+def _endpoint():
+    # The handler FastAPI dispatches to (the first route registered for the path)
+    return next(route.endpoint for route in routes.router.routes if route.path == "/review/events")
+
+
+def _request(last_event_id=None):
+    async def is_disconnected():
+        return False
+
+    headers = {"last-event-id": str(last_event_id)} if last_event_id is not None else {}
+    return SimpleNamespace(headers=headers, is_disconnected=is_disconnected)
+
+
+async def _read_events(response, count):
+    events = []
+    async for chunk in response.body_iterator:
+        if chunk.startswith("id:"):
+            events.append(chunk)
+            if len(events) == count:
+                break
+    await response.body_iterator.aclose()
+    return events
+
+
+def test_review_events_stream_backlog_and_live_events_with_watermark_ids(tmp_path, monkeypatch):
+    store = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+    monkeypatch.setattr(routes, "review_store", store)
+    monkeypatch.setattr(routes, "REVIEW_EVENTS_KEEPALIVE_S", 0.05)
+    for review_id in ("r1", "r2"):
+        store.create_review(
+            review_id=review_id,
+            masked_text="kart limitim düşürüldü",
+            category="CARD_LIMIT_CREDIT",
+            category_confidence=0.42,
+            urgency="LOW",
+            urgency_confidence=0.55,
+        )
+    store.flush()
+    first = store.max_audit_id() - 1
+
+    async def scenario():
+        response = await _endpoint()(_request(last_event_id=first - 1))
+        backlog = await _read_events(response, 2)
+        live_response = await _endpoint()(_request())
+        reader = asyncio.ensure_future(_read_events(live_response, 1))
+        await asyncio.sleep(0.1)
+        await asyncio.to_thread(store.update_review, "r1", "APPROVED")
+        return backlog, await asyncio.wait_for(reader, 5)
+
+    backlog, live = asyncio.run(scenario())
+    assert [event.split("\n")[0] for event in backlog] == [f"id: {first}", f"id: {first + 1}"]
+    assert live[0].split("\n")[0] == f"id: {first + 2}"
+    assert '"status": "APPROVED"' in live[0]
+    store.close()
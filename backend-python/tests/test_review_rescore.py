@@ -0,0 +1,33 @@
+from app.services.review_rescore import ReviewRescoreJob
+from app.services.review_service import ReviewStore
+from app.services.triage_service import triage_engine
+
+
+def test_rescore_auto_approves_confident_pending_reviews(tmp_path):
+    store = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+    texts = {
+        "confident": "EFT gecikti",
+        "unsure": "Kartımdan bilgim dışında para çekildi",
+        "decided": "EFT gecikti",
+    }
+    for review_id, text in texts.items():
+        store.create_review(review_id, text, "INFORMATION_REQUEST", 0.3, "LOW", 0.3)
+    store.update_review("decided", "REJECTED")
+
+    job = ReviewRescoreJob(store, triage_engine)
+    job.page_size = 1
+    status = job.run(trigger="test")
+
+    assert (status["scanned"], status["approved"], status["pages"]) == (2, 1, 2)
+    assert status["records_per_s"] > 0
+    approved = store.get_review("confident")
+    assert (approved.status, approved.category) == ("AUTO_APPROVED", "TRANSFER_DELAY")
+    assert approved.category_confidence >= job.threshold
+    assert store.get_review("unsure").status == "PENDING_REVIEW"
+    assert store.get_review("decided").status == "REJECTED"
+    assert store.review_stats()["by_category"]["TRANSFER_DELAY"] == {"AUTO_APPROVED": 1}
+    audit = store._get_connection().execute(
+        "SELECT review_id FROM review_audit WHERE status = 'AUTO_APPROVED'"
+    ).fetchall()
+    assert [row[0] for row in audit] == ["confident"]
+    store.close()
@@ -0,0 +1,263 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+
+import pytest
+
+from app.services.review_events import DeliveryWatermark
+from app.services.review_service import ReviewStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+    yield store
+    store.close()
+
+
+def _create(store, review_id, category="CARD_LIMIT_CREDIT", urgency="LOW"):
+    return store.create_review(
+        review_id=review_id,
+        masked_text="kart limitim düşürüldü",
+        category=category,
+        category_confidence=0.42,
+        urgency=urgency,
+        urgency_confidence=0.55,
+    )
+
+
+def test_connections_are_persistent_per_thread_and_in_wal_mode(store):
+    conn = store._get_connection()
+    assert store._get_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(store._get_connection).result() is not conn
+
+
+def test_create_update_and_read_round_trip(store):
+    _create(store, "r1")
+    updated = store.update_review("r1", "APPROVED", "ok")
+    assert (updated.status, updated.notes, updated.category) == ("APPROVED", "ok", "CARD_LIMIT_CREDIT")
+    assert store.get_review("r1") == updated
+    assert store.update_review("missing", "APPROVED") is None
+    audit = store._get_connection().execute("SELECT status FROM review_audit ORDER BY audit_id").fetchall()
+    assert [row[0] for row in audit] == ["PENDING_REVIEW", "APPROVED"]
+
+
+def test_concurrent_writers_and_readers(store):
+    def work(index):
+        _create(store, f"r{index}")
+        store.update_review(f"r{index}", "REJECTED")
+        return store.get_review(f"r{index}").status
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert set(pool.map(work, range(50))) == {"REJECTED"}
+    # A second store on the same file (another worker) sees every write
+    other = ReviewStore(db_path=store._db_path)
+    assert other.get_review("r49").status == "REJECTED"
+    other.close()
+
+
+def test_review_queue_keyset_pagination_uses_indexes(store):
+    for index in range(7):
+        _create(store, f"r{index}", urgency="HIGH" if index % 2 else "LOW")
+    store.update_review("r3", "APPROVED")
+
+    pages, after = [], None
+    while True:
+        page = store.list_reviews(status="PENDING_REVIEW", limit=2, after=after)
+        if not page:
+            break
+        pages.append([record.review_id for record in page])
+        after = (page[-1].created_at, page[-1].review_id)
+    assert pages == [["r0", "r1"], ["r2", "r4"], ["r5", "r6"]]
+    assert [r.review_id for r in store.list_reviews(status="PENDING_REVIEW", urgency="HIGH")] == ["r1", "r5"]
+
+    plan = store._get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM review_records WHERE status = ? AND urgency = ? "
+        "AND (created_at, review_id) > (?, ?) ORDER BY created_at, review_id LIMIT 50",
+        ("PENDING_REVIEW", "HIGH", "", ""),
+    ).fetchall()
+    detail = " ".join(row[-1] for row in plan)
+    assert "idx_review_records_status_urgency_created" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_bulk_update_is_one_transaction_with_per_id_results(store):
+    for index in range(3):
+        _create(store, f"r{index}")
+    results = store.bulk_update_reviews(["r2", "missing", "r0", "r2"], "APPROVED", "model fix")
+    assert results == [("r2", True), ("missing", False), ("r0", True)]
+    assert [r.review_id for r in store.list_reviews(status="APPROVED")] == ["r0", "r2"]
+    assert store.get_review("r1").status == "PENDING_REVIEW"
+    audit = store._get_connection().execute(
+        "SELECT review_id FROM review_audit WHERE status = 'APPROVED' ORDER BY audit_id"
+    ).fetchall()
+    assert [row[0] for row in audit] == ["r2", "r0"]
+
+
+def test_group_commit_buffers_and_flushes_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setenv("REVIEW_GROUP_COMMIT", "true")
+    monkeypatch.setenv("REVIEW_GROUP_COMMIT_INTERVAL_MS", "1000")
+    store = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+    for index in range(5):
+        _create(store, f"g{index}")
+    # Visible to this worker immediately, committed on the next group flush
+    assert store.buffer_stats()["depth"] == 5
+    assert store.get_review("g0").status == "PENDING_REVIEW"
+    assert store.list_reviews() == []
+    assert store.update_review("g3", "APPROVED").status == "APPROVED"
+    stats = store.buffer_stats()
+    assert (stats["depth"], stats["flushes"], stats["last_batch_size"]) == (0, 1, 5)
+    store.close()
+    assert len(ReviewStore(db_path=store._db_path).list_reviews(status="PENDING_REVIEW")) == 4
+
+
+def test_group_commit_journal_is_replayed_after_a_crash(tmp_path, monkeypatch):
+    monkeypatch.setenv("REVIEW_GROUP_COMMIT", "true")
+    monkeypatch.setenv("REVIEW_GROUP_COMMIT_INTERVAL_MS", "60000")
+    monkeypatch.setenv("REVIEW_GROUP_COMMIT_MAX_BATCH", "1000")
+    crashed = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+    _create(crashed, "j1")
+    _create(crashed, "j2")
+    crashed._journal.flush()
+    # No close(): the worker died with both records only in its journal
+    recovered = ReviewStore(db_path=crashed._db_path)
+    assert [r.review_id for r in recovered.list_reviews()] == ["j1", "j2"]
+    assert recovered.buffer_stats()["replayed"] == 2
+    # Idempotent with the original worker flushing later
+    crashed.flush()
+    audit = recovered._get_connection().execute("SELECT COUNT(*) FROM review_audit").fetchone()[0]
+    assert audit == 2
+
+
+def test_group_commit_flusher_commits_within_the_interval(tmp_path, monkeypatch):
+    monkeypatch.setenv("REVIEW_GROUP_COMMIT", "true")
+    monkeypatch.setenv("REVIEW_GROUP_COMMIT_INTERVAL_MS", "5")
+    store = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+    for index in range(20):
+        _create(store, f"f{index}")
+    deadline = time.monotonic() + 5
+    while store.buffer_stats()["depth"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(store.list_reviews()) == 20
+    assert store.buffer_stats()["flushed"] == 20
+    store.close()
+
+
+def test_review_stats_are_incremental_and_rebuilt_at_startup(store):
+    _create(store, "s1", category="TRANSFER_DELAY", urgency="HIGH")
+    _create(store, "s2")
+    _create(store, "s3")
+    store.update_review("s1", "APPROVED")
+    store.bulk_update_reviews(["s2"], "REJECTED")
+
+    stats = store.review_stats()
+    assert stats["by_status"] == {"PENDING_REVIEW": 1, "APPROVED": 1, "REJECTED": 1}
+    assert stats["by_category"]["TRANSFER_DELAY"] == {"APPROVED": 1}
+    assert stats["by_urgency"]["LOW"] == {"PENDING_REVIEW": 1, "REJECTED": 1}
+    assert stats["oldest_pending"]["review_id"] == "s3"
+    assert stats["decision_rates"]["1h"]["approve_rate"] == 0.5
+
+    rebuilt = ReviewStore(db_path=store._db_path).review_stats()
+    for key in ("by_status", "by_category", "by_urgency", "pending", "decision_rates"):
+        assert rebuilt[key] == stats[key]
+
+    store.update_review("s3", "APPROVED")
+    assert store.review_stats()["oldest_pending"] is None
+
+
+
+def test_review_stats_reconcile_in_the_background(tmp_path, monkeypatch):
+    monkeypatch.setenv("REVIEW_STATS_RECONCILE_S", "0.05")
+    store = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+    other_worker = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+    try:
+        assert store.review_stats()["by_status"] == {}
+        _create(other_worker, "w1")
+        # Polls only read the counters; the reconciler thread picks up the write
+        deadline = time.monotonic() + 5
+        while store.review_stats()["by_status"] != {"PENDING_REVIEW": 1} and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert store.review_stats()["by_status"] == {"PENDING_REVIEW": 1}
+        assert store._stats_reconciler.name == "review-stats-reconcile"
+    finally:
+        other_worker.close()
+        store.close()
+    assert store._stats_reconciler is None
+
+def test_export_streams_keyset_chunks_within_time_range(store):
+    for index in range(5):
+        _create(store, f"e{index}")
+        store.update_review(f"e{index}", "APPROVED")
+    records = store.list_reviews(status="APPROVED")
+    after, before = records[1].created_at, records[4].created_at
+
+    chunks = list(store.iter_export("records", created_after=after, created_before=before, chunk_size=2))
+    assert [[row["review_id"] for row in chunk] for chunk in chunks] == [["e1", "e2"], ["e3"]]
+
+    audit = [row for chunk in store.iter_export("audit", chunk_size=3) for row in chunk]
+    assert len(audit) == 10
+    assert [row["audit_id"] for row in audit] == sorted(row["audit_id"] for row in audit)
+
+    plan = store._get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM review_audit WHERE created_at >= ? AND created_at < ? "
+        "AND (created_at, audit_id) > (?, ?) ORDER BY created_at, audit_id LIMIT 1000",
+        ("", "", "", 0),
+    ).fetchall()
+    detail = " ".join(row[-1] for row in plan)
+    assert "idx_review_audit_created" in detail and "TEMP B-TREE" not in detail
+
+
+def test_review_events_are_published_with_audit_ids_and_replayable(store):
+    async def scenario():
+        subscriber = store.events.subscribe()
+        _create(store, "r1")
+        store.update_review("r1", "APPROVED", "ok")
+        store.bulk_update_reviews(["r1"], "REJECTED")
+        await asyncio.sleep(0)
+        live = [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+        store.events.unsubscribe(subscriber)
+        return live
+
+    live = asyncio.run(scenario())
+    assert [event["status"] for event in live] == ["PENDING_REVIEW", "APPROVED", "REJECTED"]
+    assert live[1]["category_confidence"] == 0.42
+    replayed = store.audit_events_after(live[0]["audit_id"])
+    assert [event["audit_id"] for event in replayed] == [event["audit_id"] for event in live[1:]]
+    assert store.audit_events_after(0, status="APPROVED")[0]["audit_id"] == live[1]["audit_id"]
+    assert store.max_audit_id() == live[-1]["audit_id"]
+
+
+
+def test_delivery_watermark_only_advances_over_contiguous_ids():
+    watermark = DeliveryWatermark(10)
+    # Another worker's 11 arrives via the tailer after this worker's 12 and 13
+    assert watermark.offer(12) and watermark.offer(13)
+    assert watermark.floor == 10
+    assert watermark.offer(11)
+    assert (watermark.floor, watermark.sent_above) == (13, set())
+    assert not watermark.offer(12)
+
+    assert watermark.offer(16)
+    watermark.read_through(15)
+    assert (watermark.floor, watermark.sent_above) == (16, set())
+
+def test_review_event_buffers_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setenv("REVIEW_EVENTS_BUFFER", "2")
+    monkeypatch.setenv("REVIEW_EVENTS_TAIL_MS", "0")
+    store = ReviewStore(db_path=str(tmp_path / "reviews.db"))
+
+    async def scenario():
+        subscriber = store.events.subscribe()
+        approved_only = store.events.subscribe(status="APPROVED")
+        for index in range(5):
+            _create(store, f"r{index}")
+        await asyncio.sleep(0)
+        return subscriber, approved_only
+
+    subscriber, approved_only = asyncio.run(scenario())
+    assert subscriber.queue.qsize() == 2 and subscriber.lagged
+    assert approved_only.queue.empty() and not approved_only.lagged
+    assert store.events.stats()["overflows"] == 1
+    store.close()
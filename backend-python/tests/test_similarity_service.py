@@ -0,0 +1,220 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+from app.services import similarity_service as similarity_module
+from app.services.similarity_service import (
+    ComplaintSimilarityService,
+    build_similarity_filter,
+    plan_partition_retention,
+)
+from app.services.vector_store import VectorStoreRegistry
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    service = ComplaintSimilarityService()
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(service, "collection", registry.get_collection("complaint_embeddings"))
+    service.collection.upsert(
+        ids=["c1", "c2", "c3", "c4"],
+        embeddings=[[1.0, 0.0], [0.9, 0.1], [0.8, 0.2], [0.0, 1.0]],
+        documents=["kart çalındı", "kartım kayboldu", "kart işlemi", "eft gecikti"],
+        metadatas=[
+            service._prepare_metadata({"category": "FRAUD_UNAUTHORIZED_TX", "status": "OPEN", "created_at": created_at})
+            for created_at in ["2026-10-01T10:00:00Z", "2026-10-15T10:00:00Z", "2026-10-16T10:00:00Z", "2026-10-17T10:00:00Z"]
+        ],
+    )
+    return service
+
+
+def test_similar_by_id_uses_stored_embedding_and_excludes_self(service):
+    results, source = service.find_similar_by_id("c1", n_results=2)
+    assert source == "stored"
+    assert [item["id"] for item in results] == ["c2", "c3"]
+
+
+def test_filters_and_pagination_are_pushed_down(service):
+    where = build_similarity_filter(status="OPEN", created_after="2026-10-10T00:00:00Z")
+    first, _ = service.find_similar_by_id("c1", n_results=1, where=where, ids_only=True)
+    second, _ = service.find_similar_by_id("c1", n_results=1, where=where, offset=1, ids_only=True)
+    assert [item["id"] for item in first + second] == ["c2", "c3"]
+    assert "masked_text" not in first[0]
+
+
+def test_keyset_pages_do_not_shift_when_closer_complaints_are_indexed(service):
+    first, _ = service.find_similar_by_id("c1", n_results=1, ids_only=True)
+    assert [item["id"] for item in first] == ["c2"]
+    # Closer than everything on the first page
+    service.collection.upsert(ids=["c5"], embeddings=[[0.99, 0.01]], documents=["kart"])
+    after = (first[-1]["distance"], first[-1]["id"])
+    second, _ = service.find_similar_by_id("c1", n_results=1, ids_only=True, after=after, depth=1)
+    assert [item["id"] for item in second] == ["c3"]
+
+def test_unknown_id_without_query_text_returns_none(service):
+    assert service.find_similar_by_id("missing") is None
+
+
+def test_invalid_created_at_bound_is_rejected():
+    with pytest.raises(ValueError):
+        build_similarity_filter(created_before="dün")
+
+
+def test_collection_count_is_cached_and_adjusted_on_delete(service):
+    assert service.get_collection_count() == 4
+    reconciled_at = service._count_reconciled_at
+    assert service.delete_complaint("c4")
+    assert service.delete_complaint("missing")
+    assert service.get_collection_count() == 3
+    assert service._count_reconciled_at == reconciled_at
+    assert service.reconcile_count() == 3
+
+
+def test_near_duplicate_reuses_canonical_embedding(service):
+    text = "Mobil uygulamaya giriş yapamıyorum, sürekli hata veriyor."
+    service.collection.upsert(ids=["storm-1"], embeddings=[[0.5, 0.5]], documents=[text])
+    service.near_duplicates.add("storm-1", text)
+
+    # Reused vector means no embedding-model call for the duplicate
+    [result] = service.index_complaints([{"complaint_id": "storm-2", "masked_text": text + "!"}])
+    assert result == {"complaint_id": "storm-2", "status": "indexed", "canonical_id": "storm-1"}
+    assert service.get_stored_embedding("storm-2") == [0.5, 0.5]
+
+
+def test_near_duplicate_index_is_rebuilt_from_stored_complaints(service):
+    text = "Mobil uygulamaya giriş yapamıyorum, sürekli hata veriyor."
+    service.collection.upsert(
+        ids=["storm-2", "storm-1"],
+        embeddings=[[0.5, 0.5], [0.5, 0.5]],
+        documents=[text + "!", text],
+        metadatas=[{"canonical_id": "storm-1"}, {"category": "OTHER"}],
+    )
+    assert service.rebuild_near_duplicates(page_size=2) == 6
+    assert service.near_duplicates.cluster("storm-2")["canonical_id"] == "storm-1"
+
+
+def test_near_duplicate_rebuild_is_capped(service):
+    assert service.rebuild_near_duplicates(limit=3, page_size=2) == 3
+    assert service.near_duplicates.stats()["tracked"] == 3
+
+
+class _FixedEmbeddings(EmbeddingFunction):
+    VECTORS = {"eski kart": [1.0, 0.0], "yeni kart": [0.9, 0.1], "eft": [0.0, 1.0]}
+
+    def __init__(self) -> None:
+        pass
+
+    @staticmethod
+    def name() -> str:
+        return "fixed-test-vectors"
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return [np.array(self.VECTORS[text], dtype=np.float32) for text in input]
+
+
+@pytest.fixture
+def partitioned(tmp_path, monkeypatch):
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(similarity_module, "vector_store", registry)
+    monkeypatch.setenv("SIMILARITY_PARTITIONING", "monthly")
+    monkeypatch.setenv("SIMILARITY_QUERY_HORIZON_MONTHS", "2")
+    monkeypatch.setenv("SIMILARITY_DEDUP_MODE", "off")
+    service = ComplaintSimilarityService()
+    registry._embedding_fn = _FixedEmbeddings()
+    service.index_complaints([
+        {"complaint_id": "old", "masked_text": "eski kart", "metadata": {"created_at": "2025-01-10T00:00:00Z"}},
+        {"complaint_id": "new", "masked_text": "yeni kart", "metadata": {"created_at": "2026-10-05T00:00:00Z"}},
+        {"complaint_id": "eft", "masked_text": "eft", "metadata": {"created_at": "2026-09-20T00:00:00Z"}},
+    ])
+    return service, registry
+
+
+def test_plan_partition_retention():
+    names = [
+        "complaint_embeddings",
+        "complaint_embeddings__2023",
+        "complaint_embeddings__202501",
+        "complaint_embeddings__202604",
+        "complaint_embeddings__202610",
+    ]
+    plan = plan_partition_retention(names, datetime(2026, 10, 19, tzinfo=timezone.utc), 24, 6)
+    assert plan == {
+        "drop": ["complaint_embeddings__2023"],
+        "compact": {
+            "complaint_embeddings__202501": "complaint_embeddings__2025",
+            "complaint_embeddings__202604": "complaint_embeddings__2026",
+        },
+    }
+
+
+def test_partitioned_writes_and_horizon_fan_out(partitioned):
+    service, registry = partitioned
+    assert registry.list_collections(prefix="complaint_embeddings__") == [
+        "complaint_embeddings__202501",
+        "complaint_embeddings__202609",
+        "complaint_embeddings__202610",
+    ]
+    assert service.get_collection_count() == 3
+    # Lookups search every partition; queries only the recent horizon
+    assert service.get_stored_embedding("old") == [1.0, 0.0]
+    results = service.find_similar(query_embedding=[1.0, 0.0], n_results=5)
+    assert [item["id"] for item in results] == ["new", "eft"]
+
+    # Re-indexing with a new created_at moves the complaint between partitions
+    service.index_complaints([
+        {"complaint_id": "old", "masked_text": "eski kart", "metadata": {"created_at": "2026-10-01T00:00:00Z"}},
+    ])
+    assert service.get_collection_count() == 3
+    assert registry.get_collection("complaint_embeddings__202501").count() == 0
+    results = service.find_similar(query_embedding=[1.0, 0.0], n_results=1, exclude_id="old")
+    assert [item["id"] for item in results] == ["new"]
+
+
+def test_retention_compacts_and_drops_partitions(partitioned):
+    service, registry = partitioned
+    summary = service.apply_retention(
+        retention_months=0, compact_after_months=1, now=datetime(2026, 10, 19, tzinfo=timezone.utc)
+    )
+    assert summary["compact"] == {
+        "complaint_embeddings__202501": "complaint_embeddings__2025",
+        "complaint_embeddings__202609": "complaint_embeddings__2026",
+    }
+    assert summary["vectors_compacted"] == 2
+    assert service.get_stored_embedding("eft") == [0.0, 1.0]
+    assert service.get_collection_count() == 3
+
+    summary = service.apply_retention(
+        retention_months=10, compact_after_months=0, now=datetime(2026, 10, 19, tzinfo=timezone.utc)
+    )
+    assert summary["drop"] == ["complaint_embeddings__2025"]
+    assert summary["vectors_dropped"] == 1
+    assert service.get_stored_embedding("old") is None
+    assert service.get_collection_count() == 2
+
+
+class _FailingEmbeddings(_FixedEmbeddings):
+    def __call__(self, input: Documents) -> Embeddings:
+        if "bozuk" in input:
+            raise ValueError("embedding failed")
+        return super().__call__(input)
+
+
+def test_failed_batch_is_retried_item_by_item(service, tmp_path, monkeypatch):
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    registry._embedding_fn = _FailingEmbeddings()
+    monkeypatch.setattr(similarity_module, "vector_store", registry)
+    monkeypatch.setattr(service, "dedup_mode", "off")
+
+    results = service.index_complaints(
+        [
+            {"complaint_id": "ok-1", "masked_text": "eski kart"},
+            {"complaint_id": "bad", "masked_text": "bozuk"},
+            {"complaint_id": "ok-2", "masked_text": "eft"},
+        ],
+        batch_size=3,
+    )
+    assert [result["status"] for result in results] == ["indexed", "failed", "indexed"]
+    assert results[1]["error"] == "embedding failed"
+    assert service.get_stored_embedding("ok-2") == [0.0, 1.0]
@@ -0,0 +1,38 @@
+from app.services.spike_detector import SpikeDetector
+
+START = 1_800_000_000.0
+
+
+def _steady_detector():
+    detector = SpikeDetector(baseline_hours=2, z_threshold=3.0, min_count=5)
+    # Two hours of one TRANSFER_DELAY complaint per minute
+    for minute in range(120):
+        detector.record("TRANSFER_DELAY", "LOW", now=START + minute * 60)
+    return detector
+
+
+def test_steady_traffic_is_not_spiking():
+    detector = _steady_detector()
+    snapshot = detector.snapshot(now=START + 119 * 60 + 30)
+    assert snapshot["spiking"] == []
+    assert snapshot["metrics"]["category:TRANSFER_DELAY"]["15m"]["count"] == 15
+
+
+def test_burst_is_reported_as_spike():
+    detector = _steady_detector()
+    now = START + 120 * 60
+    for i in range(40):
+        detector.record("FRAUD_UNAUTHORIZED_TX", "HIGH", now=now + i)
+    snapshot = detector.snapshot(now=now + 45)
+    spiking = {(item["key"], item["window"]) for item in snapshot["spiking"]}
+    assert ("category:FRAUD_UNAUTHORIZED_TX", "1m") in spiking
+    assert ("urgency:HIGH", "1m") in spiking
+    assert not any(key == "category:TRANSFER_DELAY" for key, _ in spiking)
+    assert snapshot["metrics"]["category:FRAUD_UNAUTHORIZED_TX"]["1m"]["count"] == 40
+
+
+def test_old_slots_expire_from_windows():
+    detector = SpikeDetector(baseline_hours=1)
+    detector.record("TRANSFER_DELAY", "LOW", now=START)
+    metrics = detector.snapshot(now=START + 2 * 3600)["metrics"]["category:TRANSFER_DELAY"]
+    assert metrics["1h"]["count"] == 0 and metrics["1m"]["count"] == 0
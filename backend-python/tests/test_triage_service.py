@@ -0,0 +1,15 @@
+from app.services import triage_service
+from app.services.triage_service import TriageEngine
+
+
+def test_failed_reload_reports_failure_and_keeps_serving_models(monkeypatch):
+    engine = TriageEngine()
+    engine.category_model, engine.urgency_model, engine.model_loaded = object(), object(), True
+    previous = engine.category_model
+
+    def broken_load(path):
+        raise ValueError("truncated pickle")
+
+    monkeypatch.setattr(triage_service.joblib, "load", broken_load)
+    assert engine.reload() is False
+    assert engine.model_loaded and engine.category_model is previous
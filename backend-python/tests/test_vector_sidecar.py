@@ -0,0 +1,94 @@
+import asyncio
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.vector_sidecar import RemoteCollection, VectorSidecarClient, VectorSidecarServer
+
+
+def _start_sidecar(tmp_path):
+    socket_path = str(tmp_path / "vector.sock")
+    server = VectorSidecarServer(socket_path, db_path=str(tmp_path / "chroma"))
+    threading.Thread(target=lambda: asyncio.run(server.serve()), daemon=True).start()
+    deadline = time.time() + 30
+    while not (tmp_path / "vector.sock").exists():
+        assert time.time() < deadline, "sidecar did not start"
+        time.sleep(0.05)
+    return socket_path
+
+
+def test_sidecar_serializes_writes_and_batches_queries(tmp_path):
+    socket_path = _start_sidecar(tmp_path)
+    client = VectorSidecarClient(socket_path)
+    collection = RemoteCollection(client, "complaint_embeddings")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(
+            lambda i: collection.upsert(
+                ids=[f"c{i}"],
+                embeddings=[[float(i), 1.0, 0.0]],
+                documents=[f"şikayet {i}"],
+                metadatas=[{"category": "TRANSFER_DELAY"}],
+            ),
+            range(20),
+        ))
+        results = list(pool.map(
+            lambda i: collection.query(
+                query_embeddings=[[float(i), 1.0, 0.0]],
+                n_results=1,
+                include=["documents", "distances"],
+            ),
+            range(16),
+        ))
+
+    assert collection.count() == 20
+    assert [r["ids"][0][0] for r in results] == [f"c{i}" for i in range(16)]
+    stats = client.call("stats")
+    assert stats["batched_items"] == 16
+    assert stats["batches"] < 16
+
+
+def test_sidecar_proxies_update_and_collection_drop(tmp_path):
+    from app.services.vector_store import VectorStoreRegistry
+
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "unused"), sidecar_socket=_start_sidecar(tmp_path))
+    collection = registry.get_collection("complaint_embeddings__202401")
+    collection.upsert(ids=["c1"], embeddings=[[1.0, 0.0, 0.0]], documents=["şikayet"], metadatas=[{"cluster_id": -1}])
+    collection.update(ids=["c1"], metadatas=[{"cluster_id": 3}])
+    assert collection.get(ids=["c1"])["metadatas"][0]["cluster_id"] == 3
+
+    registry.drop_collection("complaint_embeddings__202401")
+    assert registry.list_collections("complaint_embeddings") == []
+
+
+def test_lost_replies_are_resent_for_reads_only(tmp_path):
+    path = str(tmp_path / "drop.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    received = []
+
+    def serve():
+        # Read each request, then hang up without replying
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            received.append(conn.recv(65536))
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    client = VectorSidecarClient(path, timeout=5)
+    try:
+        with pytest.raises(ConnectionError):
+            client.call("upsert", "complaint_embeddings", ids=["c1"], documents=["kart"])
+        assert len(received) == 1
+        with pytest.raises(ConnectionError):
+            client.call("count", "complaint_embeddings")
+        assert len(received) == 3
+    finally:
+        server.close()
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.vector_store import VectorStoreRegistry
+
+
+def test_collections_share_one_client_and_embedding_fn(tmp_path):
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    assert registry.memory_stats()["client_open"] is False
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        handles = list(pool.map(lambda _: registry.get_collection("complaint_sops"), range(8)))
+    assert all(handle is handles[0] for handle in handles)
+
+    registry.get_collection("complaint_embeddings")
+    stats = registry.memory_stats()
+    assert stats["client_open"] and stats["embedding_fn_loaded"]
+    assert stats["collections"] == ["complaint_embeddings", "complaint_sops"]
+    assert stats["rss_mb"] is None or stats["rss_mb"] > 0
+
+
+def test_alias_switch_is_seen_by_readers(tmp_path):
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    assert registry.resolve_alias("complaint_embeddings") == "complaint_embeddings"
+    registry.set_alias("complaint_embeddings", "complaint_embeddings_v2")
+    reader = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    assert reader.resolve_alias("complaint_embeddings") == "complaint_embeddings_v2"
+
+
+def test_collection_disk_bytes_counts_only_the_named_collections(tmp_path):
+    registry = VectorStoreRegistry(db_path=str(tmp_path / "chroma"))
+    for name, size in (("complaint_embeddings", 2000), ("complaint_sops", 10)):
+        registry.get_collection(name).add(
+            ids=[str(i) for i in range(size)],
+            embeddings=[[1.0, float(i)] for i in range(size)],
+        )
+    complaints = registry.collection_disk_bytes(["complaint_embeddings"])
+    total = sum(path.stat().st_size for path in (tmp_path / "chroma").rglob("*") if path.is_file())
+    assert 0 < complaints < total
+    assert registry.collection_disk_bytes(["complaint_embeddings", "missing"]) == complaints
+    assert registry.collection_disk_bytes([]) == 0
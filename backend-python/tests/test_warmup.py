@@ -0,0 +1,67 @@
+import threading
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services import warmup
+from app.services.warmup import WarmupState
+
+
+def _fake_components(monkeypatch, triage_gate=None, similarity_error=None):
+    def similarity_query(**kwargs):
+        if similarity_error:
+            raise similarity_error
+
+    def predict(text):
+        if triage_gate is not None:
+            triage_gate.wait(10)
+        return {"category": "OTHER"}
+
+    collection = SimpleNamespace(query=lambda **kwargs: None)
+    monkeypatch.setattr(warmup, "rag_manager", SimpleNamespace(collection=collection))
+    monkeypatch.setattr(
+        warmup, "similarity_service", SimpleNamespace(collection=SimpleNamespace(query=similarity_query))
+    )
+    monkeypatch.setattr(warmup, "triage_engine", SimpleNamespace(predict=predict))
+    monkeypatch.setattr(warmup, "masker", SimpleNamespace(mask=lambda text: {"masked_text": text}))
+
+
+def test_ready_is_503_until_warmup_finishes(monkeypatch):
+    gate = threading.Event()
+    _fake_components(monkeypatch, triage_gate=gate)
+    state = WarmupState()
+    monkeypatch.setattr(main, "warmup_state", state)
+    client = TestClient(main.app)
+
+    thread = threading.Thread(target=state.run)
+    thread.start()
+    try:
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+    finally:
+        gate.set()
+        thread.join(10)
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+
+
+def test_warmup_records_component_timings_and_errors(monkeypatch):
+    _fake_components(monkeypatch, similarity_error=RuntimeError("collection unavailable"))
+    state = WarmupState()
+    state.run()
+
+    status = state.status()
+    assert status["ready"] is True
+    assert set(status["components"]) == {"rag_embedding", "similarity_embedding", "triage", "masking"}
+    assert all(component["duration_ms"] >= 0 for component in status["components"].values())
+    assert status["components"]["similarity_embedding"] == {
+        "ok": False,
+        "error": "collection unavailable",
+        "duration_ms": status["components"]["similarity_embedding"]["duration_ms"],
+    }
+    assert status["components"]["triage"]["ok"] is True
+    assert status["total_ms"] >= 0